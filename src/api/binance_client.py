@@ -1,47 +1,143 @@
 from binance.client import Client
-from binance.exceptions import BinanceAPIException
+from binance.streams import ThreadedWebsocketManager
+from binance.exceptions import BinanceAPIException, BinanceRequestException
 from binance.enums import *
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
 import logging
 import time
 import math
+import random
+import re
 import threading
+import heapq
+import queue
+from collections import deque
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 
+from src.utils.cache import TTLCache
+from src.utils.rolling import RollingStd
+from src.utils.fast_json import HAS_ORJSON, dumps as json_dumps, loads as json_loads
+
+# Copy-on-Write (pandas 2.x): DataFrames do cache são devolvidos sem .copy(); se quem
+# recebeu modificar o frame, o pandas copia só nesse momento e o cache fica intacto
+pd.options.mode.copy_on_write = True
+
+# Colunas numéricas mantidas dos klines (as demais colunas da Binance não são usadas)
+KLINE_OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Idade máxima de ticker_stats (via REST) antes de select_active_coins atualizar de novo
+TICKERS_REFRESH_SECONDS = 30
+
+# Mensagens de websocket aplicadas por lote pela thread consumidora
+WS_BATCH_SIZE = 256
+
+# Intervalo para rebaixar o exchangeInfo (filtros de LOT_SIZE etc. quase nunca mudam)
+SYMBOL_FILTERS_REFRESH_SECONDS = 6 * 3600
+
+# Klines 1m usados na volatilidade da compra (29 retornos entre 30 fechamentos)
+VOLATILITY_WINDOW = 30
+
+# Candles 1m mantidos por símbolo no buffer alimentado pelo websocket
+KLINE_RING_SIZE = 100
+
+# Janela de validade das requisições assinadas (máximo aceito pela Binance) e
+# intervalo de ressincronização do relógio com o servidor
+RECV_WINDOW_MS = 60000
+TIME_SYNC_SECONDS = 30 * 60
+
+# Intervalo mínimo entre dois sinais de compra no mesmo símbolo
+RECENT_SIGNAL_SECONDS = 15 * 60
+
+# Níveis de validade (ttl, max_stale, error_stale) em segundos: até ttl o cache é servido
+# direto; entre ttl e max_stale é servido na hora e atualizado em segundo plano
+# (stale-while-revalidate); acima de max_stale (ou após invalidação explícita) a busca volta
+# a ser síncrona. Se ela falhar, o valor antigo só é usado se tiver menos de error_stale
+# segundos (None = qualquer idade)
+CACHE_TIERS = {
+    'short': (10, 30, 60),               # Saldos: mudam a cada ordem
+    'long': (86400, 7 * 86400, None),    # Symbol info: filtros quase nunca mudam
+}
+
+# Nível de cada endpoint (copiado para self.cache_policy, ajustável por instância)
+CACHE_POLICY = {
+    'account_balance': CACHE_TIERS['short'],
+    'symbol_info': CACHE_TIERS['long'],
+}
+
+# Classificação dos erros de ordem em uma única busca (m.lastgroup indica o tipo)
+_ERR_RE = re.compile(
+    r'(?P<qty>Invalid quantity)|(?P<notional>MIN_NOTIONAL|NOTIONAL)|(?P<bal>-2010.*insufficient balance)',
+    re.I
+)
+
 class BinanceClient:
+    # Stablecoins excluídas da seleção de moedas (além de qualquer base contendo 'USD')
+    STABLECOIN_BASES = frozenset(['DAI', 'PAX', 'SUSD', 'USDK', 'GUSD', 'HUSD', 'USDN'])
+    STABLECOIN_PAIRS = frozenset(['BUSDUSDT', 'USDCUSDT', 'TUSDUSDT', 'DAIUSDT'])
+
     def __init__(self, config):
         self.config = config
+        self._quote_len = len(config.quote_asset)
+        self._base_asset_cache = {}  # {symbol: base_asset}
         self.logger = logging.getLogger('RoboCriptoCL.BinanceClient')
         
         # Default time offset
         self.time_offset = 0
+        self._next_time_sync = float('-inf')  # time.monotonic() da próxima ressincronização
         
-        # Rate limiting protection
-        self.request_weight = 0
+        # Rate limiting protection - janela deslizante de 60s em buckets de 1 segundo
+        self.request_weight = 0  # Peso usado na janela atual (atualizado a cada requisição)
         self.request_count = 0
-        self.last_request_reset = datetime.now()
-        self.rate_limit_lock = threading.Lock()  # Lock para concorrência
+        self._weight_buckets = [0] * 60   # Peso consumido em cada segundo (anel)
+        self._bucket_seconds = [0] * 60   # Segundo (epoch) a que cada posição do anel se refere
+        self._rate_lock = threading.Lock()  # Protege apenas a contabilidade de peso (sem reentrada)
         self.rate_limit_wait = False
         self.max_weight_per_minute = 1000  # Valor máximo de peso por minuto
+        self._consecutive_429 = 0  # Erros de rate limit seguidos (para o backoff exponencial)
         
         # Cache para dados frequentemente acessados
+        # Preços e klines usam caches limitados em tamanho para não crescer indefinidamente
         self.cache = {
-            'account_balance': {'data': None, 'timestamp': None, 'expiry': 10},  # Expiração em segundos
-            'ticker_prices': {'data': {}, 'timestamp': None, 'expiry': 5},
-            'historical_klines': {},
-            'symbol_info': {}
+            'account_balance': {'data': None, 'timestamp': None},  # timestamp em time.monotonic(); validade em cache_policy
+            'ticker_prices': TTLCache(maxsize=4096, ttl=5),
+            'historical_klines': TTLCache(maxsize=512, ttl=10),        # Intervalo de 1m
+            'historical_klines_long': TTLCache(maxsize=512, ttl=30),   # Timeframes maiores
+            # Limitado em tamanho: só os pares da quote asset são carregados do exchangeInfo, e
+            # entradas vencidas continuam acessíveis (get_stale) para o stale-while-revalidate
+            'symbol_info': TTLCache(maxsize=1024, ttl=CACHE_POLICY['symbol_info'][1])
         }
+        self.cache_policy = dict(CACHE_POLICY)
+        self._inflight = set()  # Chaves de cache com atualização em segundo plano em andamento
+        self._inflight_lock = threading.Lock()
+        self._last_prices_refresh = float('-inf')
+        self._last_tickers_update = float('-inf')  # time.monotonic() da última atualização completa via REST
         
         # Lista de símbolos com problemas para evitar operações repetidas com erro
-        self.problem_symbols = {}  # {symbol: {'reason': '...', 'timestamp': datetime}}
+        self.problem_symbols = {}  # {symbol: {'reason': '...', 'flagged_at': monotonic, 'expires_at': monotonic}}
+        self._problem_expiry = []  # heap de (expires_at, symbol) para expirar problemas em O(log n)
+        self._problem_lock = threading.Lock()  # Protege problem_symbols + heap (independente do rate limit)
         
         # Lista de símbolos com sinais recentes para evitar múltiplas compras seguidas
-        self.recent_signals = {}  # {symbol: timestamp}
+        self.recent_signals = {}  # {symbol: time.monotonic() do sinal}
+
+        # Pool de threads para chamadas REST em paralelo (I/O-bound)
+        self._rest_pool = ThreadPoolExecutor(
+            max_workers=getattr(config, 'rest_concurrency', 8),
+            thread_name_prefix='binance-rest'
+        )
         
         # Initialize Binance client with higher recv_window to address time sync issues
         self.client = Client(config.api_key, config.api_secret, tld='com')
-        self.client.options = {'recvWindow': 60000, 'timeout': 30}
-        
+        self._setup_signed_requests()
+
+        # Pool de conexões HTTP com keep-alive para reaproveitar sockets/TLS entre chamadas
+        self._setup_http_session()
+
         # Sync time with Binance server
         self._sync_time()
         
@@ -83,84 +179,538 @@ class BinanceClient:
         # Initialize active coins
         self.active_coins = []
         self.all_tickers = {}
+        self.coin_analysis = {}  # {symbol: {status, last_update}} - motivo do último pulo de compra
         
         # Track orders by coin
-        self.open_orders = {}  # {symbol: [orders]}
+        self.open_orders = {}  # {symbol: {orderId: order}}
+        self._order_locks = {}  # {symbol: RLock} - seções curtas de leitura/alteração de open_orders[symbol]
+        self._ghost_digest_cache = {}  # {symbol: digest} - estado da última verificação de fantasmas concluída
         
         # Trade history by coin
         self.trade_history = {}  # {symbol: [trades]}
-        
-        # Get all available trading pairs for our quote asset
+
+        # Filtros de LOT_SIZE pré-carregados do exchangeInfo (evitam REST + varredura a cada venda)
+        self._lot_step = {}    # {symbol: stepSize}
+        self._precision = {}   # {symbol: casas decimais do stepSize}
+        self._symbol_filters_updated = float('-inf')
+        self._refresh_symbol_filters()
+
+        # Websocket de tickers: mantém all_tickers/ticker_stats atualizados por push
+        self.twm = None
+        self.last_ws_ticker_update = None  # time.monotonic() da última mensagem
+
+        # Websocket de klines 1m (multiplex das moedas ativas) em buffers circulares
+        self._kline_socket = None
+        self._kline_symbols = ()
+        self._kline_ring = {}         # {symbol: deque[(open_time_ms, open, high, low, close, volume)]}
+        self._kline_ws_update = {}    # {symbol: time.monotonic() da última mensagem}
+        self._kline_frames = {}       # {symbol: (ring, último candle, limit, DataFrame)} montado do buffer
+        self._volatility = {}         # {symbol: {'last_open': t, 'prev_close': c, 'returns': RollingStd}}
+
+        # Websocket de book ticker (melhor bid/ask em tempo real) dos símbolos com ordens abertas
+        self._book_socket = None
+        self._book_symbols = ()
+        self._book_prices = {}  # {symbol: (preço médio bid/ask, time.monotonic())}
+
+        # Callbacks do websocket só enfileiram; uma thread dedicada aplica as atualizações
+        self._ws_queue = queue.SimpleQueue()
+        self._ws_consumer = None
+
+        # Get all available trading pairs for our quote asset (bootstrap via REST)
         self._update_all_tickers()
-        
+
         # Select initial active coins
         self.select_active_coins()
-    
+
+        # A partir daqui os preços chegam pelo websocket
+        if getattr(config, 'use_websocket', True):
+            self._start_websockets()
+
+    def _start_websockets(self):
+        """Inicia o stream !ticker@arr que empurra preço e estatísticas 24h de todos os pares"""
+        try:
+            self.twm = ThreadedWebsocketManager(api_key=self.config.api_key, api_secret=self.config.api_secret)
+            self.twm.daemon = True  # Não impedir o encerramento do processo
+            self.twm.start()
+
+            self._ws_consumer = threading.Thread(target=self._consume_ws_updates, name='binance-ws-consumer', daemon=True)
+            self._ws_consumer.start()
+
+            self.twm.start_ticker_socket(callback=self._on_ticker)
+            self.logger.info("Ticker websocket started (!ticker@arr)")
+        except Exception as e:
+            self.logger.error(f"Failed to start ticker websocket, using REST polling: {e}")
+            self.stop_websockets()
+            return
+
+        # User data stream: execuções de ordens e saldos empurrados pela exchange
+        # (o ThreadedWebsocketManager cuida do listenKey e do keepalive)
+        try:
+            self.twm.start_user_socket(callback=self._on_user_event)
+            self.logger.info("User data websocket started")
+        except Exception as e:
+            self.logger.error(f"Failed to start user data websocket, balances will be polled: {e}")
+
+        self._subscribe_klines()
+        self._subscribe_book_tickers()
+
+    def _subscribe_klines(self):
+        """(Re)assina o stream multiplex de klines 1m quando as moedas ativas mudam"""
+        if not self.twm:
+            return
+
+        symbols = tuple(sorted(self.active_coins))
+        if symbols == self._kline_symbols:
+            return
+
+        try:
+            if self._kline_socket:
+                self.twm.stop_socket(self._kline_socket)
+                self._kline_socket = None
+
+            # Descartar buffers de moedas que saíram da seleção
+            for symbol in list(self._kline_ring):
+                if symbol not in symbols:
+                    del self._kline_ring[symbol]
+                    self._kline_frames.pop(symbol, None)
+                    self._kline_ws_update.pop(symbol, None)
+                    self._volatility.pop(symbol, None)
+
+            if symbols:
+                streams = [f"{s.lower()}@kline_{Client.KLINE_INTERVAL_1MINUTE}" for s in symbols]
+                self._kline_socket = self.twm.start_multiplex_socket(callback=self._on_kline, streams=streams)
+                self.logger.info(f"Kline websocket subscribed for {len(symbols)} symbols")
+            self._kline_symbols = symbols
+        except Exception as e:
+            self.logger.error(f"Failed to subscribe kline websocket, using REST polling: {e}")
+            self._kline_socket = None
+            self._kline_symbols = ()
+
+    def _subscribe_book_tickers(self):
+        """
+        (Re)assina o stream multiplex <symbol>@bookTicker quando mudam as moedas ativas
+        ou os símbolos com ordens abertas (o loop de trading lê o preço desses símbolos)
+        """
+        if not self.twm:
+            return
+
+        symbols = set(self.active_coins)
+        symbols.update(symbol for symbol, orders in list(self.open_orders.items()) if orders)
+        symbols = tuple(sorted(symbols))
+        if symbols == self._book_symbols:
+            return
+
+        try:
+            if self._book_socket:
+                self.twm.stop_socket(self._book_socket)
+                self._book_socket = None
+
+            for symbol in list(self._book_prices):
+                if symbol not in symbols:
+                    del self._book_prices[symbol]
+
+            if symbols:
+                streams = [f"{s.lower()}@bookTicker" for s in symbols]
+                self._book_socket = self.twm.start_multiplex_socket(callback=self._on_book_ticker, streams=streams)
+                self.logger.info(f"Book ticker websocket subscribed for {len(symbols)} symbols")
+            self._book_symbols = symbols
+        except Exception as e:
+            self.logger.error(f"Failed to subscribe book ticker websocket: {e}")
+            self._book_socket = None
+            self._book_symbols = ()
+
+    def _on_book_ticker(self, msg):
+        """Callback do stream multiplex <symbol>@bookTicker (roda na thread do websocket)"""
+        self._ws_queue.put_nowait(('book', msg))
+
+    def _apply_book_ticker(self, msg):
+        """Guarda o preço médio entre melhor bid e melhor ask do símbolo"""
+        data = msg.get('data', msg)
+        if data.get('e') == 'error':
+            self.logger.warning(f"Book ticker websocket error: {data.get('m')}")
+            return
+        if 's' not in data or 'b' not in data or 'a' not in data:
+            return
+        self._book_prices[data['s']] = ((float(data['b']) + float(data['a'])) / 2, time.monotonic())
+
+    def _on_user_event(self, msg):
+        """Callback do user data stream (roda na thread do websocket)"""
+        self._ws_queue.put_nowait(('user', msg))
+
+    def _apply_user_event(self, msg):
+        """Processa executionReport (saídas OCO executadas) e outboundAccountPosition (saldos)"""
+        event = msg.get('e')
+        if event == 'error':
+            self.logger.warning(f"User data websocket error: {msg.get('m')}")
+        elif event == 'executionReport':
+            # Nossas vendas a mercado já são registradas pela resposta REST; aqui só
+            # interessam as pernas de OCO executadas pela própria exchange
+            if msg.get('X') == 'FILLED' and msg.get('S') == 'SELL' and msg.get('g', -1) != -1:
+                symbol = msg['s']
+                for order in list(self.open_orders.get(symbol, {}).values()):
+                    if order.get('oco_order_list_id') == msg['g'] and 'oco_order_ids' in order:
+                        executed_qty = float(msg['z'])
+                        exit_price = float(msg['Z']) / executed_qty if executed_qty else float(msg['L'])
+                        self._record_exchange_exit(symbol, order, exit_price)
+                        break
+        elif event == 'outboundAccountPosition':
+            self._apply_balance_update(msg.get('B', []))
+
+    def _apply_balance_update(self, balances_update):
+        """Mescla os saldos alterados no cache de saldos (substituindo o dict, sem mutar o antigo)"""
+        cache_data = self.cache['account_balance']
+        if cache_data['data'] is None:
+            return  # Sem snapshot completo ainda; o próximo get_account_balance busca via REST
+
+        balances = dict(cache_data['data'])
+        for balance in balances_update:
+            free = float(balance['f'])
+            locked = float(balance['l'])
+            if free > 0 or locked > 0:
+                balances[balance['a']] = {'free': free, 'locked': locked}
+            else:
+                balances.pop(balance['a'], None)
+        cache_data['data'] = balances
+        cache_data['timestamp'] = time.monotonic()
+
+    def _on_kline(self, msg):
+        """Callback do stream multiplex <symbol>@kline_1m (roda na thread do websocket)"""
+        self._ws_queue.put_nowait(('kline', msg))
+
+    def _apply_kline(self, msg):
+        """Aplica uma mensagem de kline no buffer do símbolo"""
+        data = msg.get('data', msg)
+        if data.get('e') == 'error':
+            self.logger.warning(f"Kline websocket error: {data.get('m')}")
+            return
+        if data.get('e') != 'kline':
+            return
+
+        symbol = data['s']
+        ring = self._kline_ring.get(symbol)
+        if not ring:
+            return  # Ainda sem bootstrap via REST
+
+        k = data['k']
+        candle = (int(k['t']), float(k['o']), float(k['h']), float(k['l']), float(k['c']), float(k['v']))
+
+        # Mesmo candle em formação: sobrescreve; candle novo: acrescenta (o mais antigo sai)
+        if ring[-1][0] == candle[0]:
+            ring[-1] = candle
+        elif candle[0] > ring[-1][0]:
+            ring.append(candle)
+        self._kline_ws_update[symbol] = time.monotonic()
+
+        # Candle fechado: um novo retorno entra na volatilidade móvel
+        if k['x']:
+            state = self._volatility.get(symbol)
+            if state and candle[0] > state['last_open']:
+                if state['prev_close']:
+                    state['returns'].push((candle[4] - state['prev_close']) / state['prev_close'])
+                state['prev_close'] = candle[4]
+                state['last_open'] = candle[0]
+
+    def _seed_kline_ring(self, symbol, klines):
+        """Inicializa o buffer de klines de um símbolo a partir da resposta REST"""
+        if symbol not in self._kline_symbols or not klines:
+            return
+        ring = self._kline_ring.get(symbol)
+        if ring and len(ring) > len(klines):
+            return  # Já temos mais histórico do que esta resposta
+        ring = deque(
+            ((int(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5])) for k in klines),
+            maxlen=KLINE_RING_SIZE
+        )
+        self._kline_ring[symbol] = ring
+        self._kline_ws_update[symbol] = time.monotonic()
+
+        # Volatilidade móvel a partir dos candles já fechados (o último ainda está em formação)
+        closed = list(ring)[-(VOLATILITY_WINDOW + 1):-1]
+        returns = RollingStd(VOLATILITY_WINDOW - 1)
+        for previous, current in zip(closed, closed[1:]):
+            if previous[4]:
+                returns.push((current[4] - previous[4]) / previous[4])
+        if closed:
+            self._volatility[symbol] = {'last_open': closed[-1][0], 'prev_close': closed[-1][4], 'returns': returns}
+
+    def _rolling_volatility(self, symbol):
+        """Volatilidade (% desvio padrão dos retornos 1m) mantida pelo websocket, ou None se indisponível"""
+        state = self._volatility.get(symbol)
+        if not state or len(state['returns']) < 19:  # Mesmo mínimo de 20 klines do cálculo via REST
+            return None
+        last_update = self._kline_ws_update.get(symbol)
+        if last_update is None or time.monotonic() - last_update >= self.config.websocket_stale_seconds:
+            return None
+        return state['returns'].std() * 100
+
+    def _klines_from_ring(self, symbol, limit):
+        """Monta o DataFrame de klines a partir do buffer do websocket, se estiver fresco"""
+        ring = self._kline_ring.get(symbol)
+        if not ring or len(ring) < limit:
+            return None
+        last_update = self._kline_ws_update.get(symbol)
+        if last_update is None or time.monotonic() - last_update >= self.config.websocket_stale_seconds:
+            return None
+
+        # O buffer só muda pelo último candle (sobrescrito ou acrescentado) ou por um novo
+        # bootstrap (outro deque): sem mudança, devolver o mesmo DataFrame da chamada anterior
+        last = ring[-1]
+        cached = self._kline_frames.get(symbol)
+        if cached is not None and cached[0] is ring and cached[1] == last and cached[2] == limit:
+            return cached[3]
+
+        arr = np.asarray(list(ring)[-limit:], dtype=np.float64)
+        df = pd.DataFrame(arr[:, 1:6].astype(np.float32), columns=KLINE_OHLCV_COLUMNS)
+        df.insert(0, 'timestamp', pd.to_datetime(arr[:, 0].astype(np.int64), unit='ms'))
+        self._kline_frames[symbol] = (ring, last, limit, df)
+        return df
+
+    def stop_websockets(self):
+        """Encerra os streams de websocket"""
+        if self.twm:
+            try:
+                self.twm.stop()
+            except Exception as e:
+                self.logger.warning(f"Error stopping websockets: {e}")
+            self.twm = None
+        if self._ws_consumer:
+            self._ws_queue.put_nowait(None)  # Sinaliza o fim para a thread consumidora
+            self._ws_consumer = None
+
+    def _consume_ws_updates(self):
+        """
+        Thread consumidora: drena a fila em lotes de até WS_BATCH_SIZE mensagens.
+        Vários arrays de ticker do mesmo lote viram uma única troca de
+        all_tickers/ticker_stats; klines vão direto para os buffers.
+        """
+        ws_queue = self._ws_queue
+        running = True
+        while running:
+            batch = [ws_queue.get()]
+            while len(batch) < WS_BATCH_SIZE:
+                try:
+                    batch.append(ws_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            prices = {}
+            stats = {}
+            for item in batch:
+                if item is None:
+                    running = False
+                    continue
+                kind, msg = item
+                try:
+                    if kind == 'ticker':
+                        self._parse_ticker(msg, prices, stats)
+                    elif kind == 'book':
+                        self._apply_book_ticker(msg)
+                    elif kind == 'user':
+                        self._apply_user_event(msg)
+                    else:
+                        self._apply_kline(msg)
+                except Exception as e:
+                    self.logger.error(f"Error handling {kind} websocket message: {e}")
+
+            if prices:
+                # Troca de referência (atômica sob o GIL): quem está iterando o dict antigo não é afetado
+                self.all_tickers = {**self.all_tickers, **prices}
+                self.ticker_stats = {**self.ticker_stats, **stats}
+                self.last_ws_ticker_update = time.monotonic()
+
+    def _websocket_fresh(self):
+        """Indica se os dados do websocket de tickers são recentes o suficiente para uso"""
+        if not self.twm or self.last_ws_ticker_update is None:
+            return False
+        age = time.monotonic() - self.last_ws_ticker_update
+        return age < self.config.websocket_stale_seconds
+
+    def _on_ticker(self, msg):
+        """Callback do stream !ticker@arr (roda na thread do websocket)"""
+        self._ws_queue.put_nowait(('ticker', msg))
+
+    def _parse_ticker(self, msg, prices, stats):
+        """Acumula em prices/stats os pares de uma mensagem !ticker@arr (pares que mudaram no último segundo)"""
+        if isinstance(msg, dict):
+            if msg.get('e') == 'error':
+                self.logger.warning(f"Ticker websocket error: {msg.get('m')}")
+            return
+
+        quote_asset = self.config.quote_asset
+        quote_len = len(quote_asset)
+        exclude = frozenset(self.config.exclude_coins)
+        for ticker in msg:
+            symbol = ticker['s']
+            price = float(ticker['c'])
+            prices[symbol] = price
+
+            if symbol.endswith(quote_asset):
+                base_asset = symbol[:-quote_len]
+                if base_asset in exclude:
+                    continue
+                stats[symbol] = {
+                    'price': price,
+                    'volume_24h': float(ticker['q']),
+                    'price_change_24h_pct': float(ticker['P']),
+                    'base_asset': base_asset,
+                    'symbol': symbol,
+                    'is_stablecoin': self._is_stablecoin(symbol, base_asset)
+                }
+
+    @classmethod
+    def _is_stablecoin(cls, symbol, base_asset):
+        """Par de stablecoin contra USDT (BUSD, USDC, TUSD, DAI...)"""
+        return symbol.endswith('USDT') and (
+            'USD' in base_asset or
+            base_asset in cls.STABLECOIN_BASES or
+            symbol in cls.STABLECOIN_PAIRS
+        )
+
+    def _setup_http_session(self):
+        """Monta um HTTPAdapter com pool maior na sessão requests usada pelo Client da Binance"""
+        # Retry apenas para erros 5xx: 429/418 são tratados em _make_request, e
+        # o urllib3 não repete POST (ordens) por padrão
+        retry = Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504])
+        # Pool nunca menor que o número de threads REST, senão conexões são descartadas
+        # (e o handshake TLS é refeito) quando todas as threads do pool estão em uso
+        pool_maxsize = max(64, self._rest_pool._max_workers)
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_maxsize, max_retries=retry)
+
+        session = self.client.session
+        session.mount('https://', adapter)
+        session.headers.update({'Connection': 'keep-alive'})
+
+        # Decodificar as respostas REST com orjson quando disponível
+        if HAS_ORJSON:
+            self.client._handle_response = self._handle_rest_response
+
+    def _setup_signed_requests(self):
+        """
+        Aplica recvWindow=RECV_WINDOW_MS por padrão a toda requisição assinada.
+        O Client não tem opção global para isso; só requisições assinadas aceitam o
+        parâmetro (nas públicas a Binance rejeitaria o parâmetro extra).
+        """
+        send_request = self.client._request
+
+        def request(method, uri, signed, force_params=False, **kwargs):
+            if signed:
+                data = kwargs.get('data')
+                if data is None:
+                    data = kwargs['data'] = {}
+                data.setdefault('recvWindow', RECV_WINDOW_MS)
+            return send_request(method, uri, signed, force_params, **kwargs)
+
+        self.client._request = request
+
+    @staticmethod
+    def _handle_rest_response(response):
+        """Mesmo contrato do Client._handle_response, mas com o parser de fast_json"""
+        if not (200 <= response.status_code < 300):
+            raise BinanceAPIException(response, response.status_code, response.text)
+        try:
+            return json_loads(response.content)
+        except ValueError:
+            raise BinanceRequestException(f"Invalid Response: {response.text}")
+
     def _make_request(self, request_func, weight=1, *args, **kwargs):
         """Executa uma requisição para a API da Binance com controle de rate limit"""
-        # Verificar se precisamos esperar para respeitar os limites
-        with self.rate_limit_lock:
-            # Resetar contador a cada minuto
-            now = datetime.now()
-            if (now - self.last_request_reset).total_seconds() > 60:
-                self.request_weight = 0
-                self.request_count = 0
-                self.last_request_reset = now
-                
-            # Verificar se estamos próximos do limite
-            if self.request_weight + weight > self.max_weight_per_minute:
-                # Calcular quanto tempo falta para o próximo reset
-                time_to_wait = 60 - (now - self.last_request_reset).total_seconds()
-                if time_to_wait > 0:
-                    self.logger.warning(f"Rate limit approaching, waiting {time_to_wait:.1f}s before next request")
-                    self.rate_limit_wait = True
-                    time.sleep(time_to_wait)
-                    
-                    # Reset após espera
-                    self.request_weight = 0
-                    self.request_count = 0
-                    self.last_request_reset = datetime.now()
+        # Verificar se precisamos esperar para respeitar os limites.
+        # O lock protege apenas a contabilidade; a espera acontece fora dele para
+        # não serializar as outras threads do pool enquanto uma delas dorme.
+        while True:
+            with self._rate_lock:
+                now = time.time()
+                now_s = int(now)
+                used = self._window_weight(now_s)
+
+                # Se ainda cabe no limite, reservar o peso no bucket do segundo atual.
+                # Com a janela vazia a requisição passa mesmo acima do limite configurado
+                # (esperar não liberaria espaço nenhum)
+                if used + weight <= self.max_weight_per_minute or used == 0:
+                    idx = now_s % 60
+                    if self._bucket_seconds[idx] != now_s:
+                        # Bucket de um minuto atrás: limpar preguiçosamente
+                        self._bucket_seconds[idx] = now_s
+                        self._weight_buckets[idx] = 0
+                    self._weight_buckets[idx] += weight
+                    self.request_weight = used + weight
+                    self.request_count += 1
                     self.rate_limit_wait = False
-            
-            # Incrementar contadores
-            self.request_weight += weight
-            self.request_count += 1
-        
+                    break
+
+                # Esperar até o bucket mais antigo da janela expirar
+                oldest = min(
+                    (sec for w, sec in zip(self._weight_buckets, self._bucket_seconds)
+                     if w and now_s - sec < 60),
+                    default=now_s
+                )
+                time_to_wait = max(oldest + 60 - now, 0.1)
+                self.rate_limit_wait = True
+
+            self.logger.warning(f"Rate limit approaching, waiting {time_to_wait:.1f}s before next request")
+            time.sleep(time_to_wait)
+
+        # Ressincronizar o relógio periodicamente (o próprio _sync_time passa por aqui,
+        # mas adia o prazo antes e não entra de novo)
+        if time.monotonic() >= self._next_time_sync:
+            self._sync_time()
+
         # Agora podemos fazer a requisição
         try:
-            return request_func(*args, **kwargs)
+            result = request_func(*args, **kwargs)
+            self._consecutive_429 = 0
+            return result
         except BinanceAPIException as e:
-            # Se for erro de rate limit, marcar para esperar mais
-            if "-1003" in str(e):
+            # Timestamp fora do recvWindow: ressincronizar antes da próxima requisição
+            if getattr(e, 'code', None) == -1021:
+                self.logger.warning(f"Timestamp outside recvWindow, resyncing time with server: {e}")
+                self._next_time_sync = float('-inf')
+
+            # Se for erro de rate limit (429/418), marcar para esperar mais
+            if "-1003" in str(e) or getattr(e, 'status_code', None) in (418, 429):
                 self.logger.warning(f"Rate limit exceeded: {e}")
-                # Extrair tempo de ban, se disponível
-                try:
-                    ban_message = str(e)
-                    if "IP banned until" in ban_message:
+                # Extrair tempo de ban, se disponível (ordem explícita do servidor)
+                ban_message = str(e)
+                wait_seconds = None
+                if "IP banned until" in ban_message:
+                    try:
                         ban_time_ms = int(ban_message.split("IP banned until ")[1].split(".")[0])
-                        ban_time = datetime.fromtimestamp(ban_time_ms / 1000)
-                        wait_seconds = (ban_time - datetime.now()).total_seconds()
-                        
-                        if wait_seconds > 0:
-                            self.logger.warning(f"API banned. Will wait for ban to expire: {wait_seconds:.1f}s")
-                            time.sleep(min(wait_seconds, 60))  # Esperar no máximo 60 segundos
-                except:
-                    # Se não conseguir extrair, esperar 60 segundos
-                    time.sleep(60)
-                    
-                # Redefinir contadores
-                with self.rate_limit_lock:
-                    self.request_weight = 0
-                    self.request_count = 0
-                    self.last_request_reset = datetime.now()
-            
+                        wait_seconds = ban_time_ms / 1000 - time.time()
+                    except (IndexError, ValueError):
+                        wait_seconds = None
+
+                if wait_seconds is not None:
+                    if wait_seconds > 0:
+                        self.logger.warning(f"API banned. Will wait for ban to expire: {wait_seconds:.1f}s")
+                        time.sleep(min(wait_seconds, 60))  # Esperar no máximo 60 segundos
+
+                    # Ban expirado: redefinir contadores
+                    with self._rate_lock:
+                        self._weight_buckets = [0] * 60
+                        self.request_weight = 0
+                else:
+                    # Throttle transitório: backoff exponencial (base 1.3) com jitter
+                    # para não sincronizar as threads do pool. A janela de peso é mantida.
+                    backoff = min(60, 0.05 * 1.3 ** self._consecutive_429) * random.uniform(0.9, 1.1)
+                    self._consecutive_429 += 1
+                    self.logger.warning(f"Backing off {backoff:.2f}s (attempt {self._consecutive_429})")
+                    time.sleep(backoff)
+
             # Propagar o erro
             raise
     
+    def _window_weight(self, now_s):
+        """Soma o peso consumido nos últimos 60 segundos (chamar com _rate_lock)"""
+        return sum(
+            w for w, sec in zip(self._weight_buckets, self._bucket_seconds)
+            if now_s - sec < 60
+        )
+
     def _sync_time(self):
         """
         Synchronize time with Binance server
         """
+        self._next_time_sync = time.monotonic() + TIME_SYNC_SECONDS
         try:
             # Get Binance server time
             server_time = self._make_request(self.client.get_server_time, weight=1)
@@ -170,6 +720,9 @@ class BinanceClient:
             local_timestamp = int(time.time() * 1000)
             self.time_offset = local_timestamp - server_timestamp
             
+            # O Client soma timestamp_offset ao timestamp das requisições assinadas
+            self.client.timestamp_offset = -self.time_offset
+            
             self.logger.info(f"Time offset with Binance server: {self.time_offset} ms")
             
         except BinanceAPIException as e:
@@ -192,15 +745,18 @@ class BinanceClient:
             # Get 24hr stats for all pairs
             stats = self.client.get_ticker()
             
-            # Filter for our quote asset
-            self.ticker_stats = {}
+            # Filter for our quote asset (valores fixos do loop em variáveis locais)
+            quote_asset = self.config.quote_asset
+            quote_len = len(quote_asset)
+            exclude = frozenset(self.config.exclude_coins)
+            ticker_stats = {}
             for stat in stats:
                 symbol = stat['symbol']
-                if symbol.endswith(self.config.quote_asset):
-                    base_asset = symbol[:-len(self.config.quote_asset)]
+                if symbol.endswith(quote_asset):
+                    base_asset = symbol[:-quote_len]
                     
                     # Skip pairs in exclude list
-                    if base_asset in self.config.exclude_coins:
+                    if base_asset in exclude:
                         continue
                     
                     # Calculate additional stats
@@ -209,15 +765,18 @@ class BinanceClient:
                     price_change_pct = float(stat['priceChangePercent'])
                     
                     # Store relevant info
-                    self.ticker_stats[symbol] = {
+                    ticker_stats[symbol] = {
                         'price': price,
                         'volume_24h': volume_24h,
                         'price_change_24h_pct': price_change_pct,
                         'base_asset': base_asset,
-                        'symbol': symbol
+                        'symbol': symbol,
+                        'is_stablecoin': self._is_stablecoin(symbol, base_asset)
                     }
+            self.ticker_stats = ticker_stats
+            self._last_tickers_update = time.monotonic()
             
-            self.logger.info(f"Updated ticker stats for {len(self.ticker_stats)} pairs with {self.config.quote_asset}")
+            self.logger.info(f"Updated ticker stats for {len(ticker_stats)} pairs with {quote_asset}")
             
         except BinanceAPIException as e:
             self.logger.error(f"Failed to get ticker data: {e}")
@@ -226,37 +785,28 @@ class BinanceClient:
     def select_active_coins(self):
         """Select active coins based on volume, trend, and volatility"""
         try:
-            # Update tickers first
-            self._update_all_tickers()
-            
+            # Update tickers first (o websocket já mantém ticker_stats atualizado, e
+            # dados REST com menos de 30s ainda servem para o ranking)
+            if not self._websocket_fresh() and time.monotonic() - self._last_tickers_update > TICKERS_REFRESH_SECONDS:
+                self._update_all_tickers()
+            
+            # Remover problemas e sinais expirados antes de filtrar
+            now = time.monotonic()
+            self._expire_problem_symbols(now)
+            self._expire_recent_signals(now)
+
             # Filter stable coins that we want to exclude
             filtered_pairs = {}
             for symbol, stats in self.ticker_stats.items():
-                base_asset = stats['base_asset']
-                
-                # Excluir stablecoins ou pares específicos
-                if symbol.endswith('USDT') and (
-                    'USD' in base_asset or  # BUSD, USDC, TUSD, etc.
-                    base_asset in ['DAI', 'PAX', 'SUSD', 'USDK', 'GUSD', 'HUSD', 'USDN'] or
-                    symbol in ['BUSDUSDT', 'USDCUSDT', 'TUSDUSDT', 'DAIUSDT']
-                ):
+                # Excluir stablecoins ou pares específicos (classificados ao montar ticker_stats)
+                if stats['is_stablecoin']:
                     self.logger.debug(f"Skipping stablecoin pair: {symbol}")
                     continue
                 
-                # Excluir moedas que sabemos que têm problemas persistentes
+                # Excluir moedas que sabemos que têm problemas persistentes (já sem os expirados)
                 if symbol in self.problem_symbols:
-                    problem = self.problem_symbols[symbol]
-                    problem_time = problem['timestamp']
-                    expiry_hours = problem.get('expiry_hours', 24)
-                    
-                    # Se o problema ainda é recente, pular
-                    time_since_problem = (datetime.now() - problem_time).total_seconds() / 3600
-                    if time_since_problem < expiry_hours:
-                        self.logger.debug(f"Skipping problematic pair: {symbol} - {problem['reason']} ({time_since_problem:.1f}h ago)")
-                        continue
-                    else:
-                        # Problema expirou, remover da lista
-                        del self.problem_symbols[symbol]
+                    self.logger.debug(f"Skipping problematic pair: {symbol} - {self.problem_symbols[symbol]['reason']}")
+                    continue
                 
                 # Include pair if it has sufficient volume
                 if stats['volume_24h'] >= self.config.min_volume_24h:
@@ -264,43 +814,31 @@ class BinanceClient:
             
             self.logger.info(f"Found {len(filtered_pairs)} non-stablecoin pairs with sufficient volume")
             
-            # Calculate volatility score for ranking
-            for symbol, stats in filtered_pairs.items():
-                # Get volatility data if available (24h price change as absolute value)
-                volatility = abs(stats['price_change_24h_pct'])
-                stats['volatility'] = volatility
-                
-                # Calculate a combined score (volume + volatility)
-                # Normalize volume (0-100) and add weighted volatility
-                volume_score = min(100, (stats['volume_24h'] / self.config.min_volume_24h) * 10)
-                volatility_score = min(100, volatility * 2)  # Weight volatility
-                
-                # Combined score favors both volume and volatility
-                stats['score'] = (volume_score * 0.6) + (volatility_score * 0.4)
-            
+            # Calculate volatility score for ranking (vetorizado com NumPy)
+            symbols = np.array(list(filtered_pairs.keys()), dtype=object)
+            count = len(filtered_pairs)
+            volumes = np.fromiter((stats['volume_24h'] for stats in filtered_pairs.values()), dtype=np.float64, count=count)
+            changes = np.fromiter((stats['price_change_24h_pct'] for stats in filtered_pairs.values()), dtype=np.float64, count=count)
+
+            # Combined score (volume + volatility): volume normalizado (0-100) e volatilidade ponderada
+            volume_scores = np.minimum(100, (volumes / self.config.min_volume_24h) * 10)
+            volatility_scores = np.minimum(100, np.abs(changes) * 2)
+            scores = (volume_scores * 0.6) + (volatility_scores * 0.4)
+
             # Check if we need to enforce uptrend requirement
-            high_volume_pairs = filtered_pairs
             if self.config.uptrend_required:
                 # Keep only pairs in uptrend (positive 24h change)
-                uptrend_pairs = {}
-                for symbol, stats in filtered_pairs.items():
-                    if stats['price_change_24h_pct'] > 0:
-                        uptrend_pairs[symbol] = stats
-                
-                high_volume_pairs = uptrend_pairs
-                self.logger.info(f"Filtered to {len(high_volume_pairs)} pairs in uptrend")
-            
+                uptrend_mask = changes > 0
+                symbols = symbols[uptrend_mask]
+                scores = scores[uptrend_mask]
+                self.logger.info(f"Filtered to {len(symbols)} pairs in uptrend")
+
             # Sort by combined score (descending)
-            sorted_pairs = sorted(
-                high_volume_pairs.items(), 
-                key=lambda x: x[1]['score'], 
-                reverse=True
-            )
-            
+            sorted_symbols = symbols[np.argsort(-scores, kind='stable')]
+
             # First, include forced pairs from config
             new_active_coins = []
-            for base_asset in self.config.include_coins:
-                symbol = f"{base_asset}{self.config.quote_asset}"
+            for symbol in self.config.include_symbols:
                 if symbol in self.ticker_stats:
                     # Check if it meets minimum requirements
                     stats = self.ticker_stats[symbol]
@@ -315,7 +853,7 @@ class BinanceClient:
             
             # Then add top pairs by volume until we reach max_active_coins
             remaining_slots = self.config.max_active_coins - len(new_active_coins)
-            for symbol, stats in sorted_pairs:
+            for symbol in sorted_symbols:
                 # Skip if already included
                 if symbol in new_active_coins:
                     continue
@@ -344,11 +882,13 @@ class BinanceClient:
             
             # Update active coins
             self.active_coins = new_active_coins
+            self._subscribe_klines()
+            self._subscribe_book_tickers()
             
             # Initialize open orders for new coins
             for symbol in self.active_coins:
-                if symbol not in self.open_orders:
-                    self.open_orders[symbol] = []
+                with self._order_lock(symbol):
+                    self.open_orders.setdefault(symbol, {})
                 if symbol not in self.trade_history:
                     self.trade_history[symbol] = []
             
@@ -359,70 +899,124 @@ class BinanceClient:
             self.logger.error(f"Error selecting active coins: {e}")
             return self.active_coins
     
+    def _local_price(self, symbol):
+        """Preço disponível sem chamada REST (websockets frescos ou cache válido), ou None"""
+        # Book ticker (tempo real) para símbolos com ordens abertas
+        book = self._book_prices.get(symbol)
+        if book is not None and time.monotonic() - book[1] < self.config.websocket_stale_seconds:
+            return book[0]
+
+        # Preço empurrado pelo websocket: leitura O(1) sem custo de peso na API
+        if self._websocket_fresh():
+            price = self.all_tickers.get(symbol)
+            if price is not None:
+                return price
+
+        # Verificar se temos o símbolo em cache válido
+        return self.cache['ticker_prices'].get(symbol)
+
+    def get_ticker_prices(self, symbols):
+        """
+        Preços de vários símbolos: usa websocket/cache quando possível e busca os
+        que faltam em uma única chamada GET /api/v3/ticker/price?symbols=[...].
+        Retorna {symbol: price}; símbolos sem preço ficam de fora.
+        """
+        prices = {}
+        missing = []
+        for symbol in symbols:
+            price = self._local_price(symbol)
+            if price is not None:
+                prices[symbol] = price
+            else:
+                missing.append(symbol)
+
+        if len(missing) == 1:
+            price = self.get_ticker_price(missing[0])
+            if price is not None:
+                prices[missing[0]] = price
+        elif missing:
+            price_cache = self.cache['ticker_prices']
+            try:
+                tickers = self._make_request(
+                    self.client.get_symbol_ticker,
+                    weight=4,
+                    symbols=json_dumps(missing).replace(' ', '')
+                )
+                fetched = {ticker['symbol']: float(ticker['price']) for ticker in tickers}
+                price_cache.update(fetched)
+                prices.update(fetched)
+            except BinanceAPIException as e:
+                self.logger.error(f"Failed to get ticker prices for {len(missing)} symbols: {e}")
+                for symbol in missing:
+                    price = price_cache.get_stale(symbol)
+                    if price is not None:
+                        prices[symbol] = price
+
+        return prices
+
     def get_ticker_price(self, symbol):
         """Get current price for a trading pair with cache support"""
-        cache_data = self.cache['ticker_prices']
-        
-        # Verificar se temos o símbolo em cache válido
-        if symbol in cache_data['data'] and cache_data['timestamp']:
-            cache_age = (datetime.now() - cache_data['timestamp']).total_seconds()
-            
-            # Se o cache ainda é válido, retornar dados do cache
-            if cache_age < cache_data['expiry']:
-                return cache_data['data'][symbol]
-        
+        price = self._local_price(symbol)
+        if price is not None:
+            return price
+
+        price_cache = self.cache['ticker_prices']
+
         # Cache expirado ou inválido, buscar dados novos
         try:
             # Se não atualizamos o cache há mais de 5 segundos, buscar todos os preços
-            if not cache_data['timestamp'] or (datetime.now() - cache_data['timestamp']).total_seconds() > 5:
+            if time.monotonic() - self._last_prices_refresh > 5:
                 # Atualizar todos os preços de uma vez (mais eficiente)
                 all_tickers = self._make_request(self.client.get_all_tickers, weight=2)
-                
+
                 # Atualizar o cache completo
                 prices = {ticker['symbol']: float(ticker['price']) for ticker in all_tickers}
-                self.cache['ticker_prices']['data'] = prices
-                self.cache['ticker_prices']['timestamp'] = datetime.now()
-                
+                price_cache.update(prices)
+                self._last_prices_refresh = time.monotonic()
+
                 # Retornar o preço específico solicitado
-                if symbol in prices:
-                    return prices[symbol]
-                return None
+                return prices.get(symbol)
             else:
                 # Buscar apenas o preço do símbolo solicitado
                 ticker = self._make_request(self.client.get_symbol_ticker, weight=1, symbol=symbol)
                 price = float(ticker['price'])
-                
+
                 # Atualizar apenas esse símbolo no cache
-                self.cache['ticker_prices']['data'][symbol] = price
-                
+                price_cache.set(symbol, price)
+
                 return price
-                
+
         except BinanceAPIException as e:
             self.logger.error(f"Failed to get ticker price for {symbol}: {e}")
-            
+
             # Se temos um valor em cache, usar mesmo que expirado
-            if symbol in cache_data['data']:
+            price = price_cache.get_stale(symbol)
+            if price is not None:
                 self.logger.warning(f"Using expired price cache for {symbol} due to API error")
-                return cache_data['data'][symbol]
-                
-            return None
+
+            return price
     
     def get_historical_klines(self, symbol, interval=Client.KLINE_INTERVAL_1MINUTE, limit=100):
         """Get historical candlestick data with cache support"""
         cache_key = f"{symbol}_{interval}_{limit}"
-        
-        # Verificar se temos dados em cache
-        if cache_key in self.cache['historical_klines']:
-            cache_entry = self.cache['historical_klines'][cache_key]
-            cache_age = (datetime.now() - cache_entry['timestamp']).total_seconds()
-            
-            # Para 1m usamos cache mais curto, para timeframes maiores podemos usar cache mais longo
-            cache_expiry = 10 if interval == Client.KLINE_INTERVAL_1MINUTE else 30
-            
-            # Se o cache ainda é válido, retornar dados do cache
-            if cache_age < cache_expiry:
-                return cache_entry['data'].copy()  # Retornar uma cópia para evitar modificação do cache
-        
+
+        # Para 1m usamos cache mais curto, para timeframes maiores podemos usar cache mais longo
+        if interval == Client.KLINE_INTERVAL_1MINUTE:
+            klines_cache = self.cache['historical_klines']
+        else:
+            klines_cache = self.cache['historical_klines_long']
+
+        # Buffer do websocket atualizado: nenhuma chamada REST necessária
+        if interval == Client.KLINE_INTERVAL_1MINUTE:
+            df = self._klines_from_ring(symbol, limit)
+            if df is not None:
+                return df
+
+        # Se o cache ainda é válido, retornar dados do cache
+        cached = klines_cache.get(cache_key)
+        if cached is not None:
+            return cached  # Sem cópia: o Copy-on-Write protege o cache de modificações
+
         # Cache expirado ou inválido, buscar dados novos
         try:
             klines = self._make_request(
@@ -433,69 +1027,146 @@ class BinanceClient:
                 limit=limit
             )
             
+            # Bootstrap do buffer do websocket com o histórico REST
+            if interval == Client.KLINE_INTERVAL_1MINUTE:
+                self._seed_kline_ring(symbol, klines)
+
             # Convert to pandas DataFrame
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_asset_volume', 'number_of_trades',
-                'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-            ])
-            
-            # Convert types
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = pd.to_numeric(df[col])
-            
+            df = self._klines_to_frame(klines)
+
             # Atualizar o cache
-            self.cache['historical_klines'][cache_key] = {
-                'data': df.copy(),
-                'timestamp': datetime.now()
-            }
-                
+            klines_cache.set(cache_key, df)
+
             return df
             
         except BinanceAPIException as e:
             self.logger.error(f"Failed to get historical data for {symbol}: {e}")
             
             # Se temos um valor em cache, usar mesmo que expirado
-            if cache_key in self.cache['historical_klines']:
+            cached = klines_cache.get_stale(cache_key)
+            if cached is not None:
                 self.logger.warning(f"Using expired klines cache for {symbol} due to API error")
-                return self.cache['historical_klines'][cache_key]['data'].copy()
-                
+                return cached
+
             return pd.DataFrame()
     
+    @staticmethod
+    def _klines_to_frame(klines):
+        """
+        Converte a resposta de klines da Binance em DataFrame com timestamp + OHLCV.
+        A conversão de tipos é feita em bloco pelo NumPy (uma matriz float32 para
+        as 5 colunas numéricas) em vez de coluna a coluna com pd.to_numeric.
+        float32 (~7 dígitos significativos) basta para preço/volume e reduz pela
+        metade a memória do cache e o tráfego nos cálculos de indicadores.
+        """
+        if not klines:
+            return pd.DataFrame(columns=['timestamp'] + KLINE_OHLCV_COLUMNS)
+
+        raw = np.asarray(klines, dtype=object)
+        ohlcv = raw[:, 1:6].astype(np.float32)
+
+        df = pd.DataFrame(ohlcv, columns=KLINE_OHLCV_COLUMNS)
+        df.insert(0, 'timestamp', pd.to_datetime(raw[:, 0].astype(np.int64), unit='ms'))
+        return df
+
+    def get_historical_klines_batch(self, symbols, interval=Client.KLINE_INTERVAL_1MINUTE, limit=100):
+        """Busca klines de vários símbolos em paralelo. Retorna {symbol: DataFrame}"""
+        results = {}
+        pending = symbols
+
+        # Buffers do websocket frescos são lidos direto; só os demais vão para o pool REST
+        if interval == Client.KLINE_INTERVAL_1MINUTE:
+            pending = []
+            for symbol in symbols:
+                df = self._klines_from_ring(symbol, limit)
+                if df is not None:
+                    results[symbol] = df
+                else:
+                    pending.append(symbol)
+
+        futures = {
+            self._rest_pool.submit(self.get_historical_klines, symbol, interval, limit): symbol
+            for symbol in pending
+        }
+
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                results[symbol] = future.result()
+            except Exception as e:
+                self.logger.error(f"Failed to get historical data for {symbol}: {e}")
+                results[symbol] = pd.DataFrame()
+
+        return results
+
     def _check_symbol_problems(self, symbol):
         """
         Verifica se um símbolo tem problemas conhecidos antes de tentar operar
         Retorna: None se não há problemas, ou string com o motivo se há problemas
         """
-        # Verificar se está na lista de problemas
-        if symbol in self.problem_symbols:
-            problem = self.problem_symbols[symbol]
-            problem_time = problem['timestamp']
-            expiry_hours = problem.get('expiry_hours', 24)
-            
-            # Verificar se o problema expirou
-            time_since_problem = (datetime.now() - problem_time).total_seconds() / 3600  # em horas
-            
-            if time_since_problem < expiry_hours:
-                # Problema ainda está ativo
-                return problem['reason']
-            else:
-                # Problema expirou, remover da lista
-                del self.problem_symbols[symbol]
-                self.logger.info(f"Problem for {symbol} has expired after {time_since_problem:.1f} hours. Removed from problem list.")
-                return None
+        now = time.monotonic()
+        
+        # Verificar se está na lista de problemas (expirados são removidos pelo heap)
+        self._expire_problem_symbols(now)
+        problem = self.problem_symbols.get(symbol)
+        if problem:
+            return problem['reason']
         
         # Verificar se tivemos sinais recentes para este símbolo (para evitar compras múltiplas)
-        if symbol in self.recent_signals:
-            signal_time = self.recent_signals[symbol]
-            minutes_since_signal = (datetime.now() - signal_time).total_seconds() / 60
-            
+        signal_time = self.recent_signals.get(symbol)
+        if signal_time is not None:
             # Não permitir mais de um sinal a cada 15 minutos para o mesmo símbolo
-            if minutes_since_signal < 15:
-                return f"Recent signal ({minutes_since_signal:.1f} minutes ago)"
+            if now - signal_time < RECENT_SIGNAL_SECONDS:
+                return f"Recent signal ({(now - signal_time) / 60:.1f} minutes ago)"
+            self.recent_signals.pop(symbol, None)
         
         return None
+
+    def _flag_problem_symbol(self, symbol, reason, expiry_hours=24):
+        """Marca um símbolo como problemático até expirar (relógio monotônico)"""
+        now = time.monotonic()
+        expires_at = now + expiry_hours * 3600
+        with self._problem_lock:
+            self.problem_symbols[symbol] = {
+                'reason': reason,
+                'flagged_at': now,
+                'expires_at': expires_at
+            }
+            heapq.heappush(self._problem_expiry, (expires_at, symbol))
+
+    def _expire_problem_symbols(self, now=None):
+        """Remove do dict os problemas cujo prazo venceu, consumindo o heap em ordem de expiração"""
+        if now is None:
+            now = time.monotonic()
+        heap = self._problem_expiry
+        if not heap or heap[0][0] > now:
+            return  # Caminho comum: nada vencido, sem pegar o lock
+
+        expired = []
+        with self._problem_lock:
+            while heap and heap[0][0] <= now:
+                expires_at, symbol = heapq.heappop(heap)
+                problem = self.problem_symbols.get(symbol)
+                # Entradas antigas no heap (símbolo remarcado ou limpo) são apenas descartadas
+                if problem and problem['expires_at'] == expires_at:
+                    del self.problem_symbols[symbol]
+                    expired.append((symbol, problem))
+
+        for symbol, problem in expired:
+            hours = (now - problem['flagged_at']) / 3600
+            self.logger.info(f"Problem for {symbol} has expired after {hours:.1f} hours. Removed from problem list.")
+    
+    def _expire_recent_signals(self, now=None):
+        """
+        Descarta em lote os sinais fora da janela de RECENT_SIGNAL_SECONDS.
+        Sem isso, símbolos que saem dos active_coins deixavam a entrada para sempre
+        (a limpeza só acontecia ao checar o próprio símbolo de novo).
+        """
+        if now is None:
+            now = time.monotonic()
+        cutoff = now - RECENT_SIGNAL_SECONDS
+        for symbol in [s for s, signal_time in list(self.recent_signals.items()) if signal_time <= cutoff]:
+            self.recent_signals.pop(symbol, None)
     
     def place_buy_order(self, symbol):
         """Place a market buy order"""
@@ -507,10 +1178,10 @@ class BinanceClient:
         
         try:
             # Extract base asset from symbol
-            base_asset = symbol[:-len(self.config.quote_asset)]
+            base_asset = self._base_asset(symbol)
             
             # Contar quantas ordens abertas realmente existem (não as que já foram vendidas)
-            active_orders = len(self.open_orders.get(symbol, []))
+            active_orders = len(self.open_orders.get(symbol, {}))
             
             # Check if max orders reached for this coin
             if active_orders >= self.config.max_orders_per_coin:
@@ -548,14 +1219,13 @@ class BinanceClient:
                 self.logger.error(f"Failed to get symbol info for {symbol}")
                 return None
                 
-            # Obter e validar os filtros da exchange
-            lot_size_filter = next((f for f in symbol_info['filters'] if f['filterType'] == 'LOT_SIZE'), None)
-            min_notional_filter = next((f for f in symbol_info['filters'] if f['filterType'] == 'MIN_NOTIONAL'), None)
-            min_qty_filter = next((f for f in symbol_info['filters'] if f['filterType'] == 'LOT_SIZE'), None)
+            # Filtros da exchange já indexados e convertidos em get_symbol_info
+            step_size = symbol_info['step_size']
+            min_qty = symbol_info['min_qty']
+            min_notional = symbol_info['min_notional']
             
             # Verificar quantidade mínima
-            if min_qty_filter:
-                min_qty = float(min_qty_filter.get('minQty', 0))
+            if min_qty is not None:
                 if quantity < min_qty:
                     self.logger.warning(f"Order quantity {quantity} below minimum {min_qty} for {symbol}")
                     # Tentar ajustar para o mínimo permitido
@@ -565,32 +1235,25 @@ class BinanceClient:
                     else:
                         self.logger.warning(f"Not enough funds to meet minimum quantity for {symbol}")
                                     # Adicionar à lista de símbolos com problemas para evitar futuras tentativas
-                        self.problem_symbols[symbol] = {
-                            'reason': 'Minimum quantity issues',
-                            'timestamp': datetime.now(),
-                            'expiry_hours': 24  # Não tentar novamente por 24 horas
+                        self._flag_problem_symbol(symbol, 'Minimum quantity issues', expiry_hours=24)  # Não tentar novamente por 24 horas
+                        self.coin_analysis[symbol] = {
+                            'status': 'Skipped - Minimum quantity issues',
+                            'last_update': datetime.now()
                         }
-                        if hasattr(self, 'coin_analysis'):
-                            self.coin_analysis[symbol] = {
-                                'status': 'Skipped - Minimum quantity issues',
-                                'last_update': datetime.now()
-                            }
                         return None
             
             # Verificar e ajustar para o step size correto
-            if lot_size_filter:
+            if step_size is not None:
                 # Format quantity to appropriate decimal places
-                step_size = float(lot_size_filter['stepSize'])
                 original_quantity = quantity
-                quantity = self._format_quantity(quantity, step_size)
+                quantity = self._format_quantity(quantity, symbol)
                 
                 # Log se houver ajuste significativo
                 if abs(original_quantity - quantity) / original_quantity > 0.01:  # Mais de 1% de diferença
                     self.logger.info(f"Quantity adjusted from {original_quantity} to {quantity} due to lot size restrictions")
             
             # Check minimum notional value (valor mínimo da ordem)
-            if min_notional_filter:
-                min_notional = float(min_notional_filter['minNotional'])
+            if min_notional is not None:
                 order_value = quantity * current_price
                 
                 if order_value < min_notional:
@@ -602,8 +1265,8 @@ class BinanceClient:
                         new_quantity = min_notional / current_price
                         
                         # Ajustar para o step size
-                        if lot_size_filter:
-                            new_quantity = self._format_quantity(new_quantity, step_size)
+                        if step_size is not None:
+                            new_quantity = self._format_quantity(new_quantity, symbol)
                             
                         # Verificar se a nova quantidade é válida
                         if new_quantity > 0 and new_quantity * current_price >= min_notional:
@@ -612,48 +1275,39 @@ class BinanceClient:
                         else:
                             self.logger.warning(f"Cannot adjust quantity properly for {symbol} to meet minimum requirements")
                             # Adicionar à lista de símbolos com problemas
-                            self.problem_symbols[symbol] = {
-                                'reason': 'Minimum value issues',
-                                'timestamp': datetime.now(),
-                                'expiry_hours': 24  # Não tentar novamente por 24 horas
+                            self._flag_problem_symbol(symbol, 'Minimum value issues', expiry_hours=24)  # Não tentar novamente por 24 horas
+                            self.coin_analysis[symbol] = {
+                                'status': 'Skipped - Minimum value issues',
+                                'last_update': datetime.now()
                             }
-                            if hasattr(self, 'coin_analysis'):
-                                self.coin_analysis[symbol] = {
-                                    'status': 'Skipped - Minimum value issues',
-                                    'last_update': datetime.now()
-                                }
                             return None
                     else:
                         self.logger.warning(f"Not enough funds to meet minimum notional value for {symbol}")
                         # Adicionar à lista de símbolos com problemas
-                        self.problem_symbols[symbol] = {
-                            'reason': 'Insufficient funds',
-                            'timestamp': datetime.now(),
-                            'expiry_hours': 1  # Tentar novamente após 1 hora (pode ser que fundos fiquem disponíveis)
+                        self._flag_problem_symbol(symbol, 'Insufficient funds', expiry_hours=1)  # Tentar novamente após 1 hora (pode ser que fundos fiquem disponíveis)
+                        self.coin_analysis[symbol] = {
+                            'status': 'Skipped - Insufficient funds',
+                            'last_update': datetime.now()
                         }
-                        if hasattr(self, 'coin_analysis'):
-                            self.coin_analysis[symbol] = {
-                                'status': 'Skipped - Insufficient funds',
-                                'last_update': datetime.now()
-                            }
                         return None
             
             # Verificar volatilidade da moeda para configurar targets
-            # Obter dados históricos recentes
-            klines = self.get_historical_klines(
-                symbol=symbol,
-                interval=Client.KLINE_INTERVAL_1MINUTE, 
-                limit=30
-            )
-            
-            # Calcular volatilidade (desvio padrão dos retornos em %)
-            if not klines.empty and len(klines) >= 20:
-                # Converter preços para retornos
-                returns = klines['close'].pct_change() * 100
-                
-                # Calcular volatilidade como desvio padrão dos retornos
-                volatility = returns.iloc[1:].std()  # Ignorar o primeiro valor (NaN)
+            # Volatilidade móvel mantida pelo websocket de klines (O(1)); sem ela, calcular dos klines
+            volatility = self._rolling_volatility(symbol)
+            if volatility is None:
+                # Obter dados históricos recentes
+                klines = self.get_historical_klines(
+                    symbol=symbol,
+                    interval=Client.KLINE_INTERVAL_1MINUTE, 
+                    limit=VOLATILITY_WINDOW
+                )
                 
+                # Calcular volatilidade (desvio padrão dos retornos em %)
+                if not klines.empty and len(klines) >= 20:
+                    # Calcular volatilidade como desvio padrão dos retornos (direto no array NumPy)
+                    volatility = self._returns_volatility(klines['close'].to_numpy(dtype=np.float64))
+            
+            if volatility is not None:
                 # Verificar se esta é uma moeda de alta volatilidade
                 is_high_volatility = volatility > self.config.high_volatility_threshold
                 self.logger.info(f"{symbol} volatility: {volatility:.2f}% - {'High' if is_high_volatility else 'Normal'} volatility coin")
@@ -682,6 +1336,10 @@ class BinanceClient:
                 quantity=quantity
             )
             
+            # Um único relógio por compra: datetime para exibição/histórico, monotonic para a lógica interna
+            filled_at = datetime.now()
+            filled_mono = time.monotonic()
+            
             # Enhance order with tracking information
             order['entry_price'] = current_price
             order['target_price'] = target_price
@@ -691,12 +1349,12 @@ class BinanceClient:
             order['profit_loss'] = 0
             order['symbol'] = symbol
             order['base_asset'] = base_asset
-            order['buy_time'] = datetime.now()
+            order['buy_time'] = filled_at
             order['highest_price'] = current_price  # Para trailing stop
             order['trailing_activated'] = False  # Flag para indicar se o trailing stop está ativo
             
             # Adicionar informações de volatilidade para ajustar trailing stop
-            if 'volatility' in locals():
+            if volatility is not None:
                 order['volatility'] = volatility
                 order['is_high_volatility'] = is_high_volatility
             else:
@@ -706,9 +1364,8 @@ class BinanceClient:
             self.logger.info(f"Buy order placed for {symbol}: {quantity} {base_asset} at ~{current_price} {self.config.quote_asset}")
             
             # Add to open orders
-            if symbol not in self.open_orders:
-                self.open_orders[symbol] = []
-            self.open_orders[symbol].append(order)
+            with self._order_lock(symbol):
+                self.open_orders.setdefault(symbol, {})[order['orderId']] = order
             
             # Add to trade history
             if symbol not in self.trade_history:
@@ -716,7 +1373,7 @@ class BinanceClient:
             
             self.trade_history[symbol].append({
                 'type': 'BUY',
-                'time': datetime.now(),
+                'time': filled_at,
                 'price': current_price,
                 'quantity': float(order['executedQty']),
                 'total': float(order['cummulativeQuoteQty']),
@@ -724,12 +1381,16 @@ class BinanceClient:
                 'symbol': symbol  # Adicionando o símbolo explicitamente
             })
             
+            # Deixar alvo e stop na própria exchange (disparam sem depender do nosso loop)
+            if self.config.get('use_oco_orders', False):
+                self._place_exit_oco(symbol, order)
+            
             # Registrar o símbolo como tendo um sinal recente para evitar múltiplas compras seguidas
-            self.recent_signals[symbol] = datetime.now()
+            self.recent_signals[symbol] = filled_mono
             
-            # Se estava na lista de problemas, remover
-            if symbol in self.problem_symbols:
-                del self.problem_symbols[symbol]
+            # Se estava na lista de problemas, remover (a entrada no heap é descartada ao expirar)
+            with self._problem_lock:
+                self.problem_symbols.pop(symbol, None)
             
             return order
             
@@ -738,77 +1399,221 @@ class BinanceClient:
             
             # Registrar o problema para evitar tentativas repetidas
             error_msg = str(e)
+            m = _ERR_RE.search(error_msg)
+            error_kind = m.lastgroup if m else None
             
-            if "Invalid quantity" in error_msg:
+            if error_kind == 'qty':
                 # Problema de quantidade mínima
-                self.problem_symbols[symbol] = {
-                    'reason': 'Invalid quantity',
-                    'timestamp': datetime.now(),
-                    'expiry_hours': 24
-                }
-            elif "MIN_NOTIONAL" in error_msg or "NOTIONAL" in error_msg:
+                self._flag_problem_symbol(symbol, 'Invalid quantity', expiry_hours=24)
+            elif error_kind == 'notional':
                 # Problema de valor mínimo
-                self.problem_symbols[symbol] = {
-                    'reason': 'Minimum order value not met',
-                    'timestamp': datetime.now(),
-                    'expiry_hours': 24
-                }
+                self._flag_problem_symbol(symbol, 'Minimum order value not met', expiry_hours=24)
             else:
                 # Outros erros
-                self.problem_symbols[symbol] = {
-                    'reason': f"API error: {error_msg[:50]}...",
-                    'timestamp': datetime.now(),
-                    'expiry_hours': 1  # Tentar novamente em 1 hora para outros erros
-                }
+                self._flag_problem_symbol(symbol, f"API error: {error_msg[:50]}...", expiry_hours=1)  # Tentar novamente em 1 hora para outros erros
                 
-            if hasattr(self, 'coin_analysis') and symbol in getattr(self, 'coin_analysis', {}):
+            if symbol in self.coin_analysis:
                 self.coin_analysis[symbol]['status'] = f"Error: {error_msg[:50]}..."
                 
             return None
     
-    def _format_quantity(self, quantity, step_size):
-        """Format quantity according to exchange requirements"""
-        if step_size == 0:
+    @staticmethod
+    def _returns_volatility(closes):
+        """Desvio padrão amostral (ddof=1) dos retornos simples em %, ignorando preços anteriores zerados"""
+        previous = closes[:-1]
+        valid = previous != 0
+        returns = np.diff(closes)[valid] / previous[valid]
+        if returns.size < 2:
+            return 0.0
+        return float(returns.std(ddof=1)) * 100
+
+    def _format_quantity(self, quantity, symbol):
+        """Format quantity according to exchange requirements (stepSize/precisão pré-carregados do símbolo)"""
+        step_size = self._lot_step.get(symbol)
+        if not step_size:
             return quantity
-            
-        # Determine a precisão baseada no step_size
-        precision = int(round(-math.log10(float(step_size))))
-        
-        # Arredonda para baixo para o múltiplo mais próximo de step_size
-        truncated = math.floor(quantity / float(step_size)) * float(step_size)
         
-        # Formata para o número correto de casas decimais
-        formatted = "{:0.{}f}".format(truncated, precision)
+        # Arredonda para baixo para o múltiplo de step_size; a tolerância evita que
+        # erros de ponto flutuante (ex: 0.3 / 0.1 = 2.999...) percam um step inteiro
+        steps = math.floor(quantity / step_size + 1e-9)
         
-        return float(formatted)
+        # round() com a precisão em cache remove o ruído binário sem formatar string
+        return round(steps * step_size, self._precision[symbol])
     
-    def place_sell_order(self, symbol, order_id):
-        """Place a market sell order for a specific open order"""
-        # Verificar se já estamos tentando vender esta ordem
-        for o in self.open_orders.get(symbol, []):
-            if o['orderId'] == order_id and o.get('selling_in_progress', False):
+    def _format_price(self, price, symbol_info):
+        """Arredonda um preço para baixo no tickSize do símbolo"""
+        tick_size = symbol_info.get('tick_size')
+        if not tick_size:
+            return price
+        return round(math.floor(price / tick_size + 1e-9) * tick_size, symbol_info['price_precision'])
+
+    def _place_exit_oco(self, symbol, order):
+        """Coloca uma OCO de venda (take profit + stop-limit) para a posição. Retorna True se criada"""
+        symbol_info = self.get_symbol_info(symbol)
+        if not symbol_info:
+            return False
+
+        # Com a comissão cobrada no ativo base, o saldo livre fica abaixo do executedQty:
+        # limitar a quantidade ao saldo real, como em place_sell_order. A OCO vem logo depois
+        # de uma compra ou de um cancelamento, que mudam o saldo: forçar leitura nova
+        base_asset = self._base_asset(symbol)
+        self.cache['account_balance']['timestamp'] = None
+        balances = self.get_account_balance() or {}
+        quantity = min(float(order['executedQty']), balances.get(base_asset, {}).get('free', 0))
+        quantity = self._format_quantity(quantity, symbol)
+
+        stop_price = self._format_price(order['stop_loss_price'], symbol_info)
+        stop_limit_price = self._format_price(order['stop_loss_price'] * 0.995, symbol_info)
+
+        # Abaixo dos mínimos do símbolo a OCO seria rejeitada: a posição fica no monitoramento local
+        min_qty = symbol_info.get('min_qty')
+        min_notional = symbol_info.get('min_notional')
+        if quantity <= 0 or (min_qty and quantity < min_qty) or (
+                min_notional and quantity * stop_limit_price < min_notional):
+            self.logger.warning(f"Exit OCO skipped for {symbol} order {order['orderId']}: quantity {quantity} {base_asset} below exchange minimums, monitoring locally")
+            return False
+
+        try:
+            oco = self._make_request(
+                self.client.create_oco_order,
+                weight=1,
+                symbol=symbol,
+                side=SIDE_SELL,
+                quantity=quantity,
+                price=self._format_price(order['target_price'], symbol_info),
+                stopPrice=stop_price,
+                stopLimitPrice=stop_limit_price,
+                stopLimitTimeInForce=TIME_IN_FORCE_GTC
+            )
+        except BinanceAPIException as e:
+            self.logger.error(f"Failed to place exit OCO for {symbol} order {order['orderId']}, monitoring locally: {e}")
+            return False
+
+        order['oco_order_list_id'] = oco['orderListId']
+        order['oco_order_ids'] = [o['orderId'] for o in oco['orders']]
+        order['oco_stop_price'] = stop_price
+        self.logger.info(f"Exit OCO placed for {symbol} order {order['orderId']}: target {order['target_price']:.6f}, stop {stop_price:.6f}")
+        return True
+
+    def _cancel_exit_oco(self, symbol, order):
+        """Cancela a OCO de saída. Retorna False se ela não existe mais (já executada na exchange)"""
+        order_ids = order.get('oco_order_ids')
+        if not order_ids:
+            return True
+
+        try:
+            # Cancelar uma perna cancela a lista OCO inteira
+            self._make_request(self.client.cancel_order, weight=1, symbol=symbol, orderId=order_ids[0])
+            still_open = True
+        except BinanceAPIException as e:
+            if e.code != -2011:
+                raise
+            still_open = False  # Unknown order: a OCO já foi executada (ou cancelada) na exchange
+
+        order.pop('oco_order_ids', None)
+        order.pop('oco_stop_price', None)
+
+        # O saldo deixou de estar travado: forçar nova leitura dos saldos
+        self.cache['account_balance']['timestamp'] = None
+        return still_open
+
+    def _refresh_exit_oco(self, symbol, order):
+        """
+        Reposiciona a OCO quando o trailing stop subiu o suficiente acima do stop
+        que está na exchange. Retorna False se a posição já foi encerrada pela OCO.
+        """
+        trailing_distance = order.get('trailing_distance', self.config.trailing_stop_distance)
+        if order['stop_loss_price'] < order['oco_stop_price'] * (1 + trailing_distance / 2):
+            return True
+
+        try:
+            if not self._cancel_exit_oco(symbol, order):
+                self._record_exchange_exit(symbol, order)
+                return False
+        except BinanceAPIException as e:
+            self.logger.error(f"Failed to cancel exit OCO for {symbol} order {order['orderId']}: {e}")
+            return True
+        self._place_exit_oco(symbol, order)
+        return True
+
+    def _record_exchange_exit(self, symbol, order, exit_price=None):
+        """
+        Registra a saída de uma posição encerrada pela OCO na exchange.
+        A mesma execução pode chegar pelo user data stream e pela checagem de ordens:
+        só a thread que remove a ordem de open_orders registra; as demais recebem None
+        """
+        order_id = order['orderId']
+        with self._order_lock(symbol):
+            if self.open_orders.get(symbol, {}).pop(order_id, None) is None:
+                return None
+        
+        if exit_price is None:
+            exit_price = self.get_ticker_price(symbol) or order['entry_price']
+        order.pop('oco_order_ids', None)
+        entry_price = order['entry_price']
+        total_fee_percentage = self.config.fee_percentage * 2
+        profit_loss = ((exit_price - entry_price) / entry_price * 100) - total_fee_percentage
+        
+        self.logger.info(f"Exit OCO already executed on exchange for {symbol} order {order_id} (~{exit_price}, P/L: {profit_loss:.2f}%)")
+        self.cache['account_balance']['timestamp'] = None
+        
+        if symbol not in self.trade_history:
+            self.trade_history[symbol] = []
+        self.trade_history[symbol].append({
+            'type': 'SELL',
+            'time': datetime.now(),
+            'price': exit_price,
+            'quantity': float(order['executedQty']),
+            'total': float(order['executedQty']) * exit_price,
+            'profit_loss': profit_loss,
+            'order_id': order.get('oco_order_list_id'),
+            'original_order_id': order_id,
+            'symbol': symbol
+        })
+        
+        return {
+            'symbol': symbol,
+            'base_asset': self._base_asset(symbol),
+            'profit_loss': profit_loss,
+            'entry_price': entry_price,
+            'exit_price': exit_price
+        }
+
+    def place_sell_order(self, symbol, order_id, balances=None):
+        """
+        Place a market sell order for a specific open order
+
+        balances: saldos já obtidos pelo chamador (ex: sell_all_positions), para não
+        refazer a consulta de conta (peso 10) a cada ordem
+        """
+        # Verificar se já estamos tentando vender esta ordem e marcar no mesmo passo
+        # (sob o lock do símbolo, para duas threads não venderem a mesma ordem)
+        with self._order_lock(symbol):
+            order = self.open_orders.get(symbol, {}).get(order_id)
+            if order and order.get('selling_in_progress', False):
                 self.logger.debug(f"Sell already in progress for {symbol} order {order_id}, skipping")
                 return None
+            if order:
+                # Marcar que estamos tentando vender para evitar tentativas múltiplas
+                order['selling_in_progress'] = True
 
         try:
-            # Find the order
-            order = None
-            for o in self.open_orders.get(symbol, []):
-                if o['orderId'] == order_id:
-                    order = o
-                    # Marcar que estamos tentando vender para evitar tentativas múltiplas
-                    o['selling_in_progress'] = True
-                    break
-            
             if not order:
                 self.logger.error(f"Order ID {order_id} not found in open orders for {symbol}")
                 return None
             
             # Extract base asset from symbol
-            base_asset = symbol[:-len(self.config.quote_asset)]
+            base_asset = self._base_asset(symbol)
+            
+            # A OCO de saída trava o saldo: cancelar antes de vender a mercado
+            if 'oco_order_ids' in order:
+                if not self._cancel_exit_oco(symbol, order):
+                    return self._record_exchange_exit(symbol, order)
+                balances = None  # O cancelamento liberou saldo travado: os saldos recebidos estão velhos
             
             # Verificar saldo atual da moeda base
-            balances = self.get_account_balance()
+            if balances is None:
+                balances = self.get_account_balance()
             actual_balance = balances.get(base_asset, {}).get('free', 0)
             
             # Get the quantity from the original order
@@ -819,7 +1624,8 @@ class BinanceClient:
                 if actual_balance <= 0:
                     self.logger.warning(f"No {base_asset} balance available to sell for order {order_id}. Removing from tracking.")
                     # Remover ordem dos registros já que não temos a moeda
-                    self.open_orders[symbol] = [o for o in self.open_orders[symbol] if o['orderId'] != order_id]
+                    with self._order_lock(symbol):
+                        self.open_orders[symbol].pop(order_id, None)
                     return None
                 else:
                     self.logger.warning(f"Insufficient {base_asset} balance. Adjusting from {order_quantity} to {actual_balance}")
@@ -827,14 +1633,10 @@ class BinanceClient:
             else:
                 quantity = order_quantity
             
-            # Formatar a quantidade corretamente
-            symbol_info = self.client.get_symbol_info(symbol)
-            lot_size_filter = next((f for f in symbol_info['filters'] if f['filterType'] == 'LOT_SIZE'), None)
-            
-            if lot_size_filter:
-                # Format quantity to appropriate decimal places
-                step_size = float(lot_size_filter['stepSize'])
-                quantity = self._format_quantity(quantity, step_size)
+            # Formatar a quantidade corretamente (stepSize pré-carregado)
+            step_size = self._get_lot_step(symbol)
+            if step_size:
+                quantity = self._format_quantity(quantity, symbol)
             
             # Place market sell order
             sell_order = self.client.create_order(
@@ -855,15 +1657,9 @@ class BinanceClient:
             
             self.logger.info(f"Sell order placed for {symbol}: {quantity} {base_asset} at ~{current_price} {self.config.quote_asset} (P/L: {profit_loss:.2f}%)")
             
-            # Remove from open orders
-            # Primeiro, limpe a flag de venda em andamento em caso de erro
-            for o in self.open_orders.get(symbol, []):
-                if o['orderId'] == order_id:
-                    o['selling_in_progress'] = False
-                    break
-                    
-            # Remover a ordem completamente da lista
-            self.open_orders[symbol] = [o for o in self.open_orders[symbol] if o['orderId'] != order_id]
+            # Remover a ordem completamente do rastreamento
+            with self._order_lock(symbol):
+                self.open_orders[symbol].pop(order_id, None)
             
             # Add profit/loss to sell order
             sell_order['profit_loss'] = profit_loss
@@ -893,22 +1689,25 @@ class BinanceClient:
         except BinanceAPIException as e:
             self.logger.error(f"Failed to place sell order for {symbol}: {e}")
             
-            # Limpar a flag de venda em andamento em caso de erro
-            for o in self.open_orders.get(symbol, []):
-                if o['orderId'] == order_id:
-                    o['selling_in_progress'] = False
+            if order_id in self.open_orders.get(symbol, {}):
+                # Se o erro for de saldo insuficiente e persistente, remover a ordem para evitar loops infinitos
+                m = _ERR_RE.search(str(e))
+                if m and m.lastgroup == 'bal':
+                    self.logger.warning(f"Insufficient balance error for {symbol} order {order_id}. Removing from tracking.")
+                    with self._order_lock(symbol):
+                        self.open_orders[symbol].pop(order_id, None)
                     
-                    # Se o erro for de saldo insuficiente e persistente, remover a ordem para evitar loops infinitos
-                    if "-2010" in str(e) and "insufficient balance" in str(e).lower():
-                        self.logger.warning(f"Insufficient balance error for {symbol} order {order_id}. Removing from tracking.")
-                        self.open_orders[symbol] = [o for o in self.open_orders[symbol] if o['orderId'] != order_id]
-                        
-                        # Força uma sincronização imediata de todas as ordens para este símbolo
-                        # já que provavelmente temos ordens fantasma
-                        self._check_and_fix_ghost_orders(symbol)
-                    break
+                    # Força uma sincronização imediata de todas as ordens para este símbolo
+                    # já que provavelmente temos ordens fantasma
+                    self._check_and_fix_ghost_orders(symbol)
                     
             return None
+        
+        finally:
+            # Venda não concluída (erro da API, de rede ou timeout no cancelamento da OCO ou na
+            # ordem): se a posição continua rastreada, devolvê-la ao monitoramento
+            if order and self.open_orders.get(symbol, {}).get(order_id) is order:
+                order['selling_in_progress'] = False
     
     def sell_all_positions(self, symbol=None):
         """
@@ -927,9 +1726,9 @@ class BinanceClient:
                 self.logger.error("Could not get account balances for selling positions")
                 return results
                 
-            # Remover USDT da lista (nossa moeda base/quote)
-            if self.config.quote_asset in balances:
-                del balances[self.config.quote_asset]
+            # Remover USDT da lista (nossa moeda base/quote) sem alterar o dict do cache,
+            # que é compartilhado com as tarefas abaixo e com o user data stream
+            balances = {asset: info for asset, info in balances.items() if asset != self.config.quote_asset}
                 
             # Lista de símbolos para processar
             symbols_to_process = []
@@ -955,87 +1754,33 @@ class BinanceClient:
                     symbols_to_process.append(full_symbol)
                     
                 # Adicionar também todos os símbolos que temos em nosso tracking
-                for tracked_symbol in self.open_orders.keys():
-                    if tracked_symbol not in symbols_to_process:
+                # (conjunto auxiliar: teste de pertinência O(1) mantendo a ordem da lista)
+                seen_symbols = set(symbols_to_process)
+                for tracked_symbol in list(self.open_orders):
+                    if tracked_symbol not in seen_symbols:
+                        seen_symbols.add(tracked_symbol)
                         symbols_to_process.append(tracked_symbol)
             
             self.logger.info(f"Selling all positions for {len(symbols_to_process)} symbols: {symbols_to_process}")
             
-            # Processar cada símbolo
-            for current_symbol in symbols_to_process:
-                # Extrair o ativo base
-                base_asset = current_symbol[:-len(self.config.quote_asset)]
-                
-                # Primeiro, vender ordens rastreadas pelo sistema
-                if current_symbol in self.open_orders and self.open_orders[current_symbol]:
-                    # Copy list to avoid modification during iteration
-                    orders_to_sell = self.open_orders[current_symbol].copy()
-                    
-                    for order in orders_to_sell:
-                        result = self.place_sell_order(current_symbol, order['orderId'])
-                        if result:
-                            results.append(result)
-                
-                # Depois, verificar se ainda há saldo remanescente e vender diretamente
-                if base_asset in balances and balances[base_asset]['free'] > 0:
+            # Processar os símbolos em paralelo no pool REST (limitado a REST_CONCURRENCY
+            # requisições simultâneas); as ordens de um mesmo símbolo seguem em sequência
+            if len(symbols_to_process) <= 1:
+                for current_symbol in symbols_to_process:
+                    results.extend(self._sell_symbol_positions(current_symbol, balances))
+            else:
+                futures = {
+                    self._rest_pool.submit(self._sell_symbol_positions, current_symbol, balances): current_symbol
+                    for current_symbol in symbols_to_process
+                }
+                for future in as_completed(futures):
                     try:
-                        # Obter saldo disponível
-                        quantity = balances[base_asset]['free']
-                        
-                        # Verificar se o símbolo existe
-                        symbol_info = self.get_symbol_info(current_symbol)
-                        if not symbol_info:
-                            self.logger.warning(f"Could not get symbol info for {current_symbol} to sell remaining balance")
-                            continue
-                        
-                        # Formatar quantidade para o formato correto
-                        lot_size_filter = next((f for f in symbol_info['filters'] if f['filterType'] == 'LOT_SIZE'), None)
-                        if lot_size_filter:
-                            step_size = float(lot_size_filter['stepSize'])
-                            quantity = self._format_quantity(quantity, step_size)
-                        
-                        if quantity <= 0:
-                            continue
-                            
-                        self.logger.info(f"Selling remaining balance of {quantity} {base_asset} not tracked by orders")
-                        
-                        # Criar ordem de venda direta
-                        sell_order = self.client.create_order(
-                            symbol=current_symbol,
-                            side=SIDE_SELL,
-                            type=ORDER_TYPE_MARKET,
-                            quantity=quantity
-                        )
-                        
-                        # Adicionar informações extras ao resultado
-                        current_price = self.get_ticker_price(current_symbol)
-                        sell_order['symbol'] = current_symbol
-                        sell_order['base_asset'] = base_asset
-                        
-                        # Adicionar aos resultados
-                        results.append(sell_order)
-                        
-                        # Adicionar ao histórico de trades
-                        if current_symbol not in self.trade_history:
-                            self.trade_history[current_symbol] = []
-                        
-                        self.trade_history[current_symbol].append({
-                            'type': 'SELL',
-                            'time': datetime.now(),
-                            'price': current_price if current_price else 0,
-                            'quantity': quantity,
-                            'total': float(sell_order.get('cummulativeQuoteQty', 0)),
-                            'profit_loss': 0,  # Não podemos calcular sem saber o preço de entrada
-                            'order_id': sell_order['orderId'],
-                            'original_order_id': 0,  # Não há ordem original
-                            'symbol': current_symbol,  # Adicionando o símbolo explicitamente
-                            'note': 'Sold remaining balance'
-                        })
-                        
-                    except BinanceAPIException as e:
-                        self.logger.error(f"Failed to sell remaining balance for {current_symbol}: {e}")
+                        results.extend(future.result())
+                    except Exception as e:
+                        self.logger.error(f"Error selling positions for {futures[future]}: {e}")
                 
-            # Atualizar balances após vender tudo
+            # Atualizar balances após vender tudo (única consulta depois da inicial)
+            self.cache['account_balance']['timestamp'] = None
             self.get_account_balance()
             
             return results
@@ -1044,225 +1789,574 @@ class BinanceClient:
             self.logger.error(f"Error in sell_all_positions: {e}")
             return results
     
+    def _sell_orders_batch(self, symbol, balances=None):
+        """
+        Vende todas as ordens rastreadas de um símbolo numa única ordem a mercado.
+        Spot não tem endpoint de ordens em lote: somar as quantidades dá 1 round-trip
+        por símbolo em vez de um por ordem. Retorna um resultado por ordem original,
+        no mesmo formato de place_sell_order.
+        """
+        results = []
+        base_asset = self._base_asset(symbol)
+        
+        # Marcar as ordens do lote (as que já estão sendo vendidas ficam de fora)
+        with self._order_lock(symbol):
+            orders = [o for o in self.open_orders.get(symbol, {}).values() if not o.get('selling_in_progress', False)]
+            for order in orders:
+                order['selling_in_progress'] = True
+        
+        # Qualquer saída antecipada (exceção no cancelamento da OCO, falha na venda) devolve as
+        # ordens ao monitoramento; as vendidas/encerradas já saíram de open_orders
+        try:
+            # A OCO de saída trava o saldo: cancelar antes; as já executadas saem do lote
+            to_sell = []
+            for order in orders:
+                if 'oco_order_ids' in order:
+                    if not self._cancel_exit_oco(symbol, order):
+                        exit_result = self._record_exchange_exit(symbol, order)
+                        if exit_result:
+                            results.append(exit_result)
+                        continue
+                    balances = None  # Saldo destravado pelo cancelamento: consultar de novo
+                to_sell.append(order)
+            
+            if not to_sell:
+                return results
+            
+            quantity = sum(float(order['executedQty']) for order in to_sell)
+            
+            # Verificar saldo atual da moeda base (o cancelamento da OCO invalida o cache)
+            if balances is None:
+                balances = self.get_account_balance()
+            actual_balance = balances.get(base_asset, {}).get('free', 0)
+            if actual_balance <= 0:
+                self.logger.warning(f"No {base_asset} balance available to sell {len(to_sell)} orders. Removing from tracking.")
+                with self._order_lock(symbol):
+                    for order in to_sell:
+                        self.open_orders[symbol].pop(order['orderId'], None)
+                return results
+            if actual_balance < quantity:
+                self.logger.warning(f"Insufficient {base_asset} balance. Adjusting from {quantity} to {actual_balance}")
+                quantity = actual_balance
+            
+            if self._get_lot_step(symbol):
+                quantity = self._format_quantity(quantity, symbol)
+            
+            try:
+                sell_order = self.client.create_order(
+                    symbol=symbol,
+                    side=SIDE_SELL,
+                    type=ORDER_TYPE_MARKET,
+                    quantity=quantity
+                )
+            except BinanceAPIException as e:
+                self.logger.error(f"Failed to place batch sell order for {symbol}: {e}")
+                return results
+            
+            # Preço médio executado vale para todas as ordens do lote
+            executed_qty = float(sell_order.get('executedQty', 0))
+            quote_qty = float(sell_order.get('cummulativeQuoteQty', 0))
+            exit_price = quote_qty / executed_qty if executed_qty else self.get_ticker_price(symbol)
+            total_fee_percentage = self.config.fee_percentage * 2  # Both buy and sell
+            
+            self.logger.info(f"Batch sell order placed for {symbol}: {quantity} {base_asset} covering {len(to_sell)} orders at ~{exit_price} {self.config.quote_asset}")
+            
+            with self._order_lock(symbol):
+                for order in to_sell:
+                    self.open_orders[symbol].pop(order['orderId'], None)
+            
+            if symbol not in self.trade_history:
+                self.trade_history[symbol] = []
+            
+            now = datetime.now()
+            for order in to_sell:
+                entry_price = order['entry_price']
+                order_quantity = float(order['executedQty'])
+                profit_loss = ((exit_price - entry_price) / entry_price * 100) - total_fee_percentage
+            
+                self.trade_history[symbol].append({
+                    'type': 'SELL',
+                    'time': now,
+                    'price': exit_price,
+                    'quantity': order_quantity,
+                    'total': order_quantity * exit_price,
+                    'profit_loss': profit_loss,
+                    'order_id': sell_order['orderId'],
+                    'original_order_id': order['orderId'],
+                    'symbol': symbol
+                })
+                results.append(dict(
+                    sell_order,
+                    profit_loss=profit_loss,
+                    entry_price=entry_price,
+                    exit_price=exit_price,
+                    symbol=symbol,
+                    base_asset=base_asset
+                ))
+            
+            return results
+        finally:
+            for order in orders:
+                order['selling_in_progress'] = False
+    
+    def _sell_symbol_positions(self, current_symbol, balances):
+        """Vende as ordens rastreadas e o saldo remanescente de um símbolo. Retorna as ordens de venda"""
+        results = []
+        
+        # Extrair o ativo base
+        base_asset = self._base_asset(current_symbol)
+        
+        # Primeiro, vender ordens rastreadas pelo sistema
+        tracked = self.open_orders.get(current_symbol)
+        if tracked and len(tracked) > 1:
+            # Várias ordens no mesmo símbolo: uma única venda a mercado cobre todas
+            results.extend(self._sell_orders_batch(current_symbol, balances))
+        elif tracked:
+            # Copiar os ids, já que place_sell_order remove as ordens durante a iteração
+            for order_id in tuple(tracked):
+                result = self.place_sell_order(current_symbol, order_id, balances=balances)
+                if result:
+                    results.append(result)
+        
+        # Depois, verificar se ainda há saldo remanescente e vender diretamente.
+        # balances é o snapshot de antes das vendas: descontar o que já foi vendido
+        # acima (uma venda em lote aparece em vários resultados com o mesmo orderId)
+        sold_qty = sum({r.get('orderId'): float(r.get('executedQty', 0)) for r in results}.values())
+        remaining = balances.get(base_asset, {}).get('free', 0) - sold_qty
+        if remaining > 0:
+            try:
+                # Obter saldo disponível
+                quantity = remaining
+                
+                # Verificar se o símbolo existe (e obter o stepSize pré-carregado)
+                step_size = self._get_lot_step(current_symbol)
+                if step_size is None:
+                    self.logger.warning(f"Could not get symbol info for {current_symbol} to sell remaining balance")
+                    return results
+                
+                # Formatar quantidade para o formato correto
+                if step_size:
+                    quantity = self._format_quantity(quantity, current_symbol)
+                
+                if quantity <= 0:
+                    return results
+                    
+                self.logger.info(f"Selling remaining balance of {quantity} {base_asset} not tracked by orders")
+                
+                # Criar ordem de venda direta
+                sell_order = self.client.create_order(
+                    symbol=current_symbol,
+                    side=SIDE_SELL,
+                    type=ORDER_TYPE_MARKET,
+                    quantity=quantity
+                )
+                
+                # Adicionar informações extras ao resultado
+                current_price = self.get_ticker_price(current_symbol)
+                sell_order['symbol'] = current_symbol
+                sell_order['base_asset'] = base_asset
+                
+                # Adicionar aos resultados
+                results.append(sell_order)
+                
+                # Adicionar ao histórico de trades
+                if current_symbol not in self.trade_history:
+                    self.trade_history[current_symbol] = []
+                
+                self.trade_history[current_symbol].append({
+                    'type': 'SELL',
+                    'time': datetime.now(),
+                    'price': current_price if current_price else 0,
+                    'quantity': quantity,
+                    'total': float(sell_order.get('cummulativeQuoteQty', 0)),
+                    'profit_loss': 0,  # Não podemos calcular sem saber o preço de entrada
+                    'order_id': sell_order['orderId'],
+                    'original_order_id': 0,  # Não há ordem original
+                    'symbol': current_symbol,  # Adicionando o símbolo explicitamente
+                    'note': 'Sold remaining balance'
+                })
+                
+            except BinanceAPIException as e:
+                self.logger.error(f"Failed to sell remaining balance for {current_symbol}: {e}")
+        
+        return results
+    
     def check_order_status(self):
         """Check status of all open orders and update profit/loss"""
+        # Manter o stream de book ticker alinhado com os símbolos que têm ordens abertas
+        self._subscribe_book_tickers()
+        
+        # Snapshot só dos orderIds de cada símbolo, tirado sob o lock do símbolo (o dict
+        # pode mudar enquanto as tarefas rodam); o lock não fica preso durante as vendas
+        symbols_with_orders = []
+        for symbol, orders in list(self.open_orders.items()):
+            with self._order_lock(symbol):
+                order_ids = tuple(orders)
+            if order_ids:
+                symbols_with_orders.append((symbol, order_ids))
+        
+        # Preços de todos os símbolos de uma vez (no máximo uma chamada REST)
+        prices = self.get_ticker_prices([symbol for symbol, _ in symbols_with_orders])
+        
         # Lista para rastrear ordens que devem ser removidas
-        orders_to_remove = {}  # {symbol: [order_ids]}
+        orders_to_remove = {}  # {symbol: {order_ids}}
+        
+        if len(symbols_with_orders) <= 1:
+            for symbol, order_ids in symbols_with_orders:
+                orders_to_remove[symbol] = self._check_symbol_orders(symbol, order_ids, prices.get(symbol))
+        else:
+            # Um símbolo por tarefa no pool REST: as vendas (e suas latências) de símbolos
+            # diferentes se sobrepõem; as ordens do mesmo símbolo continuam em sequência
+            futures = {
+                self._rest_pool.submit(self._check_symbol_orders, symbol, order_ids, prices.get(symbol)): symbol
+                for symbol, order_ids in symbols_with_orders
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    orders_to_remove[symbol] = future.result()
+                except Exception as e:
+                    self.logger.error(f"Error checking orders for {symbol}: {e}")
+        
+        # Remover ordens que foram marcadas para remoção
+        for symbol, order_ids in orders_to_remove.items():
+            if order_ids:
+                self.logger.info(f"Removing {len(order_ids)} problematic orders for {symbol}")
+                with self._order_lock(symbol):
+                    symbol_orders = self.open_orders[symbol]
+                    for order_id in order_ids:
+                        symbol_orders.pop(order_id, None)
+
+    def _base_asset(self, symbol):
+        """Ativo base do par (ex: BTCUSDT -> BTC), calculado uma vez por símbolo"""
+        base_asset = self._base_asset_cache.get(symbol)
+        if base_asset is None:
+            base_asset = symbol[:-self._quote_len]
+            self._base_asset_cache[symbol] = base_asset
+        return base_asset
+
+    def _clear_checked_orders(self, symbol, base_asset, checked_ids, still_ghost, message):
+        """
+        Remove as ordens verificadas (checked_ids) de open_orders[symbol] sob o lock do símbolo.
+        A condição (still_ghost(saldo livre)) é conferida de novo dentro do lock com o snapshot
+        de saldos atual; ordens registradas depois da verificação nunca são removidas
+        """
+        with self._order_lock(symbol):
+            if not still_ghost(self.get_cached_free_balance(base_asset)):
+                return
+            self.logger.warning(message)
+            symbol_orders = self.open_orders.get(symbol, {})
+            for order_id in checked_ids:
+                symbol_orders.pop(order_id, None)
+
+    def _order_lock(self, symbol):
+        """Lock das ordens de um símbolo (criado na primeira vez; setdefault é atômico)"""
+        lock = self._order_locks.get(symbol)
+        if lock is None:
+            lock = self._order_locks.setdefault(symbol, threading.RLock())
+        return lock
+
+    def _check_symbol_orders(self, symbol, order_ids, current_price):
+        """Atualiza P/L, trailing stop e dispara vendas das ordens de um símbolo. Retorna os orderIds a remover"""
+        order_ids_to_remove = set()
         
-        for symbol, orders in self.open_orders.items():
-            if not orders:
+        if not current_price:
+            return order_ids_to_remove
+        
+        # Resolver os ids do snapshot no dict vivo, pulando ordens removidas nesse meio tempo
+        live_orders = self.open_orders.get(symbol, {})
+        orders = [order for order in map(live_orders.get, order_ids) if order is not None]
+        count = len(orders)
+        
+        # Campos numéricos das ordens em arrays (SoA) para P/L e testes de alvo/stop em um passe vetorizado
+        entry = np.fromiter((o['entry_price'] for o in orders), dtype=np.float64, count=count)
+        highest = np.fromiter((o.get('highest_price', 0) for o in orders), dtype=np.float64, count=count)
+        stop = np.fromiter((o['stop_loss_price'] for o in orders), dtype=np.float64, count=count)
+        target = np.fromiter((o['target_price'] for o in orders), dtype=np.float64, count=count)
+        attempts = np.fromiter((o.get('sell_attempts', 0) for o in orders), dtype=np.int64, count=count)
+        trailing = np.fromiter((o.get('trailing_activated', False) for o in orders), dtype=bool, count=count)
+        
+        # Update profit/loss
+        profit_losses = (current_price - entry) / entry * 100
+        
+        # Só passam pelo caminho Python as ordens com alguma transição de estado:
+        # novo topo (trailing), trailing ativo, alvo/stop atingido ou tentativas esgotadas
+        needs_update = (attempts >= 3) | (current_price > highest) | trailing | (current_price >= target) | (current_price <= stop)
+        
+        for order, profit_loss in zip(orders, profit_losses.tolist()):
+            order['profit_loss'] = profit_loss
+            # Verificar quantas tentativas de venda já foram feitas
+            if 'sell_attempts' not in order:
+                order['sell_attempts'] = 0
+        
+        for index in np.flatnonzero(needs_update).tolist():
+            order = orders[index]
+            profit_loss = order['profit_loss']
+            
+            # Vendida/removida por outra thread (ex: sell_all, OCO, ghost check) durante este passe
+            if order['orderId'] not in self.open_orders.get(symbol, {}):
+                continue
+            
+            # Verificar se esta ordem já está marcada para remoção
+            if order['orderId'] in order_ids_to_remove:
                 continue
                 
-            # Inicializar lista para este símbolo
-            if symbol not in orders_to_remove:
-                orders_to_remove[symbol] = []
-                
-            current_price = self.get_ticker_price(symbol)
-            if not current_price:
+            # Se já tentamos vender muitas vezes sem sucesso, marcar para remoção
+            if order.get('sell_attempts', 0) >= 3:
+                self.logger.warning(f"Order {order['orderId']} for {symbol} has {order['sell_attempts']} failed sell attempts. Removing from tracking.")
+                order_ids_to_remove.add(order['orderId'])
                 continue
             
-            # Copy list to avoid modification during iteration
-            orders_copy = orders.copy()
-            
-            for order in orders_copy:
-                # Verificar se esta ordem já está marcada para remoção
-                if order['orderId'] in orders_to_remove.get(symbol, []):
-                    continue
-                    
-                # Update profit/loss
-                entry_price = order['entry_price']
-                profit_loss = (current_price - entry_price) / entry_price * 100
-                order['profit_loss'] = profit_loss
+            # Check if this is a new highest price for trailing stop
+            if current_price > order.get('highest_price', 0):
+                order['highest_price'] = current_price
                 
-                # Verificar quantas tentativas de venda já foram feitas
-                if 'sell_attempts' not in order:
-                    order['sell_attempts'] = 0
+                # Check if we should activate trailing stop
+                if self.config.trailing_stop and not order.get('trailing_activated', False):
+                    # Determinar o profit target para esta ordem específica
+                    profit_target_value = self.config.high_vol_profit_target if order.get('is_high_volatility', False) else self.config.profit_target
                     
-                # Se já tentamos vender muitas vezes sem sucesso, marcar para remoção
-                if order.get('sell_attempts', 0) >= 3:
-                    self.logger.warning(f"Order {order['orderId']} for {symbol} has {order['sell_attempts']} failed sell attempts. Removing from tracking.")
-                    orders_to_remove[symbol].append(order['orderId'])
-                    continue
-                
-                # Check if this is a new highest price for trailing stop
-                if current_price > order.get('highest_price', 0):
-                    order['highest_price'] = current_price
+                    # Calculate how far along we are toward target (as percentage of target)
+                    progress_to_target = profit_loss / (profit_target_value * 100)
                     
-                    # Check if we should activate trailing stop
-                    if self.config.trailing_stop and not order.get('trailing_activated', False):
-                        # Determinar o profit target para esta ordem específica
-                        profit_target_value = self.config.high_vol_profit_target if order.get('is_high_volatility', False) else self.config.profit_target
+                    # Para moedas muito voláteis, reduzir o limite de ativação ainda mais
+                    activation_threshold = self.config.trailing_stop_activation
+                    if order.get('volatility', 0) > self.config.high_volatility_threshold * 1.5:  # Moedas extremamente voláteis
+                        activation_threshold = self.config.trailing_stop_activation * 0.8  # Reduz em 20%
+                    
+                    # If we've reached the activation threshold
+                    if progress_to_target >= activation_threshold:
+                        # Activate trailing stop
+                        order['trailing_activated'] = True
                         
-                        # Calculate how far along we are toward target (as percentage of target)
-                        progress_to_target = profit_loss / (profit_target_value * 100)
+                        # Adaptar a distância do trailing stop com base na volatilidade
+                        trailing_distance = self.config.trailing_stop_distance
+                        if order.get('is_high_volatility', False):
+                            # Moedas mais voláteis precisam de mais espaço para variar
+                            # mas também mantemos o trailing mais próximo para capturar lucros rapidamente
+                            volatility_factor = min(order.get('volatility', 0) / self.config.high_volatility_threshold, 2.0)
+                            trailing_distance = self.config.trailing_stop_distance * (1 + (volatility_factor - 1) * 0.3)
                         
-                        # Para moedas muito voláteis, reduzir o limite de ativação ainda mais
-                        activation_threshold = self.config.trailing_stop_activation
-                        if order.get('volatility', 0) > self.config.high_volatility_threshold * 1.5:  # Moedas extremamente voláteis
-                            activation_threshold = self.config.trailing_stop_activation * 0.8  # Reduz em 20%
+                        new_stop_loss = current_price * (1 - trailing_distance)
                         
-                        # If we've reached the activation threshold
-                        if progress_to_target >= activation_threshold:
-                            # Activate trailing stop
-                            order['trailing_activated'] = True
-                            
-                            # Adaptar a distância do trailing stop com base na volatilidade
-                            trailing_distance = self.config.trailing_stop_distance
-                            if order.get('is_high_volatility', False):
-                                # Moedas mais voláteis precisam de mais espaço para variar
-                                # mas também mantemos o trailing mais próximo para capturar lucros rapidamente
-                                volatility_factor = min(order.get('volatility', 0) / self.config.high_volatility_threshold, 2.0)
-                                trailing_distance = self.config.trailing_stop_distance * (1 + (volatility_factor - 1) * 0.3)
-                            
-                            new_stop_loss = current_price * (1 - trailing_distance)
-                            
-                            # Only move stop loss up, never down
-                            if new_stop_loss > order['stop_loss_price']:
-                                old_stop = order['stop_loss_price']
-                                order['stop_loss_price'] = new_stop_loss
-                                order['trailing_distance'] = trailing_distance  # Armazenar a distância escolhida
-                                self.logger.info(f"Trailing stop activated for {symbol} order {order['orderId']}. Stop loss moved from {old_stop:.6f} to {new_stop_loss:.6f}")
+                        # Only move stop loss up, never down
+                        if new_stop_loss > order['stop_loss_price']:
+                            old_stop = order['stop_loss_price']
+                            order['stop_loss_price'] = new_stop_loss
+                            order['trailing_distance'] = trailing_distance  # Armazenar a distância escolhida
+                            self.logger.info(f"Trailing stop activated for {symbol} order {order['orderId']}. Stop loss moved from {old_stop:.6f} to {new_stop_loss:.6f}")
+            
+            # If trailing stop is active, update stop loss as price moves up
+            if order.get('trailing_activated', False):
+                # Usar a distância de trailing específica para esta ordem, se disponível
+                trailing_distance = order.get('trailing_distance', self.config.trailing_stop_distance)
                 
-                # If trailing stop is active, update stop loss as price moves up
-                if order.get('trailing_activated', False):
-                    # Usar a distância de trailing específica para esta ordem, se disponível
-                    trailing_distance = order.get('trailing_distance', self.config.trailing_stop_distance)
-                    
-                    # Calculate new stop loss based on highest price
-                    new_stop_loss = order['highest_price'] * (1 - trailing_distance)
-                    
-                    # Only move stop loss up, never down
-                    if new_stop_loss > order['stop_loss_price']:
-                        old_stop = order['stop_loss_price']
-                        order['stop_loss_price'] = new_stop_loss
-                        self.logger.debug(f"Trailing stop updated for {symbol} order {order['orderId']}. Stop loss moved from {old_stop:.6f} to {new_stop_loss:.6f}")
+                # Calculate new stop loss based on highest price
+                new_stop_loss = order['highest_price'] * (1 - trailing_distance)
                 
-                # Check if target or stop loss hit
-                # Evitar repetidas tentativas de venda se já estamos processando
-                if order.get('selling_in_progress', False):
-                    continue
+                # Only move stop loss up, never down
+                if new_stop_loss > order['stop_loss_price']:
+                    old_stop = order['stop_loss_price']
+                    order['stop_loss_price'] = new_stop_loss
+                    self.logger.debug(f"Trailing stop updated for {symbol} order {order['orderId']}. Stop loss moved from {old_stop:.6f} to {new_stop_loss:.6f}")
                 
-                # Verificar preço alvo
-                if current_price >= order['target_price']:
-                    self.logger.info(f"Target price reached for {symbol} order {order['orderId']}. Selling position.")
-                    result = self.place_sell_order(symbol, order['orderId'])
-                    if result is None:
-                        # Incrementar contador de tentativas de venda
-                        order['sell_attempts'] = order.get('sell_attempts', 0) + 1
-                        self.logger.warning(f"Failed to sell {symbol} order {order['orderId']}. Attempt {order['sell_attempts']}.")
-                        
-                        # Se falhou várias vezes, marcar para verificação mais detalhada
-                        if order['sell_attempts'] >= 3:
-                            self._check_and_fix_ghost_orders(symbol)
+                # Acompanhar o trailing stop na OCO da exchange
+                if 'oco_order_ids' in order and not self._refresh_exit_oco(symbol, order):
+                    continue
+            
+            # Check if target or stop loss hit
+            # Evitar repetidas tentativas de venda se já estamos processando
+            if order.get('selling_in_progress', False):
+                continue
+            
+            # Verificar preço alvo
+            if current_price >= order['target_price']:
+                self.logger.info(f"Target price reached for {symbol} order {order['orderId']}. Selling position.")
+                result = self.place_sell_order(symbol, order['orderId'])
+                if result is None:
+                    # Incrementar contador de tentativas de venda
+                    order['sell_attempts'] = order.get('sell_attempts', 0) + 1
+                    self.logger.warning(f"Failed to sell {symbol} order {order['orderId']}. Attempt {order['sell_attempts']}.")
                     
-                # Verificar stop loss    
-                elif current_price <= order['stop_loss_price']:
-                    # Log differently if this was a trailing stop or initial stop
-                    if order.get('trailing_activated', False) and order['stop_loss_price'] > order.get('initial_stop_loss', 0):
-                        self.logger.info(f"Trailing stop triggered for {symbol} order {order['orderId']} at {current_price:.6f}. Selling position with {profit_loss:.2f}% profit.")
-                    else:
-                        self.logger.info(f"Stop loss triggered for {symbol} order {order['orderId']}. Selling position.")
+                    # Se falhou várias vezes, marcar para verificação mais detalhada
+                    if order['sell_attempts'] >= 3:
+                        self._check_and_fix_ghost_orders(symbol)
+                
+            # Verificar stop loss    
+            elif current_price <= order['stop_loss_price']:
+                # Log differently if this was a trailing stop or initial stop
+                if order.get('trailing_activated', False) and order['stop_loss_price'] > order.get('initial_stop_loss', 0):
+                    self.logger.info(f"Trailing stop triggered for {symbol} order {order['orderId']} at {current_price:.6f}. Selling position with {profit_loss:.2f}% profit.")
+                else:
+                    self.logger.info(f"Stop loss triggered for {symbol} order {order['orderId']}. Selling position.")
+                
+                result = self.place_sell_order(symbol, order['orderId'])
+                if result is None:
+                    # Incrementar contador de tentativas de venda
+                    order['sell_attempts'] = order.get('sell_attempts', 0) + 1
+                    self.logger.warning(f"Failed to sell {symbol} order {order['orderId']}. Attempt {order['sell_attempts']}.")
                     
-                    result = self.place_sell_order(symbol, order['orderId'])
-                    if result is None:
-                        # Incrementar contador de tentativas de venda
-                        order['sell_attempts'] = order.get('sell_attempts', 0) + 1
-                        self.logger.warning(f"Failed to sell {symbol} order {order['orderId']}. Attempt {order['sell_attempts']}.")
-                        
-                        # Se falhou várias vezes, marcar para verificação mais detalhada
-                        if order['sell_attempts'] >= 3:
-                            self._check_and_fix_ghost_orders(symbol)
+                    # Se falhou várias vezes, marcar para verificação mais detalhada
+                    if order['sell_attempts'] >= 3:
+                        self._check_and_fix_ghost_orders(symbol)
         
-        # Remover ordens que foram marcadas para remoção
-        for symbol, order_ids in orders_to_remove.items():
-            if order_ids:
-                self.logger.info(f"Removing {len(order_ids)} problematic orders for {symbol}")
-                self.open_orders[symbol] = [o for o in self.open_orders[symbol] if o['orderId'] not in order_ids]
+        return order_ids_to_remove
     
     def get_account_balance(self):
         """Get account balance for all assets with cache support"""
-        # Verificar se temos dados em cache válidos
-        cache_data = self.cache['account_balance']
+        return self._cached(
+            'account_balance', self.cache['account_balance'],
+            'account_balance', self._fetch_account_balance
+        )
+    
+    def get_cached_free_balance(self, asset):
+        """
+        Saldo livre do ativo no último snapshot em memória (mantido pelo user data stream
+        e pelas consultas REST), sem nunca disparar uma chamada à API. 0 se desconhecido
+        """
+        balances = self.cache['account_balance']['data'] or {}
+        return balances.get(asset, {}).get('free', 0)
+    
+    def _cached(self, policy_key, cache_entry, refresh_key, fetch_fn, *args):
+        """
+        Consulta com cache segundo self.cache_policy[policy_key].
+        cache_entry: {'data', 'timestamp'} atual (ou None); fetch_fn(*args) busca via REST e
+        atualiza o cache; refresh_key identifica a atualização em segundo plano.
+        """
+        ttl, max_stale, error_stale = self.cache_policy[policy_key]
         cache_age = 0
         
-        if cache_data['data'] and cache_data['timestamp']:
-            cache_age = (datetime.now() - cache_data['timestamp']).total_seconds()
+        if cache_entry is not None and cache_entry['timestamp'] is not None:
+            cache_age = time.monotonic() - cache_entry['timestamp']
             
             # Se o cache ainda é válido, retornar dados do cache
-            if cache_age < cache_data['expiry']:
-                return cache_data['data']
+            if cache_age < ttl:
+                return cache_entry['data']
+            
+            # Levemente vencido: devolver já e atualizar em segundo plano
+            if cache_age < max_stale and cache_entry['data']:
+                self._refresh_in_background(refresh_key, fetch_fn, *args)
+                return cache_entry['data']
         
-        # Cache expirado ou inválido, buscar dados novos
+        # Cache expirado ou invalidado (timestamp None), buscar dados novos
         try:
-            # Registrar hora da tentativa para não sobrecarregar em caso de falha
-            self.cache['account_balance']['timestamp'] = datetime.now()
-            
-            account = self._make_request(self.client.get_account, weight=10)
-            balances = {}
-            
-            for balance in account['balances']:
-                # Only include non-zero balances
-                if float(balance['free']) > 0 or float(balance['locked']) > 0:
-                    balances[balance['asset']] = {
-                        'free': float(balance['free']),
-                        'locked': float(balance['locked'])
-                    }
-            
-            # Atualizar o cache
-            self.cache['account_balance']['data'] = balances
-            self.cache['account_balance']['timestamp'] = datetime.now()
-            
-            return balances
+            return fetch_fn(*args)
             
         except BinanceAPIException as e:
-            self.logger.error(f"Failed to get account balance: {e}")
+            target = f"{policy_key} for {args[0]}" if args else policy_key
+            self.logger.error(f"Failed to get {target}: {e}")
             
-            # Se o cache for relativamente recente (menos de 60 segundos), usar mesmo expirado
-            if cache_age < 60 and cache_data['data']:
-                self.logger.warning(f"Using expired balance cache ({cache_age:.1f}s old) due to API error")
-                return cache_data['data']
+            # Usar o valor antigo se ainda estiver dentro do limite de erro do nível
+            if cache_entry is not None and cache_entry['data'] and (error_stale is None or cache_age < error_stale):
+                self.logger.warning(f"Using expired {target} cache ({cache_age:.1f}s old) due to API error")
+                return cache_entry['data']
                 
             return None
     
+    def _fetch_account_balance(self):
+        """Busca os saldos via REST e atualiza o cache (BinanceAPIException sobe para o chamador)"""
+        # Registrar hora da tentativa para não sobrecarregar em caso de falha
+        self.cache['account_balance']['timestamp'] = time.monotonic()
+        
+        account = self._make_request(self.client.get_account, weight=10)
+        balances = {}
+        
+        for balance in account['balances']:
+            # Converter uma vez só; only include non-zero balances
+            free = float(balance['free'])
+            locked = float(balance['locked'])
+            if free > 0 or locked > 0:
+                balances[balance['asset']] = {'free': free, 'locked': locked}
+        
+        # Atualizar o cache
+        self.cache['account_balance']['data'] = balances
+        self.cache['account_balance']['timestamp'] = time.monotonic()
+        
+        return balances
+    
+    def _refresh_in_background(self, key, func, *args):
+        """Executa func(*args) no pool REST, no máximo uma atualização em andamento por chave"""
+        with self._inflight_lock:
+            if key in self._inflight:
+                return
+            self._inflight.add(key)
+        
+        def run():
+            try:
+                func(*args)
+            except Exception as e:
+                self.logger.warning(f"Background refresh of {key} failed: {e}")
+            finally:
+                with self._inflight_lock:
+                    self._inflight.discard(key)
+        
+        self._rest_pool.submit(run)
+    
+    def refresh_all(self, symbols):
+        """
+        Atualiza saldos e ordens abertas de vários símbolos em paralelo no pool REST
+        (tempo total ~ a chamada mais lenta, não a soma de todas).
+        Retorna {symbol: {orderIds BUY abertos na Binance}} ou False quando a consulta falhou.
+        """
+        balance_future = self._rest_pool.submit(self._fetch_account_balance)
+        futures = {
+            self._rest_pool.submit(self._make_request, self.client.get_open_orders, 3, symbol=symbol): symbol
+            for symbol in symbols
+        }
+        
+        open_order_ids = {}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                open_order_ids[symbol] = {o['orderId'] for o in future.result() if o['side'] == 'BUY'}
+            except Exception as e:
+                self.logger.error(f"Failed to check open orders for {symbol}: {e}")
+                open_order_ids[symbol] = False
+        
+        try:
+            balance_future.result()
+        except Exception as e:
+            self.logger.error(f"Failed to refresh account balance: {e}")
+        
+        return open_order_ids
+    
     def get_all_open_orders(self):
         """Get all open orders for all symbols"""
-        all_orders = []
-        for symbol, orders in self.open_orders.items():
-            for order in orders:
-                all_orders.append(order)
-        return all_orders
+        return list(chain.from_iterable(orders.values() for orders in list(self.open_orders.values())))
     
     def get_trade_history(self, symbol=None):
         """Get trade history for a specific symbol or all symbols"""
         if symbol:
             return self.trade_history.get(symbol, [])
         
-        # Combine all trade history
-        all_trades = []
-        for symbol, trades in self.trade_history.items():
-            all_trades.extend(trades)
-        
-        # Sort by time (newest first)
-        all_trades.sort(key=lambda x: x['time'], reverse=True)
-        
-        return all_trades
+        # Combine all trade history (newest first). Cada lista por símbolo já está em
+        # ordem de inserção (cronológica): percorrer de trás para frente e intercalar
+        # com heapq.merge, O(N log K) sem ordenar a lista combinada
+        return list(heapq.merge(
+            *(reversed(trades) for trades in list(self.trade_history.values())),
+            key=lambda x: x['time'],
+            reverse=True
+        ))
     
-    def _check_and_fix_ghost_orders(self, symbol):
+    def _check_and_fix_ghost_orders(self, symbol, real_order_ids=None):
         """
         Verifica e corrige ordens fantasmas para um determinado símbolo.
         Este método é chamado quando detectamos um erro de saldo insuficiente,
         o que pode indicar que estamos rastreando ordens que já não existem.
+        real_order_ids: ordens BUY abertas já obtidas por refresh_all (None = buscar se precisar)
         """
         self.logger.info(f"Checking for ghost orders for {symbol}")
         
         # Primeiro verificamos se há ordens rastreadas para este símbolo
-        # Se não, não precisamos fazer nada
-        tracked_orders = self.open_orders.get(symbol, [])
+        # Se não, não precisamos fazer nada (snapshot tirado sob o lock do símbolo)
+        with self._order_lock(symbol):
+            tracked_orders = list(self.open_orders.get(symbol, {}).values())
         if not tracked_orders:
             return
+        checked_ids = [order['orderId'] for order in tracked_orders]
         
         # Extrair o ativo base do símbolo
-        base_asset = symbol[:-len(self.config.quote_asset)]
+        base_asset = self._base_asset(symbol)
         
         # Verificar saldo real disponível usando cache
         try:
@@ -1274,27 +2368,53 @@ class BinanceClient:
             # Obter saldo real do ativo
             actual_balance = balances.get(base_asset, {}).get('free', 0)
             
+            # Nada mudou desde a última verificação concluída (mesmas ordens, mesmo saldo):
+            # pular somas e chamadas à API. A hora entra no digest para que ordens que
+            # passaram de 1 dia ainda sejam conferidas
+            digest = (
+                tuple(
+                    (o['orderId'], o.get('selling_in_progress', False), o['executedQty'], o.get('sell_attempts', 0))
+                    for o in tracked_orders
+                ),
+                actual_balance,
+                int(time.monotonic() // 3600)
+            )
+            if self._ghost_digest_cache.get(symbol) == digest:
+                self.logger.debug(f"Ghost order check for {symbol} skipped: nothing changed")
+                return
+            
             # Se não temos saldo, todas as ordens são fantasmas
             if actual_balance <= 0:
-                if tracked_orders:
-                    self.logger.warning(f"No {base_asset} balance available but have {len(tracked_orders)} tracked orders. Clearing all.")
-                    self.open_orders[symbol] = []
+                self._clear_checked_orders(
+                    symbol, base_asset, checked_ids, lambda balance: balance <= 0,
+                    f"No {base_asset} balance available but have {len(tracked_orders)} tracked orders. Clearing all."
+                )
                 return
                 
+            # Quantidades convertidas uma vez; o saldo esperado é mantido como soma corrente
+            # (descontando fantasmas/removidas) em vez de ser somado de novo a cada etapa
+            quantities = {
+                order['orderId']: float(order['executedQty'])
+                for order in tracked_orders if not order.get('selling_in_progress', False)
+            }
+            
             # Verificar se o saldo total esperado excede o saldo real
             # Se a discrepância é muito grande, limpar todas as ordens sem fazer mais checagens
-            expected_balance = sum(float(order['executedQty']) for order in tracked_orders if not order.get('selling_in_progress', False))
+            expected_balance = sum(quantities.values())
             
             # Se o saldo real é menos que 10% do esperado, provavelmente todas são fantasmas
             if actual_balance < expected_balance * 0.1:
-                self.logger.warning(f"Major balance discrepancy for {base_asset}: expected {expected_balance}, have {actual_balance}. Clearing all orders.")
-                self.open_orders[symbol] = []
+                self._clear_checked_orders(
+                    symbol, base_asset, checked_ids, lambda balance: balance < expected_balance * 0.1,
+                    f"Major balance discrepancy for {base_asset}: expected {expected_balance}, have {actual_balance}. Clearing all orders."
+                )
                 return
             
             # Se a discrepância é menor, verificar as ordens uma a uma
             # Verificar se há ordens muito antigas que podem ser ordens fantasmas
             ghost_orders = []
             now = datetime.now()
+            # real_order_ids: ordens BUY abertas na Binance, buscadas no máximo uma vez
             
             for order in tracked_orders:
                 # Se a ordem está marcada como em andamento para venda, ignorar
@@ -1310,82 +2430,146 @@ class BinanceClient:
                 order_time = order.get('buy_time', now)
                 if isinstance(order_time, datetime) and (now - order_time).total_seconds() > 86400:
                     # Verificar se é uma ordem real
-                    try:
-                        # Obter ordens abertas só para este symbol para economizar rate
-                        binance_open_orders = self._make_request(
-                            self.client.get_open_orders,
-                            weight=3,
-                            symbol=symbol
-                        )
-                        real_order_ids = [o['orderId'] for o in binance_open_orders if o['side'] == 'BUY']
-                        
-                        if order['orderId'] not in real_order_ids:
-                            ghost_orders.append(order['orderId'])
-                            
-                    except BinanceAPIException as e:
-                        self.logger.error(f"Failed to check open orders for {symbol}: {e}")
+                    if real_order_ids is None:
+                        try:
+                            # Obter ordens abertas só para este symbol para economizar rate
+                            # (o símbolo é o mesmo para todas as ordens: uma chamada basta)
+                            binance_open_orders = self._make_request(
+                                self.client.get_open_orders,
+                                weight=3,
+                                symbol=symbol
+                            )
+                            real_order_ids = {o['orderId'] for o in binance_open_orders if o['side'] == 'BUY'}
+                        except BinanceAPIException as e:
+                            self.logger.error(f"Failed to check open orders for {symbol}: {e}")
+                            real_order_ids = False  # Não repetir a chamada que falhou nesta verificação
+                    
+                    if real_order_ids is not False and order['orderId'] not in real_order_ids:
+                        ghost_orders.append(order['orderId'])
             
             # Remover ordens fantasmas
             if ghost_orders:
                 self.logger.warning(f"Found {len(ghost_orders)} ghost orders for {symbol}: {ghost_orders}")
-                self.open_orders[symbol] = [o for o in tracked_orders if o['orderId'] not in ghost_orders]
+                with self._order_lock(symbol):
+                    symbol_orders = self.open_orders[symbol]
+                    for order_id in ghost_orders:
+                        symbol_orders.pop(order_id, None)
+                        expected_balance -= quantities.pop(order_id, 0.0)
                 
-            # Recalcular se necessário
-            remaining_orders = self.open_orders.get(symbol, [])
-            if remaining_orders:
-                expected_balance = sum(float(order['executedQty']) for order in remaining_orders if not order.get('selling_in_progress', False))
+            # Se ainda há discrepância, remover as ordens mais antigas primeiro
+            if quantities and expected_balance > actual_balance * 1.02:  # Permitir 2% de margem
+                self.logger.warning(f"Balance discrepancy after removing ghosts for {base_asset}: expected {expected_balance}, have {actual_balance}")
                 
-                # Se ainda há discrepância, remover as ordens mais antigas primeiro
-                if expected_balance > actual_balance * 1.02:  # Permitir 2% de margem
-                    self.logger.warning(f"Balance discrepancy after removing ghosts for {base_asset}: expected {expected_balance}, have {actual_balance}")
-                    
-                    # Ordenar ordens por tempo (mais antigas primeiro)
-                    remaining_orders.sort(key=lambda o: o.get('buy_time', datetime.now()))
-                    
-                    # Remover ordens antigas até que a soma seja compatível com o saldo real
-                    while expected_balance > actual_balance * 1.02 and remaining_orders:
-                        order_to_remove = remaining_orders[0]
-                        order_qty = float(order_to_remove['executedQty'])
+                # Fila das ordens por tempo (mais antigas primeiro); popleft é O(1).
+                # Ordens em venda ficam de fora, como na soma do saldo esperado
+                oldest_first = deque(sorted(
+                    (order for order in tracked_orders if order['orderId'] in quantities),
+                    key=lambda o: o.get('buy_time', now)
+                ))
+                
+                # Remover ordens antigas até que a soma seja compatível com o saldo real
+                with self._order_lock(symbol):
+                    symbol_orders = self.open_orders.get(symbol, {})
+                    while expected_balance > actual_balance * 1.02 and oldest_first:
+                        order_to_remove = oldest_first.popleft()
+                        order_qty = quantities[order_to_remove['orderId']]
                         self.logger.warning(f"Removing old order {order_to_remove['orderId']} with qty {order_qty}")
-                        remaining_orders.pop(0)
+                        symbol_orders.pop(order_to_remove['orderId'], None)
                         expected_balance -= order_qty
-                    
-                    # Atualizar lista final
-                    self.open_orders[symbol] = remaining_orders
+            
+            self._ghost_digest_cache[symbol] = digest
                     
         except Exception as e:
             self.logger.error(f"Error checking ghost orders for {symbol}: {e}")
     
     def get_symbol_info(self, symbol):
         """Get detailed information for a symbol with cache support"""
-        # Verificar se temos dados em cache
-        if symbol in self.cache['symbol_info']:
-            # Symbol info não muda com frequência, cache por 24 horas
-            cache_entry = self.cache['symbol_info'][symbol]
-            cache_age = (datetime.now() - cache_entry['timestamp']).total_seconds()
-            
-            # Cache com validade de 24 horas (86400 segundos)
-            if cache_age < 86400:
-                return cache_entry['data']
+        return self._cached(
+            'symbol_info', self.cache['symbol_info'].get_stale(symbol),
+            ('symbol_info', symbol), self._fetch_symbol_info, symbol
+        )
+
+    def _fetch_symbol_info(self, symbol):
+        """Busca o symbol info via REST, indexa os filtros e atualiza o cache"""
+        symbol_info = self._make_request(self.client.get_symbol_info, weight=2, symbol=symbol)
+        if symbol_info:
+            self._index_symbol_filters(symbol_info)
+            self._store_lot_step(symbol, symbol_info)
         
-        # Cache expirado ou inválido, buscar dados novos
+        # Atualizar o cache
+        self.cache['symbol_info'].set(symbol, {
+            'data': symbol_info,
+            'timestamp': time.monotonic()
+        })
+        
+        return symbol_info
+
+    @staticmethod
+    def _index_symbol_filters(symbol_info):
+        """
+        Indexa os filtros por tipo e já converte os valores usados nas ordens,
+        evitando varrer a lista de filtros e reconverter strings a cada ordem.
+        """
+        filters_by_type = {f['filterType']: f for f in symbol_info.get('filters', [])}
+        lot_size = filters_by_type.get('LOT_SIZE')
+        min_notional = filters_by_type.get('MIN_NOTIONAL')
+
+        symbol_info['filters_by_type'] = filters_by_type
+        symbol_info['step_size'] = float(lot_size['stepSize']) if lot_size else None
+        symbol_info['quantity_precision'] = (
+            int(round(-math.log10(symbol_info['step_size']))) if symbol_info['step_size'] else None
+        )
+        symbol_info['min_qty'] = float(lot_size.get('minQty', 0)) if lot_size else None
+        symbol_info['min_notional'] = float(min_notional['minNotional']) if min_notional else None
+
+        price_filter = filters_by_type.get('PRICE_FILTER')
+        symbol_info['tick_size'] = float(price_filter['tickSize']) if price_filter else None
+        symbol_info['price_precision'] = (
+            int(round(-math.log10(symbol_info['tick_size']))) if symbol_info['tick_size'] else None
+        )
+        return symbol_info
+
+    def _store_lot_step(self, symbol, symbol_info):
+        """Registra stepSize e precisão do símbolo nos mapas usados pelas vendas"""
+        if symbol_info['step_size'] is not None:
+            self._lot_step[symbol] = symbol_info['step_size']
+            self._precision[symbol] = symbol_info['quantity_precision']
+
+    def _refresh_symbol_filters(self):
+        """Baixa o exchangeInfo completo e indexa os filtros de todos os pares de uma vez"""
+        now = time.monotonic()
+        self._symbol_filters_updated = now  # Mesmo em caso de falha, não repetir a cada venda
         try:
-            symbol_info = self._make_request(self.client.get_symbol_info, weight=2, symbol=symbol)
-            
-            # Atualizar o cache
-            self.cache['symbol_info'][symbol] = {
-                'data': symbol_info,
-                'timestamp': datetime.now()
-            }
-            
-            return symbol_info
-            
+            exchange_info = self._make_request(self.client.get_exchange_info, weight=20)
         except BinanceAPIException as e:
-            self.logger.error(f"Failed to get symbol info for {symbol}: {e}")
-            
-            # Se temos um valor em cache, usar mesmo que expirado
-            if symbol in self.cache['symbol_info']:
-                self.logger.warning(f"Using expired symbol info cache for {symbol} due to API error")
-                return self.cache['symbol_info'][symbol]['data']
-                
-            return None
\ No newline at end of file
+            self.logger.error(f"Failed to load exchange info, symbol filters will be fetched on demand: {e}")
+            return
+
+        # Os mapas de stepSize cobrem todos os pares (são pequenos); o symbol info completo
+        # só fica em cache para os pares da nossa quote asset, os únicos que o bot opera
+        quote_asset = self.config.quote_asset
+        quote_pairs = {}
+        for symbol_info in exchange_info.get('symbols', []):
+            self._index_symbol_filters(symbol_info)
+            symbol = symbol_info['symbol']
+            self._store_lot_step(symbol, symbol_info)
+            if symbol_info.get('quoteAsset') == quote_asset:
+                quote_pairs[symbol] = {'data': symbol_info, 'timestamp': now}
+        self.cache['symbol_info'].update(quote_pairs)
+
+        self.logger.info(f"Loaded symbol filters for {len(self._lot_step)} pairs")
+
+    def _get_lot_step(self, symbol):
+        """stepSize do LOT_SIZE (0.0 se o par não tem o filtro), ou None se o símbolo não existe"""
+        if time.monotonic() - self._symbol_filters_updated > SYMBOL_FILTERS_REFRESH_SECONDS:
+            self._refresh_symbol_filters()
+
+        step_size = self._lot_step.get(symbol)
+        if step_size is not None:
+            return step_size
+
+        # Par novo ou exchangeInfo indisponível: buscar só este símbolo
+        symbol_info = self.get_symbol_info(symbol)
+        if not symbol_info:
+            return None
+        return symbol_info['step_size'] or 0.0
@@ -1,9 +1,45 @@
 import dash
-from dash import dcc, html, Input, Output, no_update
+from dash import dcc, html, dash_table, Input, Output, no_update
+from dash.dash_table.Format import Format, Scheme, Symbol
 import dash_bootstrap_components as dbc
+import plotly.io as pio
 import logging
 from datetime import datetime
 
+from src.utils.fast_json import HAS_ORJSON
+
+# O Dash serializa as respostas dos callbacks com plotly.io.json (não com o JSON do Flask):
+# com orjson instalado, fixar esse engine em vez de depender da detecção "auto"
+if HAS_ORJSON:
+    pio.json.config.default_engine = "orjson"
+
+# Intervalo de atualização dos cards (ms)
+UPDATE_INTERVAL_MS = 5000
+
+# Tabelas enviadas como registros simples (DataTable) em vez de componentes Tr/Td
+_PRICE_FORMAT = Format(precision=6, scheme=Scheme.fixed)
+POSITIONS_COLUMNS = [
+    {"name": "Symbol", "id": "symbol"},
+    {"name": "Quantity", "id": "quantity", "type": "numeric", "format": _PRICE_FORMAT},
+    {"name": "Entry Price", "id": "entry_price", "type": "numeric", "format": _PRICE_FORMAT},
+    {"name": "Current P/L", "id": "profit_loss", "type": "numeric",
+     "format": Format(precision=2, scheme=Scheme.fixed).symbol(Symbol.yes).symbol_suffix("%")},
+    {"name": "Target", "id": "target_price", "type": "numeric", "format": _PRICE_FORMAT},
+    {"name": "Stop Loss", "id": "stop_loss_price", "type": "numeric", "format": _PRICE_FORMAT},
+    {"name": "Time", "id": "time"}
+]
+COINS_COLUMNS = [
+    {"name": "Symbol", "id": "symbol"},
+    {"name": "Price", "id": "price"},
+    {"name": "Status", "id": "status"}
+]
+TABLE_STYLE = {
+    "style_table": {"maxHeight": "400px", "overflowY": "auto"},
+    "style_header": {"backgroundColor": "#303030", "color": "#fff", "fontWeight": "bold", "border": "none"},
+    "style_cell": {"backgroundColor": "#222", "color": "#fff", "border": "none", "textAlign": "left", "fontSize": "0.85rem"},
+    "style_as_list_view": True
+}
+
 class Dashboard:
     def __init__(self, config, trade_manager):
         self.config = config
@@ -33,7 +69,7 @@ class Dashboard:
 
     def _setup_layout(self):
         # Coloca o dcc.Interval no topo para garantir que seja carregado imediatamente
-        update_interval = dcc.Interval(id="update-interval", interval=5000, n_intervals=0)
+        update_interval = dcc.Interval(id="update-interval", interval=UPDATE_INTERVAL_MS, n_intervals=0)
 
         # Header
         header = dbc.Row(
@@ -78,7 +114,21 @@ class Dashboard:
         positions_card = dbc.Card(
             [
                 dbc.CardHeader(html.H4("Open Positions", className="text-center")),
-                dbc.CardBody(html.Div(id="positions-content"))
+                dbc.CardBody([
+                    html.Div(id="positions-content"),
+                    dash_table.DataTable(
+                        id="positions-table",
+                        columns=POSITIONS_COLUMNS,
+                        data=[],
+                        virtualization=True,
+                        page_action="none",
+                        style_data_conditional=[
+                            {"if": {"filter_query": "{profit_loss} >= 0", "column_id": "profit_loss"}, "color": "#00bc8c"},
+                            {"if": {"filter_query": "{profit_loss} < 0", "column_id": "profit_loss"}, "color": "#e74c3c"}
+                        ],
+                        **TABLE_STYLE
+                    )
+                ])
             ],
             className="mb-4"
         )
@@ -87,7 +137,17 @@ class Dashboard:
         coins_card = dbc.Card(
             [
                 dbc.CardHeader(html.H4("Active Coins", className="text-center")),
-                dbc.CardBody(html.Div(id="coins-content"))
+                dbc.CardBody([
+                    html.Div(id="coins-content"),
+                    dash_table.DataTable(
+                        id="coins-table",
+                        columns=COINS_COLUMNS,
+                        data=[],
+                        virtualization=True,
+                        page_action="none",
+                        **TABLE_STYLE
+                    )
+                ])
             ],
             className="mb-4"
         )
@@ -124,217 +184,236 @@ class Dashboard:
             }
         )
 
-    def _setup_callbacks(self):
-        @self.app.callback(
-            [Output("status-content", "children"),
-             Output("global-update-time", "children")],
-            [Input("update-interval", "n_intervals")]
-        )
-        def update_status(n):
-            self.logger.info(f"Updating status: interval #{n}")
-            status = self.trade_manager.get_status()
-            timestamp = datetime.now().strftime("%H:%M:%S")
-
-            # Log dos saldos para debug
-            balances = status.get("balances", {})
-            self.logger.info(f"Balances data: {balances}")
-
-            # Configurado para 'quote asset' (ex: USDT)
-            quote = self.config.quote_asset  # Ex: "USDT"
-            # Tenta buscar o saldo do ativo de referência:
-            balance_quote = balances.get(quote)
-            if balance_quote:
-                try:
-                    free_quote = float(balance_quote.get("free", 0))
-                    locked_quote = float(balance_quote.get("locked", 0))
-                except Exception:
-                    free_quote, locked_quote = 0.0, 0.0
-            else:
-                # Se não encontrar, emite aviso e usa 0
-                self.logger.warning(f"Quote asset '{quote}' not found in balances. Available keys: {list(balances.keys())}")
+    def _build_snapshot(self):
+        """Status, análise e posições consultados uma única vez por atualização"""
+        status = self.trade_manager.get_status()
+        return {
+            'status': status,
+            'analysis': self.trade_manager.get_coin_analysis() or {},
+            'positions': self.trade_manager.get_open_positions(),
+            'holdings': self._holdings(status.get("balances", {}))
+        }
+
+    @staticmethod
+    def _holdings(balances):
+        """Quantidade total (free + locked) de cada moeda com saldo, convertida uma única vez"""
+        holdings = {}
+        for coin, b in balances.items():
+            try:
+                amount = float(b.get("free", 0)) + float(b.get("locked", 0))
+            except (TypeError, ValueError):
+                continue
+            if amount > 0:
+                holdings[coin] = amount
+        return holdings
+
+    def _render_status(self, snap):
+        status = snap['status']
+        timestamp = datetime.now().strftime("%H:%M:%S")
+
+        # Log dos saldos para debug
+        balances = status.get("balances", {})
+        self.logger.debug("Balances data: %s", balances)
+
+        # Configurado para 'quote asset' (ex: USDT)
+        quote = self.config.quote_asset  # Ex: "USDT"
+        # Tenta buscar o saldo do ativo de referência:
+        balance_quote = balances.get(quote)
+        if balance_quote:
+            try:
+                free_quote = float(balance_quote.get("free", 0))
+                locked_quote = float(balance_quote.get("locked", 0))
+            except Exception:
                 free_quote, locked_quote = 0.0, 0.0
+        else:
+            # Se não encontrar, emite aviso e usa 0
+            self.logger.warning(f"Quote asset '{quote}' not found in balances. Available keys: {list(balances.keys())}")
+            free_quote, locked_quote = 0.0, 0.0
 
-            # Agora, calcula o valor total da conta convertendo cada moeda para o quote asset (ex: USDT)
-            total_value = 0.0
-            coins_with_balance = []
-            analysis = self.trade_manager.get_coin_analysis() or {}
-            # Função auxiliar para obter o preço de conversão:
-            def get_price_for(coin):
-                if coin == quote:
-                    return 1.0
-                pair = coin + quote
+        # Agora, calcula o valor total da conta convertendo cada moeda para o quote asset (ex: USDT)
+        total_value = 0.0
+        coins_with_balance = []
+        analysis = snap['analysis']
+        # Preço de conversão de cada moeda, montado uma vez a partir da análise
+        quote_len = len(quote)
+        prices = {quote: 1.0}
+        for pair, data in analysis.items():
+            if not pair.endswith(quote):
+                continue
+            # Preços numéricos (caso comum) sem bloco try; só strings passam pela conversão
+            price = data.get("price")
+            if isinstance(price, (int, float)):
+                prices[pair[:-quote_len]] = float(price)
+            elif isinstance(price, str) and price:
                 try:
-                    if pair in analysis:
-                        return float(analysis[pair].get("price", 0))
-                except Exception:
-                    return None
-                return None
+                    prices[pair[:-quote_len]] = float(price)
+                except ValueError:
+                    pass
 
-            for coin, b in balances.items():
-                try:
-                    amount = float(b.get("free", 0)) + float(b.get("locked", 0))
-                except Exception:
-                    amount = 0.0
-                if amount > 0:
-                    price = get_price_for(coin)
-                    if price:
-                        value = amount * price
-                        total_value += value
-                        coins_with_balance.append(f"{coin}: {amount:.4f} ({value:.2f} {quote})")
-                    else:
-                        coins_with_balance.append(f"{coin}: {amount:.4f} (price N/A)")
-
-            content = dbc.Container(
-                [
-                    dbc.Row(
-                        [
-                            dbc.Col(html.P("Bot Status:"), width="auto"),
-                            dbc.Col(
-                                html.Span(
-                                    "Running" if status.get("running", False) else "Stopped",
-                                    className="badge bg-success" if status.get("running", False) else "badge bg-danger"
-                                ),
-                                width="auto"
-                            )
-                        ],
-                        align="center",
-                        className="mb-2"
-                    ),
-                    dbc.Row(
-                        dbc.Col(html.P(f"Total Account Value ({quote}): {total_value:.2f}"), width=12),
-                        className="mb-1"
-                    ),
-                    dbc.Row(
-                        dbc.Col(html.P("Coins with balance:", className="fw-bold"), width=12)
-                    ),
-                    dbc.Row(
+        for coin, amount in snap['holdings'].items():
+            price = prices.get(coin)
+            if price:
+                value = amount * price
+                total_value += value
+                coins_with_balance.append(f"{coin}: {amount:.4f} ({value:.2f} {quote})")
+            else:
+                coins_with_balance.append(f"{coin}: {amount:.4f} (price N/A)")
+
+        content = dbc.Container(
+            [
+                dbc.Row(
+                    [
+                        dbc.Col(html.P("Bot Status:"), width="auto"),
                         dbc.Col(
-                            html.Ul([html.Li(m) for m in coins_with_balance],
-                                    style={"maxHeight": "200px", "overflowY": "auto"},
-                                    className="small text-light"),
-                            width=12
+                            html.Span(
+                                "Running" if status.get("running", False) else "Stopped",
+                                className="badge bg-success" if status.get("running", False) else "badge bg-danger"
+                            ),
+                            width="auto"
                         )
+                    ],
+                    align="center",
+                    className="mb-2"
+                ),
+                dbc.Row(
+                    dbc.Col(html.P(f"Total Account Value ({quote}): {total_value:.2f}"), width=12),
+                    className="mb-1"
+                ),
+                dbc.Row(
+                    dbc.Col(html.P("Coins with balance:", className="fw-bold"), width=12)
+                ),
+                dbc.Row(
+                    dbc.Col(
+                        html.Ul([html.Li(m) for m in coins_with_balance],
+                                style={"maxHeight": "200px", "overflowY": "auto"},
+                                className="small text-light"),
+                        width=12
                     )
-                ],
-                fluid=True
-            )
+                )
+            ],
+            fluid=True
+        )
 
-            update_time = html.P(f"Last update: {timestamp}", className="text-muted mt-3 mb-0 small")
-            return content, update_time
+        update_time = html.P(f"Last update: {timestamp}", className="text-muted mt-3 mb-0 small")
+        return content, update_time
 
-        @self.app.callback(
-            Output("performance-content", "children"),
-            Input("update-interval", "n_intervals")
-        )
-        def update_performance(n):
-            self.logger.info(f"Updating performance: interval #{n}")
-            status = self.trade_manager.get_status()
-            profit_loss = status.get("profit_loss", 0)
-            win_count = status.get("win_count", 0)
-            loss_count = status.get("loss_count", 0)
-            total_trades = win_count + loss_count
-            win_rate = (win_count / total_trades * 100) if total_trades > 0 else 0
-
-            return dbc.Row(
-                [
-                    dbc.Col(
-                        html.Div(
-                            [
-                                html.P("Total Profit/Loss:", className="mb-1"),
-                                html.H3(f"{profit_loss:.2f}%", className="text-success" if profit_loss >= 0 else "text-danger")
-                            ]
-                        ),
-                        width=4,
+    def _render_performance(self, snap):
+        status = snap['status']
+        profit_loss = status.get("profit_loss", 0)
+        win_count = status.get("win_count", 0)
+        loss_count = status.get("loss_count", 0)
+        total_trades = win_count + loss_count
+        win_rate = (win_count / total_trades * 100) if total_trades > 0 else 0
+
+        return dbc.Row(
+            [
+                dbc.Col(
+                    html.Div(
+                        [
+                            html.P("Total Profit/Loss:", className="mb-1"),
+                            html.H3(f"{profit_loss:.2f}%", className="text-success" if profit_loss >= 0 else "text-danger")
+                        ]
                     ),
-                    dbc.Col(
-                        html.Div(
-                            [
-                                html.P("Win/Loss Ratio:", className="mb-1"),
-                                html.H3(f"{win_count}/{loss_count}"),
-                                html.P(f"Win Rate: {win_rate:.1f}%", className="small text-muted")
-                            ]
-                        ),
-                        width=4,
+                    width=4,
+                ),
+                dbc.Col(
+                    html.Div(
+                        [
+                            html.P("Win/Loss Ratio:", className="mb-1"),
+                            html.H3(f"{win_count}/{loss_count}"),
+                            html.P(f"Win Rate: {win_rate:.1f}%", className="small text-muted")
+                        ]
                     ),
-                    dbc.Col(
-                        html.Div(
-                            [
-                                html.P("Active Coins:", className="mb-1"),
-                                html.H3(f"{len(status.get('active_coins', []))}/{self.config.max_active_coins}"),
-                                html.P(f"Open Positions: {status.get('open_positions', 0)}", className="small text-muted")
-                            ]
-                        ),
-                        width=4,
+                    width=4,
+                ),
+                dbc.Col(
+                    html.Div(
+                        [
+                            html.P("Active Coins:", className="mb-1"),
+                            html.H3(f"{len(status.get('active_coins', []))}/{self.config.max_active_coins}"),
+                            html.P(f"Open Positions: {status.get('open_positions', 0)}", className="small text-muted")
+                        ]
                     ),
-                ]
-            )
-
-        @self.app.callback(
-            Output("positions-content", "children"),
-            Input("update-interval", "n_intervals")
+                    width=4,
+                ),
+            ]
         )
-        def update_positions(n):
-            self.logger.info(f"Updating positions: interval #{n}")
-            positions = self.trade_manager.get_open_positions()
-            if not positions:
-                return html.P("No open positions", className="text-muted fst-italic text-center py-3")
-
-            header = html.Thead(html.Tr([
-                html.Th("Symbol"), html.Th("Quantity"), html.Th("Entry Price"),
-                html.Th("Current P/L"), html.Th("Target"), html.Th("Stop Loss"), html.Th("Time")
-            ]))
-            rows = []
-            for pos in positions:
-                symbol = pos.get("symbol", "N/A")
-                pl = pos.get("profit_loss", 0)
-                buy_time = pos.get("buy_time", datetime.now())
-                if isinstance(buy_time, str):
-                    try:
-                        buy_time = datetime.strptime(buy_time, "%Y-%m-%d %H:%M:%S.%f")
-                    except Exception:
-                        try:
-                            buy_time = datetime.strptime(buy_time, "%Y-%m-%d %H:%M:%S")
-                        except Exception:
-                            buy_time = datetime.now()
-                time_str = buy_time.strftime("%H:%M:%S")
-                rows.append(html.Tr([
-                    html.Td(symbol),
-                    html.Td(f"{float(pos.get('executedQty', 0)):.6f}"),
-                    html.Td(f"{pos.get('entry_price', 0):.6f}"),
-                    html.Td(f"{pl:.2f}%", className="text-success" if pl >= 0 else "text-danger"),
-                    html.Td(f"{pos.get('target_price', 0):.6f}"),
-                    html.Td(f"{pos.get('stop_loss_price', 0):.6f}"),
-                    html.Td(time_str)
-                ]))
-            return dbc.Table([header, html.Tbody(rows)], striped=True, hover=True, size="sm")
 
+    def _render_positions(self, snap):
+        """Registros da tabela de posições e a mensagem exibida quando não há nenhuma"""
+        positions = snap['positions']
+        if not positions:
+            return [], html.P("No open positions", className="text-muted fst-italic text-center py-3")
+
+        rows = []
+        now = datetime.now()
+        for pos in positions:
+            # buy_time já é gravado como datetime na compra (place_buy_order): sem strptime por tick
+            buy_time = pos.get("buy_time")
+            if not isinstance(buy_time, datetime):
+                buy_time = now
+            rows.append({
+                "symbol": pos.get("symbol", "N/A"),
+                "quantity": float(pos.get("executedQty", 0)),
+                "entry_price": pos.get("entry_price", 0),
+                "profit_loss": pos.get("profit_loss", 0),
+                "target_price": pos.get("target_price", 0),
+                "stop_loss_price": pos.get("stop_loss_price", 0),
+                "time": buy_time.strftime("%H:%M:%S")
+            })
+        return rows, None
+
+    def _render_coins(self, snap):
+        """Registros da tabela de moedas ativas e a mensagem exibida quando não há nenhuma"""
+        status = snap['status']
+        active_coins = status.get("active_coins", [])
+        if not active_coins:
+            return [], html.P("No active coins", className="text-muted fst-italic text-center py-3")
+
+        analysis = snap['analysis']
+        rows = []
+        for symbol in active_coins:
+            data = analysis.get(symbol, {})
+            price = data.get("price", "N/A")
+            if isinstance(price, (int, float)):
+                price = f"{price:.8f}"
+            else:
+                price = "N/A"
+            rows.append({
+                "symbol": symbol,
+                "price": price,
+                "status": data.get("status", "Initializing")
+            })
+        return rows, None
+
+    def _setup_callbacks(self):
+        # Um único callback para os cards: uma requisição HTTP por tick e um só
+        # snapshot do trade manager para todos eles
         @self.app.callback(
-            Output("coins-content", "children"),
-            Input("update-interval", "n_intervals")
+            [Output("status-content", "children"),
+             Output("global-update-time", "children"),
+             Output("performance-content", "children"),
+             Output("positions-table", "data"),
+             Output("positions-content", "children"),
+             Output("coins-table", "data"),
+             Output("coins-content", "children")],
+            [Input("update-interval", "n_intervals")]
         )
-        def update_coins(n):
-            self.logger.info(f"Updating coins: interval #{n}")
-            status = self.trade_manager.get_status()
-            active_coins = status.get("active_coins", [])
-            if not active_coins:
-                return html.P("No active coins", className="text-muted fst-italic text-center py-3")
-
-            header = html.Thead(html.Tr([html.Th("Symbol"), html.Th("Price"), html.Th("Status")]))
-            analysis = self.trade_manager.get_coin_analysis()
-            rows = []
-            for symbol in active_coins:
-                data = analysis.get(symbol, {})
-                price = data.get("price", "N/A")
-                if isinstance(price, (int, float)):
-                    price = f"{price:.8f}"
-                else:
-                    price = "N/A"
-                rows.append(html.Tr([
-                    html.Td(symbol),
-                    html.Td(price),
-                    html.Td(data.get("status", "Initializing"))
-                ]))
-            return dbc.Table([header, html.Tbody(rows)], striped=True, hover=True, size="sm")
+        def update_dashboard(n):
+            self.logger.debug("Updating dashboard: interval #%d", n)
+            snap = self._build_snapshot()
+            status_content, update_time = self._render_status(snap)
+            positions_data, positions_message = self._render_positions(snap)
+            coins_data, coins_message = self._render_coins(snap)
+            return (
+                status_content,
+                update_time,
+                self._render_performance(snap),
+                positions_data,
+                positions_message,
+                coins_data,
+                coins_message
+            )
 
         @self.app.callback(Output("start-button", "disabled"), Input("start-button", "n_clicks"))
         def on_start(n_clicks):
@@ -1,4 +1,3 @@
-import os
 import sys
 import logging
 import math
@@ -8,7 +7,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 # Import project modules
-from src.utils.config import Config
+from src.utils.config import get_config
 from src.api.binance_client import BinanceClient
 from src.strategies.scalping_strategy import ScalpingStrategy
 from src.strategies.trend_sniper_strategy import TrendSniperStrategy
@@ -28,7 +27,7 @@ def main():
     logger.info("Starting RoboCriptoCL Bot")
 
     try:
-        config = Config()
+        config = get_config()
         logger.info("Configuration loaded successfully")
 
         if not config.api_key or not config.api_secret:
@@ -46,7 +45,7 @@ def main():
             sys.exit(1)
 
         # Escolha da estratégia com base na variável STRATEGY do .env
-        strategy_name = os.getenv("STRATEGY", "scalping").lower()
+        strategy_name = config.strategy.lower()
         if strategy_name == "scalping":
             strategy = ScalpingStrategy(config)
             logger.info("Using ScalpingStrategy")
@@ -1,8 +1,154 @@
 import pandas as pd
 import numpy as np
 import logging
+import threading
 from datetime import datetime
 
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _moving(func, values, window, **kwargs):
+    """
+    Janela móvel ao longo do eixo 0 (array 1-D de um símbolo ou 2-D candles x símbolos).
+    Usa o bottleneck (C, O(1) por passo) quando instalado; sem ele, as versões NumPy
+    abaixo ou o rolling do pandas. As primeiras window-1 posições ficam NaN.
+    """
+    if len(values) < window:
+        return np.full(values.shape, np.nan)
+    if bn is not None:
+        return getattr(bn, f"move_{func}")(values, window, axis=0, **kwargs)
+    if func == 'std':
+        return _rolling_std(values, window, **kwargs)
+    if func == 'min':
+        return _rolling_extreme(values, window)
+    if func == 'max':
+        return -_rolling_extreme(-values, window)
+    result = getattr(pd.DataFrame(values).rolling(window=window), func)(**kwargs).to_numpy()
+    return result.reshape(values.shape)
+
+
+def _ewm(values, span):
+    """EMA (adjust=False) ao longo do eixo 0; um único ewm do pandas para todas as colunas"""
+    return pd.DataFrame(values).ewm(span=span, adjust=False).mean().to_numpy().reshape(values.shape)
+
+
+def _pct_change(values, periods=1):
+    """Variação percentual (fração) em relação a `periods` candles antes, ao longo do eixo 0"""
+    result = np.full(values.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result[periods:] = values[periods:] / values[:-periods] - 1
+    return result
+
+
+def _rolling_std(values, window, ddof=1):
+    """
+    Desvio padrão móvel por somas correntes (soma e soma dos quadrados da janela:
+    entra um valor, sai outro), vetorizado com cumsum. Os valores são deslocados pelo
+    primeiro elemento para reduzir o cancelamento numérico em preços altos.
+    """
+    shifted = values - values[0]
+    zeros = np.zeros((1,) + values.shape[1:])
+    sums = np.cumsum(np.concatenate((zeros, shifted)), axis=0)
+    sums_sq = np.cumsum(np.concatenate((zeros, shifted * shifted)), axis=0)
+    s = sums[window:] - sums[:-window]
+    s2 = sums_sq[window:] - sums_sq[:-window]
+    variance = (s2 - s * s / window) / (window - ddof)
+    result = np.full(values.shape, np.nan)
+    result[window - 1:] = np.sqrt(np.maximum(variance, 0.0))
+    return result
+
+
+def _rolling_min_kernel(values, window):
+    """
+    Mínimo móvel com deque monotônica (O(1) amortizado por candle): idx guarda, em
+    ordem crescente de valor, os índices que ainda podem ser o mínimo da janela.
+    """
+    n = values.shape[0]
+    result = np.full(n, np.nan)
+    idx = np.empty(n, np.int64)
+    head = 0
+    tail = 0
+    for i in range(n):
+        while tail > head and values[idx[tail - 1]] >= values[i]:
+            tail -= 1
+        idx[tail] = i
+        tail += 1
+        if idx[head] <= i - window:
+            head += 1
+        if i >= window - 1:
+            result[i] = values[idx[head]]
+    return result
+
+
+def _rolling_min_np(values, window):
+    """Mesmo mínimo móvel sem Numba: janelas como views (sem cópia) e min vetorizado"""
+    result = np.full(values.shape, np.nan)
+    result[window - 1:] = np.lib.stride_tricks.sliding_window_view(values, window, axis=0).min(axis=-1)
+    return result
+
+
+def _rolling_extreme(values, window):
+    """Mínimo móvel ao longo do eixo 0; com Numba, a deque compilada roda coluna a coluna"""
+    if _rolling_min_jit is None:
+        return _rolling_min_np(values, window)
+    if values.ndim == 1:
+        return _rolling_min_jit(values, window)
+    return np.column_stack([_rolling_min_jit(np.ascontiguousarray(values[:, j]), window)
+                            for j in range(values.shape[1])])
+
+
+def _macd_kernel(close, alpha_fast, alpha_slow, alpha_signal):
+    """
+    MACD e linha de sinal numa única passada por coluna (candles x símbolos): as EMAs
+    rápida/lenta e a do sinal avançam juntas, com a mesma recorrência do ewm(adjust=False)
+    """
+    n, m = close.shape
+    macd = np.empty((n, m))
+    signal = np.empty((n, m))
+    for j in range(m):
+        fast = close[0, j]
+        slow = close[0, j]
+        sig = 0.0
+        for i in range(n):
+            x = close[i, j]
+            fast += alpha_fast * (x - fast)
+            slow += alpha_slow * (x - slow)
+            value = fast - slow
+            sig += alpha_signal * (value - sig)
+            macd[i, j] = value
+            signal[i, j] = sig
+    return macd, signal
+
+
+def _macd(close, fast=12, slow=26, signal=9):
+    """MACD e linha de sinal ao longo do eixo 0; sem Numba, três ewm do pandas"""
+    if _macd_jit is None or len(close) == 0:
+        macd = _ewm(close, fast) - _ewm(close, slow)
+        return macd, _ewm(macd, signal)
+    values = np.ascontiguousarray(close.reshape(len(close), -1))
+    macd, macd_signal = _macd_jit(values, 2.0 / (fast + 1), 2.0 / (slow + 1), 2.0 / (signal + 1))
+    return macd.reshape(close.shape), macd_signal.reshape(close.shape)
+
+
+# Os laços só compensam compilados; em Python puro ficam as versões vetorizadas/pandas
+_rolling_min_jit = njit(cache=True)(_rolling_min_kernel) if njit is not None else None
+_macd_jit = njit(cache=True)(_macd_kernel) if njit is not None else None
+
+# Indicadores lidos pelas decisões de sinal (detect_uptrend / _latest_signal)
+SIGNAL_KEYS = (
+    'close', 'rsi', 'bb_lower', 'bb_upper', 'ema_short', 'ema_medium', 'ema_long',
+    'macd_hist', 'stoch_k', 'volatility', 'volume_change'
+)
+
+
 class ScalpingStrategy:
     def __init__(self, config):
         self.config = config
@@ -18,68 +164,212 @@ class ScalpingStrategy:
         self.bb_period = config.bb_period
         self.bb_std_dev = config.bb_std_dev
         
+        # Candles mínimos para sinais confiáveis e limiares adaptativos, montados uma vez
+        # (indexados por is_high_volatility) em vez de recalculados a cada sinal
+        self._min_candles = max(self.rsi_period, self.ema_long, self.bb_period) + 5
+        self._adaptive_params = {
+            # For higher volatility coins, we want to be more conservative with entries
+            # and more aggressive with exits to capture quick profits
+            True: {
+                'rsi_oversold': 25, 'rsi_overbought': 70,   # Valores mais baixos para compras mais seletivas
+                'bb_lower': 1.01, 'bb_upper': 0.99,         # 1% das bandas
+                'volume': 15, 'stoch_lower': 25, 'stoch_upper': 75,  # Vender antes em moedas voláteis
+                'min_buy': 2, 'min_sell': 1
+            },
+            False: {
+                'rsi_oversold': 30, 'rsi_overbought': 75,
+                'bb_lower': 1.005, 'bb_upper': 0.995,       # 0.5% das bandas
+                'volume': 10, 'stoch_lower': 20, 'stoch_upper': 80,
+                'min_buy': 1, 'min_sell': 2
+            }
+        }
+        
+        # Indicadores dos DataFrames do tick atual: {id(df): {'df', 'len', 'close', 'ind', 'frame'}}.
+        # O TradeManager chama calculate_indicators, detect_uptrend, should_buy e should_sell
+        # com o mesmo frame no mesmo tick; só o primeiro (ou o lote) recalcula o histórico inteiro.
+        # As chamadas por símbolo rodam em várias threads: inserções sob _cache_lock, e só
+        # calculate_indicators_batch troca o dict
+        self._indicator_cache = {}
+        self._cache_lock = threading.Lock()
+        
         self.logger.info(f"Scalping strategy initialized with RSI({self.rsi_period}), EMAs({self.ema_short},{self.ema_medium},{self.ema_long}), BB({self.bb_period},{self.bb_std_dev})")
     
     def calculate_indicators(self, df):
         """Calculate technical indicators for the strategy"""
-        # Make a copy to avoid modifying the original
-        data = df.copy()
-        
-        # Calculate RSI
-        data['price_change'] = data['close'].diff()
-        data['gain'] = data['price_change'].apply(lambda x: x if x > 0 else 0)
-        data['loss'] = data['price_change'].apply(lambda x: abs(x) if x < 0 else 0)
+        cached = self._entry(df)
+        
+        # O DataFrame completo (klines + indicadores) só é montado para quem pede o frame
+        # (dashboard); os sinais leem direto os arrays de _indicators. Como vai para
+        # historical_data e não volta aos cálculos, os indicadores float64 são guardados
+        # em float32, igual às colunas OHLCV das klines
+        if cached['frame'] is None:
+            columns = {
+                k: v.astype(np.float32) if v.dtype == np.float64 else v
+                for k, v in cached['ind'].items() if k != 'close'
+            }
+            cached['frame'] = pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+        return cached['frame']
+    
+    def calculate_indicators_batch(self, frames):
+        """
+        Calcula os indicadores de vários símbolos de uma vez ({symbol: DataFrame}).
+        Frames com o mesmo número de candles são empilhados em matrizes candles x símbolos
+        e cada indicador roda uma única vez para todas as colunas; as chamadas seguintes
+        por símbolo (calculate_indicators, should_buy...) reaproveitam o resultado.
+        Frames que são o mesmo objeto do tick anterior, sem mudança (ex.: klines servidas
+        pelo cache do cliente), mantêm indicadores, frame e sinal já calculados.
+        """
+        with self._cache_lock:
+            previous = self._indicator_cache
+            self._indicator_cache = {}
+        
+        by_length = {}
+        for df in frames.values():
+            if df.empty:
+                continue
+            cached = previous.get(id(df))
+            if self._is_current(cached, df):
+                self._indicator_cache[id(df)] = cached
+                continue
+            by_length.setdefault(len(df), []).append(df)
+        
+        for group in by_length.values():
+            if len(group) == 1:
+                self._indicators(group[0])
+                continue
+            
+            def stack(column, dtype):
+                return np.column_stack([df[column].to_numpy(dtype=dtype) for df in group])
+            
+            ind = self._compute_indicators(
+                stack('close', np.float64),
+                stack('high', np.float32),
+                stack('low', np.float32),
+                stack('volume', np.float32)
+            )
+            for j, df in enumerate(group):
+                self._store_indicators(df, {k: v[:, j] for k, v in ind.items()})
+    
+    def _indicators(self, df):
+        """Indicadores como dict de arrays NumPy (inclui 'close'), sem copiar o df"""
+        return self._entry(df)['ind']
+    
+    def _entry(self, df):
+        """Entrada do cache de indicadores do frame, calculada (e inserida no cache) se preciso"""
+        cached = self._indicator_cache.get(id(df))
+        if self._is_current(cached, df):
+            return cached
+        
+        # Frame fora do lote: calcular fora do lock (as threads seguem em paralelo) e
+        # acrescentar ao cache atual, sem descartar as entradas dos outros símbolos
+        ind = self._compute_indicators(
+            df['close'].to_numpy(dtype=np.float64),
+            df['high'].to_numpy(dtype=np.float32),
+            df['low'].to_numpy(dtype=np.float32),
+            df['volume'].to_numpy(dtype=np.float32)
+        )
+        return self._store_indicators(df, ind)
+    
+    @staticmethod
+    def _is_current(cached, df):
+        """A entrada do cache foi calculada para este mesmo frame, ainda sem candles novos?"""
+        return cached is not None and cached['df'] is df and cached['len'] == len(df) and (
+            df.empty or cached['close'] == df['close'].iat[-1])
+    
+    def _store_indicators(self, df, ind):
+        entry = {
+            'df': df,
+            'len': len(df),
+            'close': df['close'].iat[-1] if len(df) else None,
+            'ind': ind,
+            'frame': None
+        }
+        with self._cache_lock:
+            # Outra thread pode ter calculado o mesmo frame enquanto isso: manter a primeira
+            current = self._indicator_cache.get(id(df))
+            if self._is_current(current, df):
+                return current
+            self._indicator_cache[id(df)] = entry
+        return entry
+    
+    def _compute_indicators(self, close, high, low, volume):
+        """
+        Todos os indicadores a partir de arrays de candles (1-D) ou candles x símbolos (2-D);
+        cada operação roda ao longo do eixo 0.
+        high/low/volume ficam em float32, como vêm das klines (min/max são exatos e a variação
+        de volume tolera o arredondamento); close fica em float64 porque alimenta somas
+        correntes (BB, RSI) em que o float32 perderia precisão por cancelamento
+        """
+        ind = {'close': close}
+        
+        # Calculate RSI (vetorizado em NumPy, sem colunas intermediárias)
+        price_change = np.diff(close, axis=0, prepend=close[:1])
+        gain = np.where(price_change > 0, price_change, 0.0)
+        loss = np.where(price_change < 0, -price_change, 0.0)
         
         # First average gain and loss
-        data['avg_gain'] = data['gain'].rolling(window=self.rsi_period).mean()
-        data['avg_loss'] = data['loss'].rolling(window=self.rsi_period).mean()
+        avg_gain = _moving('mean', gain, self.rsi_period)
+        avg_loss = _moving('mean', loss, self.rsi_period)
         
         # Calculate RS and RSI
-        data['rs'] = data['avg_gain'] / data['avg_loss']
-        data['rsi'] = 100 - (100 / (1 + data['rs']))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = avg_gain / avg_loss
+        ind['rsi'] = 100 - (100 / (1 + rs))
         
         # Calculate EMAs
-        data['ema_short'] = data['close'].ewm(span=self.ema_short, adjust=False).mean()
-        data['ema_medium'] = data['close'].ewm(span=self.ema_medium, adjust=False).mean()
-        data['ema_long'] = data['close'].ewm(span=self.ema_long, adjust=False).mean()
+        ind['ema_short'] = _ewm(close, self.ema_short)
+        ind['ema_medium'] = _ewm(close, self.ema_medium)
+        ind['ema_long'] = _ewm(close, self.ema_long)
         
-        # Calculate Bollinger Bands
-        data['bb_middle'] = data['close'].rolling(window=self.bb_period).mean()
-        data['bb_std'] = data['close'].rolling(window=self.bb_period).std()
-        data['bb_upper'] = data['bb_middle'] + (data['bb_std'] * self.bb_std_dev)
-        data['bb_lower'] = data['bb_middle'] - (data['bb_std'] * self.bb_std_dev)
+        # Calculate Bollinger Bands (desvio amostral, ddof=1, como o rolling().std() do pandas)
+        bb_middle = _moving('mean', close, self.bb_period)
+        bb_std = _moving('std', close, self.bb_period, ddof=1)
+        ind['bb_middle'] = bb_middle
+        ind['bb_std'] = bb_std
+        ind['bb_upper'] = bb_middle + bb_std * self.bb_std_dev
+        ind['bb_lower'] = bb_middle - bb_std * self.bb_std_dev
         
-        # Volatility (using standard deviation)
-        data['volatility'] = data['close'].rolling(window=self.bb_period).std() / data['close'] * 100
+        # Volatility (using standard deviation) - mesmo desvio das bandas, sem recalcular
+        ind['volatility'] = bb_std / close * 100
         
         # Price momentum (rate of change)
-        data['price_momentum'] = data['close'].pct_change(periods=5) * 100
+        ind['price_momentum'] = _pct_change(close, 5) * 100
         
         # Volume change
-        data['volume_change'] = data['volume'].pct_change() * 100
+        ind['volume_change'] = _pct_change(volume) * 100
         
-        # MACD
-        data['macd'] = data['close'].ewm(span=12, adjust=False).mean() - data['close'].ewm(span=26, adjust=False).mean()
-        data['macd_signal'] = data['macd'].ewm(span=9, adjust=False).mean()
-        data['macd_hist'] = data['macd'] - data['macd_signal']
+        # MACD (EMAs 12/26 e sinal 9 numa única passada quando o Numba está disponível)
+        macd, macd_signal = _macd(close)
+        ind['macd'] = macd
+        ind['macd_signal'] = macd_signal
+        ind['macd_hist'] = macd - macd_signal
         
         # Stochastic Oscillator
-        data['lowest_low'] = data['low'].rolling(window=14).min()
-        data['highest_high'] = data['high'].rolling(window=14).max()
-        data['stoch_k'] = 100 * ((data['close'] - data['lowest_low']) / (data['highest_high'] - data['lowest_low']))
-        data['stoch_d'] = data['stoch_k'].rolling(window=3).mean()
-        
-        return data
+        lowest_low = _moving('min', low, 14)
+        highest_high = _moving('max', high, 14)
+        ind['lowest_low'] = lowest_low
+        ind['highest_high'] = highest_high
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ind['stoch_k'] = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+        ind['stoch_d'] = _moving('mean', ind['stoch_k'], 3)
+        
+        return ind
+    
+    @staticmethod
+    def _row(ind, i):
+        """
+        Valores dos indicadores de sinal na posição i (ex: -1 = candle atual), já como
+        float do Python: as comparações seguintes não passam por escalares NumPy
+        """
+        return {k: float(ind[k][i]) for k in SIGNAL_KEYS}
     
     def detect_uptrend(self, df):
         """Determine if the market is in an uptrend"""
         if len(df) < self.ema_long:
             return False
             
-        data = self.calculate_indicators(df)
-        
         # Get last row
-        current = data.iloc[-1]
+        current = self._row(self._indicators(df), -1)
         
         # Check EMA alignment (short > medium > long indicates uptrend)
         ema_aligned = current['ema_short'] > current['ema_medium'] > current['ema_long']
@@ -97,46 +387,45 @@ class ScalpingStrategy:
     
     def generate_signals(self, df):
         """Generate buy/sell signals based on indicators with adaptive volatility settings"""
-        # Calculate indicators
-        data = self.calculate_indicators(df)
+        # Calculate indicators (cópia rasa: a coluna de sinal não vai para o frame em cache)
+        data = self.calculate_indicators(df).copy(deep=False)
         
         # Initialize signals column
         data['signal'] = 0  # 0: no signal, 1: buy, -1: sell
         
+        signal = self.evaluate(df)
+        if signal:
+            data.loc[data.index[-1], 'signal'] = signal
+        
+        return data
+    
+    def _latest_signal(self, ind):
+        """
+        Sinal do candle atual (1: buy, -1: sell, 0: nenhum) a partir dos arrays de indicadores.
+        Só as duas últimas posições (e a média recente de volatilidade) são lidas.
+        """
         # The last row is the current candle
-        if len(data) < max(self.rsi_period, self.ema_long, self.bb_period) + 5:
-            self.logger.warning(f"Not enough data for reliable signals. Need at least {max(self.rsi_period, self.ema_long, self.bb_period) + 5} candles.")
-            return data
+        if len(ind['close']) < self._min_candles:
+            self.logger.warning(f"Not enough data for reliable signals. Need at least {self._min_candles} candles.")
+            return 0
         
         # Current values (last row)
-        current = data.iloc[-1]
-        previous = data.iloc[-2]
+        current = self._row(ind, -1)
+        previous = self._row(ind, -2)
         
         # Determine volatility context
-        # Calculate average volatility over the last 20 periods
-        recent_volatility = data['volatility'].iloc[-20:].mean() if len(data) >= 20 else data['volatility'].mean()
-        
-        # Adaptive settings based on volatility
-        # For higher volatility coins, we want to be more conservative with entries
-        # and more aggressive with exits to capture quick profits
-        is_high_volatility = recent_volatility > 2.0  # Threshold for high volatility
+        # Calculate average volatility over the last 20 periods (NaN ignorado, como no pandas)
+        recent_volatility = np.nanmean(ind['volatility'][-20:])
         
-        # Ajustar níveis RSI para capturar pontos de entrada mais fortes
-        rsi_oversold_adjusted = 25 if is_high_volatility else 30  # Valores mais baixos para compras mais seletivas
-        rsi_overbought_adjusted = 70 if is_high_volatility else 75  # Adaptado para volatilidade
-        
-        # Adjust Bollinger Band thresholds based on volatility
-        bb_lower_threshold = 1.01 if is_high_volatility else 1.005  # 1% vs 0.5%
-        bb_upper_threshold = 0.99 if is_high_volatility else 0.995  # 1% vs 0.5%
-        
-        # Buy signal conditions
-        buy_signal = False
+        # Adaptive settings based on volatility (limiares pré-montados no __init__)
+        is_high_volatility = bool(recent_volatility > 2.0)  # Threshold for high volatility
+        params = self._adaptive_params[is_high_volatility]
         
         # Condition 1: RSI crosses above oversold level with adaptive threshold
-        rsi_buy_signal = previous['rsi'] < rsi_oversold_adjusted and current['rsi'] >= rsi_oversold_adjusted
+        rsi_buy_signal = previous['rsi'] < params['rsi_oversold'] and current['rsi'] >= params['rsi_oversold']
         
         # Condition 2: Price is near Bollinger lower band with adaptive threshold
-        bb_buy_signal = current['close'] <= current['bb_lower'] * bb_lower_threshold
+        bb_buy_signal = current['close'] <= current['bb_lower'] * params['bb_lower']
         
         # Condition 3: Short EMA crosses above Medium EMA (bullish momentum)
         ema_cross_buy = previous['ema_short'] <= previous['ema_medium'] and current['ema_short'] > current['ema_medium']
@@ -145,15 +434,13 @@ class ScalpingStrategy:
         uptrend_condition = current['close'] > current['ema_long']
         
         # Condition 5: Increasing volume with adaptive threshold
-        volume_threshold = 15 if is_high_volatility else 10  # 15% vs 10%
-        volume_increasing = current['volume_change'] > volume_threshold
+        volume_increasing = current['volume_change'] > params['volume']
         
         # Condition 6: MACD histogram turns positive
         macd_buy_signal = previous['macd_hist'] < 0 and current['macd_hist'] > 0
         
         # Condition 7: Stochastic crosses above 20
-        stoch_threshold = 25 if is_high_volatility else 20  # 25 vs 20
-        stoch_buy_signal = previous['stoch_k'] < stoch_threshold and current['stoch_k'] >= stoch_threshold
+        stoch_buy_signal = previous['stoch_k'] < params['stoch_lower'] and current['stoch_k'] >= params['stoch_lower']
         
         # Condition 8: Detecting volatility expansion - good for scalping entries
         # Volatility increased significantly but not extremely (which could be a risk)
@@ -163,11 +450,11 @@ class ScalpingStrategy:
         )
         
         # Combined buy signal - different combinations of signals
-        buy_conditions = [rsi_buy_signal, bb_buy_signal, ema_cross_buy, macd_buy_signal, stoch_buy_signal, vol_expansion]
-        
         # Para estratégia mais eficiente, reduzir número de condições necessárias
-        min_conditions = 2 if is_high_volatility else 1
-        buy_conditions_met = sum(buy_conditions) >= min_conditions
+        buy_conditions_met = (
+            int(rsi_buy_signal) + int(bb_buy_signal) + int(ema_cross_buy) +
+            int(macd_buy_signal) + int(stoch_buy_signal) + int(vol_expansion)
+        ) >= params['min_buy']
         
         # Simplificar critérios de confirmação
         additional_confirmation = uptrend_condition
@@ -176,13 +463,12 @@ class ScalpingStrategy:
         
         # Sell signal conditions (using profit target and stop loss managed by the client class)
         # Here we only implement additional sell signals for the strategy
-        sell_signal = False
         
         # Condition 1: RSI crosses above overbought level with adaptive threshold
-        rsi_sell_signal = previous['rsi'] < rsi_overbought_adjusted and current['rsi'] >= rsi_overbought_adjusted
+        rsi_sell_signal = previous['rsi'] < params['rsi_overbought'] and current['rsi'] >= params['rsi_overbought']
         
         # Condition 2: Price is near Bollinger upper band with adaptive threshold
-        bb_sell_signal = current['close'] >= current['bb_upper'] * bb_upper_threshold
+        bb_sell_signal = current['close'] >= current['bb_upper'] * params['bb_upper']
         
         # Condition 3: Short EMA crosses below Medium EMA (bearish momentum)
         ema_cross_sell = previous['ema_short'] >= previous['ema_medium'] and current['ema_short'] < current['ema_medium']
@@ -191,46 +477,45 @@ class ScalpingStrategy:
         macd_sell_signal = previous['macd_hist'] > 0 and current['macd_hist'] < 0
         
         # Condition 5: Stochastic crosses below 80 with adaptive threshold
-        stoch_upper_threshold = 75 if is_high_volatility else 80  # 75 vs 80 - sell earlier on volatile coins
-        stoch_sell_signal = previous['stoch_k'] > stoch_upper_threshold and current['stoch_k'] <= stoch_upper_threshold
+        stoch_sell_signal = previous['stoch_k'] > params['stoch_upper'] and current['stoch_k'] <= params['stoch_upper']
         
         # Condition 6: Detecting volatility contraction - good for taking profits
         vol_contraction = current['volatility'] < previous['volatility'] * 0.8  # 20% decrease in volatility
         
         # Melhorar lógica de venda para ser menos restritiva
-        sell_conditions = [rsi_sell_signal, bb_sell_signal, ema_cross_sell, macd_sell_signal, stoch_sell_signal, vol_contraction]
-        
         # Tornar venda técnica mais flexível - basta um sinal forte
         # Obs: A maior parte das vendas virá do trailing stop ajustado ou target
-        min_sell_conditions = 1 if is_high_volatility else 2
-        sell_signal = sum(sell_conditions) >= min_sell_conditions
+        sell_signal = (
+            int(rsi_sell_signal) + int(bb_sell_signal) + int(ema_cross_sell) +
+            int(macd_sell_signal) + int(stoch_sell_signal) + int(vol_contraction)
+        ) >= params['min_sell']
         
         # Set the signal
         if buy_signal:
-            data.loc[data.index[-1], 'signal'] = 1
             self.logger.info(f"BUY signal generated at price {current['close']}")
-            self.logger.debug(f"Buy conditions: RSI={current['rsi']:.2f}, BB_lower={current['bb_lower']:.2f}, Price={current['close']:.2f}")
-        elif sell_signal:
-            data.loc[data.index[-1], 'signal'] = -1
+            self.logger.debug("Buy conditions: RSI=%.2f, BB_lower=%.2f, Price=%.2f", current['rsi'], current['bb_lower'], current['close'])
+            return 1
+        if sell_signal:
             self.logger.info(f"SELL signal generated at price {current['close']}")
-            self.logger.debug(f"Sell conditions: RSI={current['rsi']:.2f}, BB_upper={current['bb_upper']:.2f}, Price={current['close']:.2f}")
-        
-        return data
+            self.logger.debug("Sell conditions: RSI=%.2f, BB_upper=%.2f, Price=%.2f", current['rsi'], current['bb_upper'], current['close'])
+            return -1
+        return 0
+    
+    def evaluate(self, df):
+        """
+        Sinal do candle atual (1: buy, -1: sell, 0: nenhum), calculado uma vez por frame:
+        should_buy e should_sell no mesmo tick reaproveitam o resultado
+        """
+        cached = self._entry(df)
+        if 'signal' not in cached:
+            cached['signal'] = self._latest_signal(cached['ind'])
+        return cached['signal']
     
     def should_buy(self, df):
         """Determine if we should buy based on the current signals"""
-        data = self.generate_signals(df)
-        
-        # Check the last row for a buy signal
-        if data.iloc[-1]['signal'] == 1:
-            return True
-        return False
+        # Sinal calculado direto do frame de indicadores, sem montar a coluna 'signal'
+        return self.evaluate(df) == 1
     
     def should_sell(self, df):
         """Determine if we should sell based on the current signals"""
-        data = self.generate_signals(df)
-        
-        # Check the last row for a sell signal
-        if data.iloc[-1]['signal'] == -1:
-            return True
-        return False
\ No newline at end of file
+        return self.evaluate(df) == -1
\ No newline at end of file
@@ -1,5 +1,74 @@
 import logging
 
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _ema_triple_last_kernel(values, p1, p2, p3):
+    """
+    Últimos valores de três EMAs de um array float64 em uma única passada
+    (cada EMA começa na média simples dos seus primeiros `pk` valores)
+    """
+    s1 = values[:p1].sum() / p1
+    s2 = values[:p2].sum() / p2
+    s3 = values[:p3].sum() / p3
+    a1 = 2.0 / (p1 + 1)
+    a2 = 2.0 / (p2 + 1)
+    a3 = 2.0 / (p3 + 1)
+    for i in range(min(p1, p2, p3), values.shape[0]):
+        x = values[i]
+        if i >= p1:
+            s1 = (x - s1) * a1 + s1
+        if i >= p2:
+            s2 = (x - s2) * a2 + s2
+        if i >= p3:
+            s3 = (x - s3) * a3 + s3
+    return s1, s2, s3
+
+
+def _ema_triple_last_py(values, p1, p2, p3):
+    """Mesma passada em Python puro (sem Numba): itera floats nativos, não escalares NumPy"""
+    values = values.tolist()
+    s1 = sum(values[:p1]) / p1
+    s2 = sum(values[:p2]) / p2
+    s3 = sum(values[:p3]) / p3
+    a1 = 2 / (p1 + 1)
+    a2 = 2 / (p2 + 1)
+    a3 = 2 / (p3 + 1)
+    for i in range(min(p1, p2, p3), len(values)):
+        x = values[i]
+        if i >= p1:
+            s1 = (x - s1) * a1 + s1
+        if i >= p2:
+            s2 = (x - s2) * a2 + s2
+        if i >= p3:
+            s3 = (x - s3) * a3 + s3
+    return s1, s2, s3
+
+
+# Numba é opcional: compila a recorrência (escalar, não vetorizável) quando instalado
+_ema_triple_last = njit(cache=True)(_ema_triple_last_kernel) if njit is not None else _ema_triple_last_py
+
+
+def _rsi_last(close_tail, period):
+    """
+    RSI simples dos últimos `period` movimentos (close_tail = últimos period + 1 closes).
+    Sem nenhum movimento de alta (ou de baixa/lateral) a média usa 0.0001 no lugar de zero.
+    """
+    changes = np.diff(close_tail)
+    up = changes > 0
+    avg_gain = changes[up].sum() / period if up.any() else 0.0001
+    avg_loss = -changes[~up].sum() / period if not up.all() else 0.0001
+    if avg_loss == 0:
+        return 100.0  # Só candles laterais além das altas: sem perdas
+    rs = avg_gain / avg_loss
+    return float(100 - (100 / (1 + rs)))
+
+
 class TrendSniperStrategy:
     def __init__(self, config):
         self.logger = logging.getLogger('RoboCriptoCL.TrendSniperStrategy')
@@ -9,6 +78,7 @@ class TrendSniperStrategy:
         self.ema_periods = getattr(config, 'ema_periods', [9, 21, 50])
         self.rsi_period = getattr(config, 'rsi_period', 14)
         self.volume_period = getattr(config, 'volume_period', 3)
+        self._min_candles = max(self.ema_periods + [self.rsi_period])
 
         self.logger.info(
             f"TrendSniper initialized with EMAs {tuple(self.ema_periods)} and RSI({self.rsi_period})"
@@ -19,48 +89,20 @@ class TrendSniperStrategy:
         Realiza a análise técnica para determinar se há sinal de entrada.
         Espera um dicionário com a chave "candles", onde cada candle deve conter 'close' e 'volume'.
         """
-        candles = symbol_data.get("candles", [])
-        if len(candles) < max(self.ema_periods + [self.rsi_period]):
+        closes = self._closes(symbol_data)
+        if len(closes) < self._min_candles:
             return None  # Dados insuficientes
 
-        closes = [c["close"] for c in candles]
-        volumes = [c["volume"] for c in candles]
-
-        # Função auxiliar para calcular a EMA de um período
-        def ema(values, period):
-            multiplier = 2 / (period + 1)
-            ema_values = [sum(values[:period]) / period]
-            for price in values[period:]:
-                ema_values.append((price - ema_values[-1]) * multiplier + ema_values[-1])
-            return ema_values
-
-        ema_short = ema(closes, self.ema_periods[0])[-1]
-        ema_medium = ema(closes, self.ema_periods[1])[-1]
-        ema_long = ema(closes, self.ema_periods[2])[-1]
-
-        # Função auxiliar para calcular RSI de um período
-        def calculate_rsi(data, period):
-            gains = []
-            losses = []
-            for i in range(1, period + 1):
-                change = data[-i] - data[-i-1]
-                if change > 0:
-                    gains.append(change)
-                else:
-                    losses.append(abs(change))
-            avg_gain = sum(gains) / period if gains else 0.0001
-            avg_loss = sum(losses) / period if losses else 0.0001
-            rs = avg_gain / avg_loss
-            return 100 - (100 / (1 + rs))
-
-        rsi = calculate_rsi(closes, self.rsi_period)
+        ema_short, ema_medium, ema_long = _ema_triple_last(closes, *self.ema_periods[:3])
+
+        rsi = _rsi_last(closes[-(self.rsi_period + 1):], self.rsi_period)
 
         # Lógica simplificada: se as EMAs estão ordenadas (indicando tendência de alta) e o RSI está acima de um nível (por exemplo, 55), gera sinal.
         if ema_short > ema_medium > ema_long and rsi > 55:
-            self.logger.info(f"Uptrend detected: EMA values = ({ema_short:.2f}, {ema_medium:.2f}, {ema_long:.2f}) e RSI = {rsi:.2f}")
+            self.logger.info("Uptrend detected: EMA values = (%.2f, %.2f, %.2f) e RSI = %.2f", ema_short, ema_medium, ema_long, rsi)
             return {
                 "signal": "buy",
-                "entry_price": closes[-1],
+                "entry_price": float(closes[-1]),
                 "rsi": rsi,
                 "ema_short": ema_short,
                 "ema_medium": ema_medium,
@@ -72,26 +114,20 @@ class TrendSniperStrategy:
         """
         Detecta se o ativo está em tendência de alta com base nas EMAs.
         """
-        candles = symbol_data.get("candles", [])
-        if len(candles) < max(self.ema_periods + [self.rsi_period]):
+        closes = self._closes(symbol_data)
+        if len(closes) < self._min_candles:
             return False
 
-        closes = [c["close"] for c in candles]
-
-        # Função auxiliar para calcular EMA
-        def ema(values, period):
-            multiplier = 2 / (period + 1)
-            ema_values = [sum(values[:period]) / period]
-            for price in values[period:]:
-                ema_values.append((price - ema_values[-1]) * multiplier + ema_values[-1])
-            return ema_values
-
-        ema_short = ema(closes, self.ema_periods[0])[-1]
-        ema_medium = ema(closes, self.ema_periods[1])[-1]
-        ema_long = ema(closes, self.ema_periods[2])[-1]
+        ema_short, ema_medium, ema_long = _ema_triple_last(closes, *self.ema_periods[:3])
 
         return ema_short > ema_medium > ema_long
 
+    @staticmethod
+    def _closes(symbol_data):
+        """Closes dos candles em array float64, lidos com np.fromiter (sem montar uma lista intermediária)"""
+        candles = symbol_data.get("candles", [])
+        return np.fromiter((c["close"] for c in candles), dtype=np.float64, count=len(candles))
+
     def calculate_indicators(self, symbol_data):
         """
         Método necessário para o TradeManager.
@@ -0,0 +1,62 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Cache limitado em tamanho com expiração por item.
+
+    Diferente de um TTL cache comum, entradas expiradas não são descartadas
+    na leitura: continuam acessíveis via get_stale() até serem despejadas pelo
+    limite de tamanho (LRU), para servirem de fallback quando a API falha.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # {key: (value, expires_at)}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Retorna o valor se ainda estiver dentro do TTL"""
+        entry = self._data.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return default
+        return entry[0]
+
+    def get_stale(self, key, default=None):
+        """Retorna o valor mesmo que expirado (fallback em caso de erro)"""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        return entry[0]
+
+    def set(self, key, value, ttl=None):
+        """Insere/atualiza um valor, despejando o menos recente se passar do limite"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def update(self, items, ttl=None):
+        """Insere vários valores de uma vez com a mesma expiração"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            for key, value in items.items():
+                self._data[key] = (value, expires_at)
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
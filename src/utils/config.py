@@ -1,18 +1,28 @@
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 import logging
 
 
+# Tabela de valores aceitos pelo strtobool (uma consulta de dict por chamada)
+_BOOL_VALUES = {val: True for val in ('y', 'yes', 't', 'true', 'on', '1')}
+_BOOL_VALUES.update({val: False for val in ('n', 'no', 'f', 'false', 'off', '0')})
+
+
 # Implementação própria do strtobool para substituir distutils
 def strtobool(val):
     """Converte uma string para um booleano."""
-    val = str(val).lower()
-    if val in ('y', 'yes', 't', 'true', 'on', '1'):
-        return True
-    elif val in ('n', 'no', 'f', 'false', 'off', '0'):
-        return False
-    else:
+    result = _BOOL_VALUES.get(str(val).lower())
+    if result is None:
         raise ValueError(f"valor booleano inválido: {val}")
+    return result
+
+
+def _env(name, default, cast=str):
+    """Lê uma variável de ambiente já convertida (cast aplicado uma única vez, na carga)"""
+    return cast(os.getenv(name, default))
+
+
 
 class Config:
     def __init__(self):
@@ -20,12 +30,12 @@ class Config:
         load_dotenv()
 
         # Load environment variables
-        self.strategy = os.getenv('STRATEGY', 'scalping')
+        self.strategy = _env('STRATEGY', 'scalping')
 
-        self.volume_period = int(os.getenv('VOLUME_PERIOD', '3'))
+        self.volume_period = _env('VOLUME_PERIOD', '3', int)
 
         # Setup logging
-        self.log_level = os.getenv('LOG_LEVEL', 'INFO')
+        self.log_level = _env('LOG_LEVEL', 'INFO')
         self._setup_logging()
         
         # API credentials
@@ -33,57 +43,66 @@ class Config:
         self.api_secret = os.getenv('BINANCE_API_SECRET')
         
         # Trading parameters
-        self.quote_asset = os.getenv('QUOTE_ASSET', 'USDT')
-        self.max_active_coins = int(os.getenv('MAX_ACTIVE_COINS', '5'))
-        self.min_volume_24h = float(os.getenv('MIN_VOLUME_24H', '10000000'))
-        self.min_market_cap = float(os.getenv('MIN_MARKET_CAP', '100000000'))
+        self.quote_asset = _env('QUOTE_ASSET', 'USDT')
+        self.max_active_coins = _env('MAX_ACTIVE_COINS', '5', int)
+        self.min_volume_24h = _env('MIN_VOLUME_24H', '10000000', float)
+        self.min_market_cap = _env('MIN_MARKET_CAP', '100000000', float)
         
         # Coin filtering
-        include_coins = os.getenv('INCLUDE_COINS', 'BTC,ETH')
+        include_coins = _env('INCLUDE_COINS', 'BTC,ETH')
         self.include_coins = [coin.strip() for coin in include_coins.split(',')] if include_coins else []
+        self.include_symbols = tuple(f"{coin}{self.quote_asset}" for coin in self.include_coins)  # Pares já montados
         
-        exclude_coins = os.getenv('EXCLUDE_COINS', '')
+        exclude_coins = _env('EXCLUDE_COINS', '')
         self.exclude_coins = [coin.strip() for coin in exclude_coins.split(',')] if exclude_coins else []
         
         # Risk management - reduzido para melhor controle de risco
-        self.trading_amount_percent = float(os.getenv('TRADING_AMOUNT_PERCENT', '1')) / 100
-        self.max_orders_per_coin = int(os.getenv('MAX_ORDERS_PER_COIN', '3'))  # Aumentado para permitir mais trades
-        self.min_balance_required = float(os.getenv('MIN_BALANCE_REQUIRED', '10.0'))  # Saldo mínimo para operar
-        self.fee_percentage = float(os.getenv('FEE_PERCENTAGE', '0.1'))  # Taxa da exchange (0.1% por padrão na Binance)
+        self.trading_amount_percent = _env('TRADING_AMOUNT_PERCENT', '1', float) / 100
+        self.max_orders_per_coin = _env('MAX_ORDERS_PER_COIN', '3', int)  # Aumentado para permitir mais trades
+        self.min_balance_required = _env('MIN_BALANCE_REQUIRED', '10.0', float)  # Saldo mínimo para operar
+        self.fee_percentage = _env('FEE_PERCENTAGE', '0.1', float)  # Taxa da exchange (0.1% por padrão na Binance)
         
         # Profit targets e stop loss adaptados para maior volatilidade - aumentados para dar mais espaço ao mercado
-        self.profit_target = float(os.getenv('PROFIT_TARGET', '1.2')) / 100  # Aumentado de 0.8% para 1.2%
-        self.stop_loss = float(os.getenv('STOP_LOSS', '1.0')) / 100  # Aumentado de 0.5% para 1.0%
+        self.profit_target = _env('PROFIT_TARGET', '1.2', float) / 100  # Aumentado de 0.8% para 1.2%
+        self.stop_loss = _env('STOP_LOSS', '1.0', float) / 100  # Aumentado de 0.5% para 1.0%
         
         # Profit target e stop loss para moedas de alta volatilidade - ajustados para melhor performance
-        self.high_vol_profit_target = float(os.getenv('HIGH_VOL_PROFIT_TARGET', '1.8')) / 100  # Aumentado de 1.2% para 1.8%
-        self.high_vol_stop_loss = float(os.getenv('HIGH_VOL_STOP_LOSS', '1.5')) / 100  # Aumentado de 0.7% para 1.5%
+        self.high_vol_profit_target = _env('HIGH_VOL_PROFIT_TARGET', '1.8', float) / 100  # Aumentado de 1.2% para 1.8%
+        self.high_vol_stop_loss = _env('HIGH_VOL_STOP_LOSS', '1.5', float) / 100  # Aumentado de 0.7% para 1.5%
         
         # Threshold de volatilidade para classificar moedas
-        self.high_volatility_threshold = float(os.getenv('HIGH_VOLATILITY_THRESHOLD', '2.0'))  # Percentual de volatilidade média
+        self.high_volatility_threshold = _env('HIGH_VOLATILITY_THRESHOLD', '2.0', float)  # Percentual de volatilidade média
         
         # Trailing stop loss configuration - modificado para ser mais eficiente
-        self.trailing_stop = bool(strtobool(os.getenv('TRAILING_STOP', 'true')))
-        self.trailing_stop_activation = float(os.getenv('TRAILING_STOP_ACTIVATION', '0.40'))  # Aumentado de 0.20 para 0.40 (40% do target)
-        self.trailing_stop_distance = float(os.getenv('TRAILING_STOP_DISTANCE', '0.25')) / 100  # Aumentado de 0.12% para 0.25%
+        self.trailing_stop = _env('TRAILING_STOP', 'true', strtobool)
+        self.trailing_stop_activation = _env('TRAILING_STOP_ACTIVATION', '0.40', float)  # Aumentado de 0.20 para 0.40 (40% do target)
+        self.trailing_stop_distance = _env('TRAILING_STOP_DISTANCE', '0.25', float) / 100  # Aumentado de 0.12% para 0.25%
         
-        self.uptrend_required = bool(strtobool(os.getenv('UPTREND_REQUIRED', 'true')))
+        self.uptrend_required = _env('UPTREND_REQUIRED', 'true', strtobool)
+        
+        # Ordens OCO na exchange (take profit + stop-limit) logo após a compra
+        self.use_oco_orders = _env('USE_OCO_ORDERS', 'false', strtobool)
         
         # Strategy parameters
-        self.rsi_period = int(os.getenv('RSI_PERIOD', '14'))
-        self.rsi_overbought = int(os.getenv('RSI_OVERBOUGHT', '70'))
-        self.rsi_oversold = int(os.getenv('RSI_OVERSOLD', '30'))
-        self.ema_short = int(os.getenv('EMA_SHORT', '9'))
-        self.ema_medium = int(os.getenv('EMA_MEDIUM', '21'))
-        self.ema_long = int(os.getenv('EMA_LONG', '50'))
-        self.bb_period = int(os.getenv('BB_PERIOD', '20'))
-        self.bb_std_dev = int(os.getenv('BB_STD_DEV', '2'))
+        self.rsi_period = _env('RSI_PERIOD', '14', int)
+        self.rsi_overbought = _env('RSI_OVERBOUGHT', '70', int)
+        self.rsi_oversold = _env('RSI_OVERSOLD', '30', int)
+        self.ema_short = _env('EMA_SHORT', '9', int)
+        self.ema_medium = _env('EMA_MEDIUM', '21', int)
+        self.ema_long = _env('EMA_LONG', '50', int)
+        self.bb_period = _env('BB_PERIOD', '20', int)
+        self.bb_std_dev = _env('BB_STD_DEV', '2', int)
         
         # Dashboard settings
-        self.dashboard_port = int(os.getenv('DASHBOARD_PORT', '8050'))
-        self.refresh_interval = int(os.getenv('REFRESH_INTERVAL', '5'))
-        self.coin_selection_interval = int(os.getenv('COIN_SELECTION_INTERVAL', '60'))
-        
+        self.dashboard_port = _env('DASHBOARD_PORT', '8050', int)
+        self.refresh_interval = _env('REFRESH_INTERVAL', '5', int)
+        self.coin_selection_interval = _env('COIN_SELECTION_INTERVAL', '60', int)
+
+        # Market data via websocket (REST fica apenas como bootstrap/fallback)
+        self.use_websocket = _env('USE_WEBSOCKET', 'true', strtobool)
+        self.websocket_stale_seconds = _env('WEBSOCKET_STALE_SECONDS', '15', int)  # Após isso, volta para REST
+        self.rest_concurrency = _env('REST_CONCURRENCY', '8', int)  # Requisições REST simultâneas
+
         self.logger.info(f"Configuration loaded with {self.max_active_coins} max active coins")
         if self.include_coins:
             self.logger.info(f"Always included coins: {', '.join(self.include_coins)}")
@@ -126,4 +145,10 @@ class Config:
         self.logger.info(f"Logging configurado. Nível: {self.log_level}, arquivo de log: {log_file}")
 
     def get(self, attr, default=None):
-        return getattr(self, attr, default)
\ No newline at end of file
+        return getattr(self, attr, default)
+
+
+@lru_cache(maxsize=1)
+def get_config():
+    """Config única do processo: o .env é lido e convertido só na primeira chamada"""
+    return Config()
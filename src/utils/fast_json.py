@@ -0,0 +1,36 @@
+"""
+JSON rápido com fallback.
+
+Usa orjson quando instalado (parse/serialização em Rust, bem mais rápido para
+as respostas grandes da Binance); sem ele, cai no módulo json da stdlib com a
+mesma interface.
+"""
+import json
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+
+    def loads(data):
+        return orjson.loads(data)
+
+    def dumps(obj):
+        """Serializa para str (orjson gera bytes)"""
+        return orjson.dumps(obj).decode('utf-8')
+
+    def dumps_line(obj):
+        """Serializa para uma linha JSON terminada em '\\n' (o orjson já acrescenta a quebra)"""
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE).decode('utf-8')
+
+except ImportError:
+    HAS_ORJSON = False
+
+    def loads(data):
+        return json.loads(data)
+
+    def dumps(obj):
+        return json.dumps(obj)
+
+    def dumps_line(obj):
+        return json.dumps(obj) + '\n'
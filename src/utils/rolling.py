@@ -0,0 +1,35 @@
+import math
+from collections import deque
+
+
+class RollingStd:
+    """
+    Desvio padrão amostral (ddof=1) de uma janela deslizante em O(1) por valor.
+
+    Mantém soma e soma dos quadrados da janela: cada novo valor entra e o mais
+    antigo sai sem recalcular a janela inteira.
+    """
+
+    def __init__(self, window):
+        self.values = deque(maxlen=window)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def push(self, value):
+        if len(self.values) == self.values.maxlen:
+            old = self.values[0]
+            self._sum -= old
+            self._sum_sq -= old * old
+        self.values.append(value)
+        self._sum += value
+        self._sum_sq += value * value
+
+    def __len__(self):
+        return len(self.values)
+
+    def std(self):
+        n = len(self.values)
+        if n < 2:
+            return 0.0
+        variance = (self._sum_sq - self._sum * self._sum / n) / (n - 1)
+        return math.sqrt(variance) if variance > 0 else 0.0
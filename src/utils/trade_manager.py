@@ -1,13 +1,22 @@
 import time
+import atexit
 import logging
+import queue
 import threading
 import pandas as pd
+import numpy as np
 import math
 import os
-import json
-from datetime import datetime, timedelta
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
 from binance.client import Client
 
+from src.utils.fast_json import dumps_line as json_line
+
+# Linhas de log gravadas por lote pela thread de escrita
+LOG_BATCH_SIZE = 32
+
 class TradeManager:
     def __init__(self, config, binance_client, strategy):
         self.config = config
@@ -20,6 +29,16 @@ class TradeManager:
         
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()  # Acorda o loop na hora quando stop() é chamado
+        
+        # Threads para avaliar a estratégia de vários símbolos ao mesmo tempo
+        self._symbol_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='symbol-eval')
+        
+        # Verificação de ordens fantasmas em segundo plano (fila consumida por _ghost_worker)
+        self._ghost_queue = queue.SimpleQueue()
+        self._ghost_batch_pending = threading.Event()
+        self._ghost_thread = threading.Thread(target=self._ghost_worker, name='ghost-order-check', daemon=True)
+        self._ghost_thread.start()
         
         # Performance tracking
         self.profit_loss = 0
@@ -27,20 +46,38 @@ class TradeManager:
         self.loss_count = 0
         self.last_update_time = None
         
+        # profit_loss dos SELLs já contabilizados, estendido só com os trades novos de cada símbolo
+        self._sell_pl = np.empty(0, dtype=np.float64)
+        self._trades_seen = {}  # {symbol: nº de trades do histórico já processados}
+        
         # Arquivo de log para desempenho
         self.performance_log = os.path.join('logs', 'performance.log')
         self.trade_log = os.path.join('logs', 'trades.log')
         
-        # Data for trading and dashboard
+        # Arquivos abertos uma única vez (append, line-buffered) e escritos pela thread de logs:
+        # o loop de trading só enfileira as linhas; cada lote vira um write + flush por arquivo
+        self._perf_fh = open(self.performance_log, 'a', buffering=1)
+        self._trade_fh = open(self.trade_log, 'a', buffering=1)
+        self._log_queue = queue.SimpleQueue()  # (arquivo, linha)
+        self._log_lock = threading.Lock()
+        self._log_thread = threading.Thread(target=self._log_writer, name='log-writer', daemon=True)
+        self._log_thread.start()
+        atexit.register(self._close_logs)
+        
+        # Data for trading and dashboard (escritas e leituras compostas sob _state_lock)
+        self._state_lock = threading.RLock()
         self.current_prices = {}  # {symbol: price}
         self.historical_data = {}  # {symbol: DataFrame}
+        self._last_results = {}  # {symbol: (último candle, análise, DataFrame)} do ciclo anterior
+        self._latest_symbol = None  # Símbolo com o candle mais recente em historical_data
+        self._latest_ts = None
         self.coin_analysis = {}   # {symbol: {uptrend: bool, last_signal: str, ...}}
         
         # Track last coin selection time
-        self.last_coin_selection = datetime.now() - timedelta(hours=1)
+        self.last_coin_selection = time.monotonic() - 3600  # time.monotonic(); força seleção na primeira volta
         
         # Track last balance sync time
-        self.last_balance_sync = datetime.now() - timedelta(minutes=30)
+        self.last_balance_sync = time.monotonic() - 1800  # time.monotonic()
         
         # Flag para correção de inconsistências
         
@@ -49,6 +86,12 @@ class TradeManager:
         self.last_signal_time = {}  # {symbol: datetime}
 
         self.sync_needed = True
+        
+        # Posição do rodízio de moedas já analisadas em _track_all_balances
+        self._asset_rotation_idx = 0
+        
+        # Tamanho do sufixo da moeda de cotação (ex.: "USDT"), para extrair o ativo do símbolo
+        self._quote_len = len(self.config.quote_asset)
     
     def start(self):
         """Start the trading bot"""
@@ -57,6 +100,7 @@ class TradeManager:
             return False
         
         self.running = True
+        self._stop_event.clear()
         self.thread = threading.Thread(target=self._trading_loop)
         self.thread.daemon = True
         self.thread.start()
@@ -71,6 +115,7 @@ class TradeManager:
             return False
         
         self.running = False
+        self._stop_event.set()
         if self.thread:
             self.thread.join(timeout=10)
             self.thread = None
@@ -136,33 +181,21 @@ class TradeManager:
     
     def get_historical_data(self, symbol=None):
         """Get recent historical data with indicators"""
-        if symbol:
-            return self.historical_data.get(symbol, pd.DataFrame())
-        
-        # Return the most recent data from any symbol
-        if self.historical_data:
-            # Find the symbol with the most recent data
-            most_recent = None
-            most_recent_time = None
-            
-            for symbol, data in self.historical_data.items():
-                if not data.empty and (most_recent_time is None or data['timestamp'].iloc[-1] > most_recent_time):
-                    most_recent = symbol
-                    most_recent_time = data['timestamp'].iloc[-1]
+        with self._state_lock:
+            if symbol:
+                return self.historical_data.get(symbol, pd.DataFrame())
             
-            if most_recent:
-                return self.historical_data[most_recent]
-                
-        return pd.DataFrame()
+            # Return the most recent data from any symbol (mantido pelo loop de trading)
+            return self.historical_data.get(self._latest_symbol, pd.DataFrame())
     
     def get_coin_analysis(self):
-        """Get analysis data for all active coins"""
-        return self.coin_analysis
+        """Get analysis data for all active coins (cópia: o loop pode publicar enquanto o dashboard lê)"""
+        with self._state_lock:
+            return dict(self.coin_analysis)
     
-    def _update_coin_selection(self):
-        """Periodically update the active coins selection"""
-        now = datetime.now()
-        minutes_since_last = (now - self.last_coin_selection).total_seconds() / 60
+    def _update_coin_selection(self, now):
+        """Periodically update the active coins selection (now: time.monotonic() do ciclo)"""
+        minutes_since_last = (now - self.last_coin_selection) / 60
         
         if minutes_since_last >= self.config.coin_selection_interval:
             self.logger.info(f"Updating coin selection after {minutes_since_last:.1f} minutes")
@@ -173,79 +206,106 @@ class TradeManager:
         """Main trading loop"""
         self.logger.info("Starting trading loop")
         
-        while self.running:
+        while not self._stop_event.is_set():
             try:
+                # Um único instante por ciclo: monotonic para os intervalos, datetime para as análises
+                now = time.monotonic()
+                tick_time = datetime.now()
+                
                 # Check if we need to update coin selection
-                self._update_coin_selection()
+                self._update_coin_selection(now)
                 
                 # Sincronizar saldos periodicamente (a cada 5 minutos)
-                self._sync_balances_with_open_orders()
+                self._sync_balances_with_open_orders(now, tick_time)
                 
                 # Check status of all open orders
                 self.binance_client.check_order_status()
                 
-                # For each active coin, run strategy
-                for symbol in self.binance_client.active_coins:
-                    # Update current price
-                    price = self.binance_client.get_ticker_price(symbol)
-                    if price:
-                        self.current_prices[symbol] = price
-                    
-                    # Get historical data for analysis
-                    klines = self.binance_client.get_historical_klines(
-                        symbol=symbol,
-                        interval=Client.KLINE_INTERVAL_1MINUTE, 
-                        limit=100
-                    )
-                    
+                # Get historical data for all active coins in parallel
+                active_coins = list(self.binance_client.active_coins)
+                all_klines = self.binance_client.get_historical_klines_batch(
+                    active_coins,
+                    interval=Client.KLINE_INTERVAL_1MINUTE,
+                    limit=100
+                )
+                
+                # Indicadores de todas as moedas calculados em lote (quando a estratégia suporta);
+                # as chamadas por símbolo abaixo reaproveitam o resultado
+                calculate_batch = getattr(self.strategy, 'calculate_indicators_batch', None)
+                if calculate_batch:
+                    calculate_batch(all_klines)
+                
+                # Preços de todas as moedas de uma vez: lidos dos streams bookTicker/ticker
+                # em memória, com REST (uma única chamada) só para os que faltarem
+                prices = self.binance_client.get_ticker_prices(active_coins)
+                
+                # Símbolos cujo último candle não mudou desde o ciclo anterior (mesmo open time,
+                # close e volume) reaproveitam a análise anterior sem passar pela estratégia.
+                # Só o timestamp não basta: o candle em formação muda dentro do mesmo minuto
+                with_klines = []
+                to_analyze = []
+                last_results = {}
+                for symbol in active_coins:
+                    price = prices.get(symbol)
+                    klines = all_klines.get(symbol, pd.DataFrame())
                     if klines.empty:
                         self.logger.warning(f"No historical data available for {symbol}")
                         continue
+                    with_klines.append((symbol, klines, price))
                     
-                    # Apply strategy indicators
-                    data_with_indicators = self.strategy.calculate_indicators(klines)
-                    
-                    # Store for dashboard
-                    self.historical_data[symbol] = data_with_indicators
-                    
-                    # Check if in uptrend (if required)
-                    is_uptrend = True
-                    if self.config.uptrend_required:
-                        is_uptrend = self.strategy.detect_uptrend(klines)
-                    
-                    # Store analysis results
-                    self.coin_analysis[symbol] = {
-                        'price': price,
-                        'uptrend': is_uptrend,
-                        'last_update': datetime.now()
-                    }
-                    
-                    # Skip trading if not in uptrend and uptrend is required
-                    if self.config.uptrend_required and not is_uptrend:
-                        self.coin_analysis[symbol]['status'] = 'Waiting for uptrend'
-                        self.coin_analysis[symbol]['signal'] = 'NONE'
-                        continue
+                    candle_key = (klines['timestamp'].iat[-1], klines['close'].iat[-1], klines['volume'].iat[-1])
+                    previous = self._last_results.get(symbol)
+                    if previous is not None and previous[0] == candle_key:
+                        last_results[symbol] = previous
+                    else:
+                        last_results[symbol] = candle_key
+                        to_analyze.append((symbol, klines, price))
+                
+                # Indicadores e sinais das demais moedas avaliados em paralelo (cada símbolo é
+                # independente); as ordens são enviadas depois, em sequência, para que duas
+                # compras não disputem o mesmo saldo livre
+                results = self._symbol_pool.map(
+                    lambda item: self._analyze_symbol(*item, tick_time), to_analyze
+                )
+                for (symbol, klines, price), result in zip(to_analyze, results):
+                    last_results[symbol] = (last_results[symbol],) + result
+                self._last_results = last_results
+                
+                analyzed = []
+                for symbol, klines, price in with_klines:
+                    candle_key, analysis, data_with_indicators = last_results[symbol]
+                    if analysis['last_update'] is not tick_time:
+                        # Análise reaproveitada: nova entrada só com preço e horário atualizados
+                        analysis = dict(analysis, price=price, last_update=tick_time)
+                    analyzed.append((symbol, klines, analysis, data_with_indicators))
                     
-                    # Check for buy signal
-                    if self.strategy.should_buy(klines):
-                        self.coin_analysis[symbol]['signal'] = 'BUY'
-                        
+                    if analysis['signal'] == 'BUY':
                         # Place buy order
                         order = self.binance_client.place_buy_order(symbol)
                         if order:
                             self.logger.info(f"Buy order executed for {symbol}: {order['orderId']}")
-                            self.coin_analysis[symbol]['status'] = 'Buy order placed'
+                            analysis['status'] = 'Buy order placed'
                         else:
-                            self.coin_analysis[symbol]['status'] = 'Buy signal - Order failed'
-                    
-                    # Check for sell signals from strategy
-                    elif self.strategy.should_sell(klines):
-                        self.coin_analysis[symbol]['signal'] = 'SELL'
-                        self.coin_analysis[symbol]['status'] = 'Sell signal received'
+                            analysis['status'] = 'Buy signal - Order failed'
+                    elif analysis['signal'] == 'SELL':
                         self.logger.info(f"Strategy sell signal received for {symbol}")
-                    else:
-                        self.coin_analysis[symbol]['signal'] = 'NONE'
-                        self.coin_analysis[symbol]['status'] = 'Monitoring'
+                
+                # Publicar o resultado do ciclo para o dashboard de uma vez, sob o lock de estado
+                # (as análises já estão completas: ninguém as altera depois de publicadas)
+                with self._state_lock:
+                    # Update current prices
+                    self.current_prices.update((symbol, price) for symbol, price in prices.items() if price)
+                    
+                    for symbol, klines, analysis, data_with_indicators in analyzed:
+                        # Store for dashboard
+                        self.historical_data[symbol] = data_with_indicators
+                        self.coin_analysis[symbol] = analysis
+                        
+                        # Acompanhar o símbolo com o candle mais recente (iat: escalar, sem montar Series)
+                        ts = klines['timestamp'].iat[-1]
+                        if self._latest_ts is None or ts > self._latest_ts:
+                            self._latest_symbol = symbol
+                            self._latest_ts = ts
                 
                 # Update performance metrics
                 self._update_performance_metrics()
@@ -254,15 +314,51 @@ class TradeManager:
                 self.last_update_time = datetime.now()
                 
                 # Sleep for the refresh interval
-                time.sleep(self.config.refresh_interval)
+                if self._stop_event.wait(self.config.refresh_interval):
+                    break
                 
             except Exception as e:
                 self.logger.error(f"Error in trading loop: {e}")
-                time.sleep(10)  # Sleep longer on error
+                if self._stop_event.wait(10):  # Sleep longer on error
+                    break
         
         self.logger.info("Trading loop stopped")
     
-    def _track_all_balances(self):
+    def _analyze_symbol(self, symbol, klines, price, tick_time):
+        """
+        Indicadores, tendência e sinal de um símbolo (roda nas threads de _symbol_pool).
+        Retorna (análise para coin_analysis, DataFrame com indicadores); não envia ordens
+        """
+        # Apply strategy indicators
+        data_with_indicators = self.strategy.calculate_indicators(klines)
+        
+        # Check if in uptrend (if required)
+        is_uptrend = True
+        if self.config.uptrend_required:
+            is_uptrend = self.strategy.detect_uptrend(klines)
+        
+        # Skip trading if not in uptrend and uptrend is required
+        if self.config.uptrend_required and not is_uptrend:
+            signal, status = 'NONE', 'Waiting for uptrend'
+        elif self.strategy.should_buy(klines):
+            signal, status = 'BUY', 'Buy signal'  # O loop troca pelo resultado da ordem
+        elif self.strategy.should_sell(klines):
+            signal, status = 'SELL', 'Sell signal received'
+        else:
+            signal, status = 'NONE', 'Monitoring'
+        
+        # Dict montado de uma vez, já com todas as chaves (sem crescer depois de criado)
+        analysis = {
+            'price': price,
+            'uptrend': is_uptrend,
+            'last_update': tick_time,
+            'status': status,
+            'signal': signal
+        }
+        
+        return analysis, data_with_indicators
+    
+    def _track_all_balances(self, tick_time):
         """
         Rastreia todas as moedas com saldo e verifica se existem pares disponíveis
         para adicioná-los ao conjunto de moedas ativas para monitoramento
@@ -272,49 +368,51 @@ class TradeManager:
         if not balances:
             return
             
-        # Ignorar a moeda base (USDT)
-        if self.config.quote_asset in balances:
-            del balances[self.config.quote_asset]
+        # Ignorar a moeda base (USDT); cópia filtrada: o dict retornado é o snapshot do cache,
+        # compartilhado com place_buy_order e o log de performance, e não pode ser alterado
+        balances = {asset: info for asset, info in balances.items() if asset != self.config.quote_asset}
         
         # Limitar o número de novas moedas a verificar por ciclo
         # para evitar sobrecarregar a API
         assets_to_check = list(balances.keys())
         
-        # Manter uma lista de moedas já analisadas anteriormente
+        # Manter as moedas já analisadas anteriormente (dict como conjunto ordenado:
+        # membership O(1) e a ordem de análise preservada para a rotação abaixo)
         if not hasattr(self, '_analyzed_assets'):
-            self._analyzed_assets = []
+            self._analyzed_assets = {}
         
         # Priorizar moedas ainda não analisadas
         unanalyzed_assets = [a for a in assets_to_check if a not in self._analyzed_assets]
         
         # Filtrar moedas que já estão sendo rastreadas
         active_symbols = self.binance_client.active_coins
-        active_assets = [s[:-len(self.config.quote_asset)] for s in active_symbols]
+        active_assets = {s[:-self._quote_len] for s in active_symbols}
         
         # Priorizar primeiro moedas não analisadas e não ativas
         priority_assets = [a for a in unanalyzed_assets if a not in active_assets]
         
         # Limitar a 3 moedas por ciclo para evitar sobrecarga
         if len(priority_assets) > 3:
-            # Escolher 3 aleatoriamente, mas de forma determinística para cada ciclo
-            seed = int(datetime.now().timestamp()) % 1000
             assets_to_process = priority_assets[:3]
         else:
             assets_to_process = priority_assets
             
-            # Se ainda temos espaço, adicionar moedas não ativas já analisadas
+            # Se ainda temos espaço, adicionar moedas não ativas já analisadas (que ainda têm
+            # saldo), em rodízio para não reverificar sempre as mesmas
             remaining_slots = 3 - len(assets_to_process)
-            if remaining_slots > 0:
-                analyzed_non_active = [a for a in self._analyzed_assets if a not in active_assets]
-                assets_to_process.extend(analyzed_non_active[:remaining_slots])
+            analyzed_non_active = [a for a in self._analyzed_assets if a not in active_assets and a in balances]
+            if remaining_slots > 0 and analyzed_non_active:
+                count = min(remaining_slots, len(analyzed_non_active))
+                start = self._asset_rotation_idx % len(analyzed_non_active)
+                assets_to_process.extend(islice(cycle(analyzed_non_active), start, start + count))
+                self._asset_rotation_idx = start + count
         
         self.logger.debug(f"Processing {len(assets_to_process)} assets for balance tracking: {assets_to_process}")
             
         # Para cada moeda com saldo, verificar se existe um par com USDT
         for asset in assets_to_process:
             # Adicionar à lista de verificados
-            if asset not in self._analyzed_assets:
-                self._analyzed_assets.append(asset)
+            self._analyzed_assets.setdefault(asset)
                 
             balance_info = balances[asset]
             
@@ -341,141 +439,192 @@ class TradeManager:
                     self.binance_client.active_coins.append(symbol)
                     
                 # Inicializar estruturas
-                if symbol not in self.binance_client.open_orders:
-                    self.binance_client.open_orders[symbol] = []
+                with self.binance_client._order_lock(symbol):
+                    self.binance_client.open_orders.setdefault(symbol, {})
                     
                 if symbol not in self.binance_client.trade_history:
                     self.binance_client.trade_history[symbol] = []
                     
                 # Criar uma entrada no coin_analysis para que apareça no dashboard
                 price = self.binance_client.get_ticker_price(symbol)  # Usa cache internamente
-                self.coin_analysis[symbol] = {
-                    'price': price,
-                    'uptrend': True,  # Assumir como uptrend por padrão
-                    'last_update': datetime.now(),
-                    'status': 'Monitored - External balance',
-                    'signal': 'NONE'
-                }
+                with self._state_lock:
+                    self.coin_analysis[symbol] = {
+                        'price': price,
+                        'uptrend': True,  # Assumir como uptrend por padrão
+                        'last_update': tick_time,
+                        'status': 'Monitored - External balance',
+                        'signal': 'NONE'
+                    }
     
-    def _sync_balances_with_open_orders(self):
+    def _sync_balances_with_open_orders(self, now=None, tick_time=None):
         """
         Sincroniza periodicamente os saldos com ordens abertas para evitar 
-        inconsistências entre o que o robô acha que tem e o que realmente está na conta
+        inconsistências entre o que o robô acha que tem e o que realmente está na conta.
+        now/tick_time: instantes do ciclo do loop (time.monotonic() e datetime); lidos aqui se omitidos
         """
-        now = datetime.now()
-        minutes_since_last = (now - self.last_balance_sync).total_seconds() / 60
+        if now is None:
+            now = time.monotonic()
+        minutes_since_last = (now - self.last_balance_sync) / 60
         
         # Executar a cada 5 minutos ou se sync_needed estiver marcado
         if minutes_since_last >= 5 or self.sync_needed:
             self.logger.info("Syncing balances with open positions and checking for ghost orders...")
             
             # Rastrear todas as moedas com saldos
-            self._track_all_balances()
-            
-            # Selecionar apenas uma amostra de símbolos para checar a cada ciclo, para evitar sobrecarga
-            # Para cada símbolo com ordens abertas, verificar ordens fantasmas
-            symbols_to_check = list(self.binance_client.open_orders.keys())
-            
-            # Adicionar também símbolos ativos que podem não estar na lista de ordens abertas
-            for symbol in self.binance_client.active_coins:
-                if symbol not in symbols_to_check:
-                    symbols_to_check.append(symbol)
+            self._track_all_balances(tick_time or datetime.now())
             
-            # Se temos muitos símbolos, limitar a quantidade para não sobrecarregar a API
-            if len(symbols_to_check) > 5:
-                # Escolher um subconjunto: todos com ordens abertas + alguns ativos
-                open_order_symbols = list(self.binance_client.open_orders.keys())
-                remaining_slots = max(0, 5 - len(open_order_symbols))
-                
-                # Adicionar primeiro todos os símbolos com ordens abertas
-                batch_symbols = open_order_symbols.copy()
-                
-                # Se ainda há espaço, adicionar alguns outros ativos
-                other_symbols = [s for s in symbols_to_check if s not in batch_symbols]
-                if other_symbols and remaining_slots > 0:
-                    # Rotacionar a lista para verificar símbolos diferentes a cada ciclo
-                    start_idx = int(now.timestamp()) % len(other_symbols)
-                    for i in range(min(remaining_slots, len(other_symbols))):
-                        idx = (start_idx + i) % len(other_symbols)
-                        batch_symbols.append(other_symbols[idx])
-                
-                symbols_to_check = batch_symbols
+            # Selecionar apenas uma amostra de símbolos para checar a cada ciclo, para evitar sobrecarga:
+            # todos os símbolos com ordens abertas + outros ativos até completar 5, em rodízio
+            # para verificar símbolos diferentes a cada ciclo
+            open_order_symbols = list(self.binance_client.open_orders)
+            open_set = set(open_order_symbols)
+            other_symbols = [s for s in self.binance_client.active_coins if s not in open_set]
             
-            self.logger.info(f"Checking ghost orders for {len(symbols_to_check)} symbols: {symbols_to_check}")
+            remaining_slots = min(max(0, 5 - len(open_order_symbols)), len(other_symbols))
+            start_idx = int(now) % len(other_symbols) if other_symbols else 0
+            symbols_to_check = open_order_symbols + list(
+                islice(cycle(other_symbols), start_idx, start_idx + remaining_slots)
+            )
             
-            # Verificar e corrigir ordens fantasmas para cada símbolo
-            for symbol in symbols_to_check:
-                # Usar a função específica para verificação de ordens fantasmas
-                self.binance_client._check_and_fix_ghost_orders(symbol)
+            # As chamadas REST da verificação rodam na thread de ordens fantasmas, sem
+            # travar o loop de trading; se o lote anterior ainda não terminou, não enfileirar outro
+            if self._ghost_batch_pending.is_set():
+                self.logger.debug("Ghost order check still running, skipping this batch")
+            else:
+                self.logger.info(f"Checking ghost orders for {len(symbols_to_check)} symbols: {symbols_to_check}")
+                self._ghost_batch_pending.set()
+                self._ghost_queue.put(symbols_to_check)
             
             # Atualizar tempo da última sincronização
             self.last_balance_sync = now
             self.sync_needed = False
                 
+    def _ghost_worker(self):
+        """
+        Thread de ordens fantasmas: consome lotes de símbolos enfileirados pela sincronização.
+        Roda em paralelo com o loop de trading e o user data stream; depende de
+        _check_and_fix_ghost_orders só alterar open_orders[symbol] sob _order_lock(symbol)
+        e nunca substituir o dict do símbolo
+        """
+        while True:
+            symbols_to_check = self._ghost_queue.get()
+            try:
+                # Saldos e ordens abertas de todos os símbolos rastreados buscados em paralelo,
+                # em vez de uma chamada sequencial por símbolo dentro da verificação
+                tracked_symbols = [s for s in symbols_to_check if self.binance_client.open_orders.get(s)]
+                real_order_ids = self.binance_client.refresh_all(tracked_symbols)
+                
+                # Verificar e corrigir ordens fantasmas para cada símbolo
+                for symbol in symbols_to_check:
+                    # Usar a função específica para verificação de ordens fantasmas
+                    self.binance_client._check_and_fix_ghost_orders(symbol, real_order_ids.get(symbol))
+            except Exception as e:
+                self.logger.error(f"Error checking ghost orders: {e}")
+            finally:
+                self._ghost_batch_pending.clear()
+    
     def _update_performance_metrics(self):
         """Update overall performance metrics"""
-        # Get all trade history
-        trades = self.binance_client.get_trade_history()
-        
-        # Reset counters
-        total_pl_pct = 0
-        wins = 0
-        losses = 0
-        
-        # Count wins and losses
-        for trade in trades:
-            if trade['type'] == 'SELL':
-                pl = trade.get('profit_loss', 0)
-                if pl > 0:
-                    wins += 1
-                else:
-                    losses += 1
-                total_pl_pct += pl
+        # Só os trades adicionados desde a última volta (cada histórico por símbolo só cresce)
+        new_sells = []
+        for symbol, symbol_trades in list(self.binance_client.trade_history.items()):
+            seen = self._trades_seen.get(symbol, 0)
+            if len(symbol_trades) > seen:
+                new_trades = symbol_trades[seen:]
+                new_sells.extend(t for t in new_trades if t['type'] == 'SELL')
+                self._trades_seen[symbol] = seen + len(new_trades)
+        if new_sells:
+            new_pl = np.fromiter((t.get('profit_loss', 0) for t in new_sells), dtype=np.float64, count=len(new_sells))
+            self._sell_pl = np.concatenate((self._sell_pl, new_pl))
+        
+        # Redução vetorizada sobre todos os SELLs
+        pl = self._sell_pl
+        wins = int((pl > 0).sum())
         
         # Update tracking
-        self.profit_loss = total_pl_pct
+        self.profit_loss = float(pl.sum())
         self.win_count = wins
-        self.loss_count = losses
+        self.loss_count = len(pl) - wins
         
         # Log performance data to arquivo
-        self._log_performance_data(trades)
-        
-    def _log_performance_data(self, trades):
-        """Registra dados de desempenho em arquivo para análise posterior"""
+        self._log_performance_data(new_sells)
+        
+    def _log_writer(self):
+        """Thread de escrita dos logs: drena a fila em lotes de até LOG_BATCH_SIZE linhas"""
+        log_queue = self._log_queue
+        while True:
+            batch = [log_queue.get()]
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_log_batch(batch)
+    
+    def _write_log_batch(self, batch):
+        """Grava as linhas de cada arquivo com um único write seguido de flush"""
+        lines = {}
+        for fh, line in batch:
+            lines.setdefault(fh, []).append(line)
+        with self._log_lock:
+            for fh, file_lines in lines.items():
+                try:
+                    fh.write(''.join(file_lines))
+                    fh.flush()
+                except (OSError, ValueError) as e:
+                    self.logger.error(f"Erro ao gravar log em {fh.name}: {e}")
+    
+    def _close_logs(self):
+        """Na saída do processo: grava o que ainda estiver na fila e fecha os arquivos"""
+        batch = []
+        while True:
+            try:
+                batch.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write_log_batch(batch)
+        with self._log_lock:
+            self._perf_fh.close()
+            self._trade_fh.close()
+    
+    def _log_performance_data(self, new_sells):
+        """
+        Registra dados de desempenho em arquivo para análise posterior.
+        new_sells: SELLs adicionados ao histórico desde a última chamada (só eles vão para trades.log)
+        """
         try:
+            # Timestamp formatado uma vez para o registro geral e todos os trades
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            
             # Dados de desempenho gerais
             perf_data = {
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'timestamp': timestamp,
                 'profit_loss_total': self.profit_loss,
                 'win_count': self.win_count,
                 'loss_count': self.loss_count,
                 'total_trades': self.win_count + self.loss_count,
                 'win_rate': (self.win_count / (self.win_count + self.loss_count) * 100) if (self.win_count + self.loss_count) > 0 else 0,
-                'balance': self.binance_client.get_account_balance().get(self.config.quote_asset, {}).get('free', 0)
+                'balance': self.binance_client.get_cached_free_balance(self.config.quote_asset)
             }
             
             # Escrever no arquivo de performance
-            with open(self.performance_log, 'a') as f:
-                f.write(json.dumps(perf_data) + '\n')
-                
-            # Registrar trades recentes (últimos 10)
-            recent_trades = [t for t in trades if t['type'] == 'SELL'][:10]
+            self._log_queue.put((self._perf_fh, json_line(perf_data)))
             
-            if recent_trades:
-                with open(self.trade_log, 'a') as f:
-                    for trade in recent_trades:
-                        # Verificar se este trade já foi registrado (usando order_id como chave)
-                        trade_data = {
-                            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                            'symbol': trade.get('symbol', 'UNKNOWN'),
-                            'profit_loss': trade.get('profit_loss', 0),
-                            'price': trade.get('price', 0),
-                            'quantity': trade.get('quantity', 0),
-                            'total': trade.get('total', 0),
-                            'order_id': trade.get('order_id', 0),
-                            'time': trade.get('time', datetime.now()).strftime('%Y-%m-%d %H:%M:%S') if isinstance(trade.get('time'), datetime) else str(trade.get('time'))
-                        }
-                        f.write(json.dumps(trade_data) + '\n')
+            # Registrar só os trades novos (uma venda em lote gera uma entrada por posição,
+            # todas com o mesmo order_id)
+            for trade in new_sells:
+                trade_data = {
+                    'timestamp': timestamp,
+                    'symbol': trade.get('symbol', 'UNKNOWN'),
+                    'profit_loss': trade.get('profit_loss', 0),
+                    'price': trade.get('price', 0),
+                    'quantity': trade.get('quantity', 0),
+                    'total': trade.get('total', 0),
+                    'order_id': trade.get('order_id', 0),
+                    'time': trade['time'].strftime('%Y-%m-%d %H:%M:%S') if isinstance(trade.get('time'), datetime) else str(trade.get('time'))
+                }
+                self._log_queue.put((self._trade_fh, json_line(trade_data)))
                         
             self.logger.info(f"Performance log atualizado. Lucro total: {self.profit_loss:.2f}%, Win rate: {perf_data['win_rate']:.1f}%")
                 